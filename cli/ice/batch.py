@@ -0,0 +1,169 @@
+"""
+Batch / script execution - run shell commands without a prompt
+
+Commands come from a script file, stdin ('-') or repeated -c arguments and
+go through the same registry and CommandContext as the interactive shell,
+sharing one API instance and one result set. No prompt_toolkit session or
+history is created.
+
+When stdout is not a TTY (or --json is given) each command produces one
+JSON line: {"command", "ok", "output", "error", "elapsed_ms"}.
+"""
+
+import io
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+def read_script(source):
+    """Command lines from a path or '-' (stdin); blanks and # comments skipped"""
+    if source == '-':
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith('#')]
+
+
+class OutputRouter:
+    """
+    File-like object installed as the shared display console's file.
+
+    Writes go to the target set for the current thread (see redirect) or to
+    the original stream, so concurrent command runs - daemon clients - each
+    get their own rendered output.
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, 'target', None) or self.default
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def isatty(self):
+        target = self._target()
+        return hasattr(target, 'isatty') and target.isatty()
+
+    def fileno(self):
+        return self._target().fileno()
+
+    @contextmanager
+    def redirect(self, target):
+        previous = getattr(self._local, 'target', None)
+        self._local.target = target
+        try:
+            yield
+        finally:
+            self._local.target = previous
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def display_router():
+    """Install (once) and return the router behind display.console.console"""
+    global _router
+    with _router_lock:
+        if _router is None:
+            from devlog.cli.display.console import console as display_console
+            _router = OutputRouter(display_console.file)
+            display_console.file = _router
+        return _router
+
+
+class BatchRunner:
+    """Executes command lines against one non-interactive DevLogShell"""
+
+    def __init__(self, shell, json_lines=False, keep_going=False, out=None):
+        self.shell = shell
+        self.json_lines = json_lines
+        self.keep_going = keep_going
+        self.out = out or sys.stdout
+        self.failures = 0
+
+    def run_one(self, text):
+        """Run one line; returns (ok, keep_running)"""
+        started = time.perf_counter()
+        buffer = None
+        if self.json_lines:
+            from rich.console import Console
+            buffer = io.StringIO()
+            console = Console(file=buffer, force_terminal=False, color_system=None,
+                              width=self.shell.console.width)
+            with display_router().redirect(buffer):
+                keep_running, error = execute_line(self.shell, text, console)
+        else:
+            keep_running, error = execute_line(self.shell, text, self.shell.console)
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        ok = error is None
+        if self.json_lines:
+            record = {
+                'command': text,
+                'ok': ok,
+                'output': buffer.getvalue(),
+                'error': error,
+                'elapsed_ms': round(elapsed_ms, 3),
+            }
+            self.out.write(json.dumps(record) + "\n")
+            self.out.flush()
+        elif error:
+            self.shell.console.print(f"[red]✗ {text}: {error}[/red]")
+
+        if not ok:
+            self.failures += 1
+        return ok, keep_running
+
+    def run(self, lines):
+        """Run all lines; stops at the first failure unless keep_going"""
+        for text in lines:
+            ok, keep_running = self.run_one(text)
+            if not keep_running or (not ok and not self.keep_going):
+                break
+        return 0 if self.failures == 0 else 1
+
+
+def execute_line(shell, text, console):
+    """(keep_running, error message or None) for one command line"""
+    from devlog.cli.cli import UnknownCommandError
+
+    try:
+        return shell.run_command(text, console=console), None
+    except UnknownCommandError as e:
+        return True, str(e)
+    except Exception as e:
+        if shell.debug:
+            import traceback
+            traceback.print_exc()
+        return True, f"{type(e).__name__}: {e}"
+
+
+def run_batch(api, lines, debug=False, json_lines=None, keep_going=False, log_files=None,
+              profile=None, metrics_file=None, session=None):
+    """
+    Build a prompt-less shell around `api` and run the lines through it;
+    session names a saved snapshot to start from
+    """
+    from devlog.cli.cli import DevLogShell
+
+    if json_lines is None:
+        json_lines = not sys.stdout.isatty()
+    shell = DevLogShell(api=api, debug=debug, interactive=False,
+                        profile=profile, metrics_file=metrics_file)
+    shell.log_files = list(log_files or [])
+    if session:
+        from devlog.cli.commands.session import load_session
+        from devlog.cli.results.snapshot import snapshot_path
+        load_session(shell, snapshot_path(session))
+    return BatchRunner(shell, json_lines=json_lines, keep_going=keep_going).run(lines)
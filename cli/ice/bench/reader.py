@@ -0,0 +1,98 @@
+"""
+Reader benchmark: streaming add_file/process_all vs the mmap reader
+
+Each scenario runs in a fresh interpreter over the same synthetic file and
+reports throughput and peak RSS (ru_maxrss of that process):
+
+    stream        LogProcessor.add_file + process_all (previous quick path)
+    mmap          reader.iter_lines -> process_lines (the byte-range path)
+    stream-lines  plain `for line in file` decode, no parsing (I/O floor)
+    mmap-lines    reader.iter_lines, no parsing
+
+    python -m devlog.cli.bench.reader --size 1G --size 10G --dir /var/tmp
+    python -m devlog.cli.bench.reader --size 1G --save reader.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from devlog.cli.bench.synthetic import ensure, parse_size
+
+
+SCENARIOS = ('stream', 'mmap', 'stream-lines', 'mmap-lines')
+
+SNIPPET = """
+import resource, sys, time
+path, scenario = sys.argv[1], sys.argv[2]
+t0 = time.perf_counter()
+n = 0
+if scenario == 'stream':
+    from devlog.core.parsing.processor import LogProcessor
+    p = LogProcessor()
+    p.add_file(path)
+    for _ in p.process_all():
+        n += 1
+elif scenario == 'mmap':
+    from devlog.core.parsing.processor import LogProcessor
+    from devlog.cli.reader import iter_lines
+    for _ in LogProcessor().process_lines(iter_lines(path), source=path):
+        n += 1
+elif scenario == 'stream-lines':
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for _ in f:
+            n += 1
+else:
+    from devlog.cli.reader import iter_lines
+    for _ in iter_lines(path):
+        n += 1
+elapsed = time.perf_counter() - t0
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(n, elapsed, rss * (1 if sys.platform == 'darwin' else 1024))
+"""
+
+
+def run(path, scenario):
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET, path, scenario],
+        capture_output=True, text=True, check=True, stdin=subprocess.DEVNULL,
+    ).stdout.split()
+    events, elapsed, rss = int(out[0]), float(out[1]), int(out[2])
+    size = os.path.getsize(path)
+    return {
+        'events': events,
+        'seconds': round(elapsed, 3),
+        'mb_per_s': round(size / elapsed / 1024 ** 2, 1) if elapsed else 0.0,
+        'lines_per_s': round(events / elapsed) if elapsed else 0,
+        'peak_rss_mb': round(rss / 1024 ** 2, 1),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DevLog quick-analysis reader benchmark")
+    parser.add_argument("--size", action="append", help="Synthetic file size, e.g. 1G (repeatable; default 1G)")
+    parser.add_argument("--dir", default="/tmp", help="Where synthetic files are written (and reused)")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenarios to run (default: all)")
+    parser.add_argument("--save", help="Write results as JSON")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size_text in args.size or ['1G']:
+        size = parse_size(size_text)
+        path = ensure(args.dir, "devlog-bench", size)
+        for scenario in args.scenario or SCENARIOS:
+            r = run(path, scenario)
+            results[f"{size_text}/{scenario}"] = r
+            print(f"{size_text:>6s} {scenario:13s} {r['seconds']:8.2f} s  {r['mb_per_s']:8.1f} MB/s  "
+                  f"{r['lines_per_s']:>10,} lines/s  peak RSS {r['peak_rss_mb']:8.1f} MB")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
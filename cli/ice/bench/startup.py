@@ -0,0 +1,99 @@
+"""
+Startup-time regression benchmark
+
+Spawns fresh interpreters that build a DevLogShell (no prompt) and reports
+the wall time, for the eager path and for the manifest path. Results can be
+saved as a baseline and later runs compared against it:
+
+    python -m devlog.cli.bench.startup --save startup.json
+    python -m devlog.cli.bench.startup --baseline startup.json --threshold 0.2
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+
+SNIPPET = """
+import sys, time
+t0 = time.perf_counter()
+from devlog.cli.cli import DevLogShell
+shell = DevLogShell(api=None, lazy_commands={lazy})
+sys.stdout.write(f"{{(time.perf_counter() - t0) * 1000:.3f}} {{shell.commands_source}}\\n")
+"""
+
+
+def run_once(lazy):
+    """(process wall ms, in-process init ms, command source)"""
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, "-c", SNIPPET.format(lazy=lazy)],
+        capture_output=True, text=True, check=True, stdin=subprocess.DEVNULL,
+    ).stdout.split()
+    wall = (time.perf_counter() - start) * 1000
+    return wall, float(out[0]), out[1]
+
+
+def measure(runs, lazy):
+    run_once(lazy)  # warm the OS cache and (re)write the manifest
+    samples = [run_once(lazy) for _ in range(runs)]
+    walls = sorted(s[0] for s in samples)
+    inits = sorted(s[1] for s in samples)
+    return {
+        'source': samples[-1][2],
+        'wall_ms_median': statistics.median(walls),
+        'wall_ms_min': walls[0],
+        'init_ms_median': statistics.median(inits),
+        'runs': runs,
+    }
+
+
+def compare(current, baseline, threshold):
+    """Names of scenarios whose median wall time regressed past threshold"""
+    regressions = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        limit = base['wall_ms_median'] * (1 + threshold)
+        if result['wall_ms_median'] > limit:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DevLog shell startup benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per scenario (default: 10)")
+    parser.add_argument("--save", help="Write results as JSON baseline")
+    parser.add_argument("--baseline", help="Compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown (default: 0.2 = +20%%)")
+    args = parser.parse_args(argv)
+
+    results = {
+        'eager': measure(args.runs, lazy=False),
+        'lazy': measure(args.runs, lazy=True),
+    }
+    for name, r in results.items():
+        print(f"{name:6s} wall {r['wall_ms_median']:8.1f} ms (min {r['wall_ms_min']:.1f})  "
+              f"shell init {r['init_ms_median']:8.1f} ms  [{r['source']}]")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for name in regressions:
+            print(f"REGRESSION {name}: {results[name]['wall_ms_median']:.1f} ms "
+                  f"vs baseline {baseline[name]['wall_ms_median']:.1f} ms")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+"""
+Performance suite behind the `benchmark` command
+
+Stages, each timed per operation:
+
+    parse       synthetic log -> LogProcessor -> StreamingStats (per 10k events)
+    stats       ResultSummary build over the result set
+    filter      compiled queries by status / event / severity
+    search      text-index queries over the messages (plain and --regex)
+    chart       bar chart + heatmap + timeline rendered off-screen
+    completion  completer latency for typical prefixes
+
+Each stage reports throughput (its unit per second), p50/p99 latency of one
+operation and the process peak RSS after it ran; one untimed warm-up op
+runs first so lazy imports do not land in the percentiles. Inputs come from
+bench/synthetic.py with a fixed seed, so two runs on the same machine see
+the same data. Results are saved as JSON and compared against a baseline:
+
+    python -m devlog.cli.bench.suite --size 64M --save perf.json
+    python -m devlog.cli.bench.suite --size 64M --baseline perf.json --threshold 0.2
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import platform
+import random
+import resource
+import sys
+import tempfile
+import time
+
+from devlog.cli.bench.synthetic import ensure, parse_size, result_records, FAMILIES, GENERATOR_VERSION
+
+
+STAGES = ('parse', 'stats', 'filter', 'search', 'chart', 'completion')
+PARSE_BATCH = 10000
+COMPLETION_INPUTS = ('', 's', 'fi', 'to', 'filter ', 'top --by ', 'timeline --', 'cache ', 'dashboard --')
+
+
+def peak_rss_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def percentile(samples, p):
+    """Nearest-rank percentile of a sorted list"""
+    if not samples:
+        return 0.0
+    k = max(0, min(len(samples) - 1, math.ceil(p / 100 * len(samples)) - 1))
+    return samples[k]
+
+
+class StageTimer:
+    """Per-operation latencies + units of work for one stage"""
+
+    def __init__(self, unit):
+        self.unit = unit
+        self.samples = []
+        self.units = 0
+        self.elapsed = 0.0
+
+    def record(self, seconds, units=1):
+        self.samples.append(seconds * 1000)
+        self.units += units
+        self.elapsed += seconds
+
+    def time(self, fn, units=1):
+        started = time.perf_counter()
+        value = fn()
+        self.record(time.perf_counter() - started, units)
+        return value
+
+    def result(self):
+        samples = sorted(self.samples)
+        return {
+            'unit': self.unit,
+            'ops': len(samples),
+            'units': self.units,
+            'seconds': round(self.elapsed, 4),
+            'throughput': round(self.units / self.elapsed, 1) if self.elapsed else 0.0,
+            'p50_ms': round(percentile(samples, 50), 4),
+            'p99_ms': round(percentile(samples, 99), 4),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+        }
+
+
+# -- stages ------------------------------------------------------------
+
+def stage_parse(ctx):
+    from devlog.cli.quick import StreamingStats, iter_source
+
+    timer = StageTimer('events')
+    stats = StreamingStats()
+    events = iter(iter_source(ctx['log_path']))
+    while True:
+        started = time.perf_counter()
+        before = stats.total_events
+        for event in events:
+            stats.add(event)
+            if stats.total_events - before >= PARSE_BATCH:
+                break
+        count = stats.total_events - before
+        if not count:
+            break
+        timer.record(time.perf_counter() - started, count)
+    return timer
+
+
+def stage_stats(ctx):
+    from devlog.cli.results.summary import build_summary
+
+    timer = StageTimer('rows')
+    rs = ctx['results']
+    build_summary(rs)  # warm-up: lazy numpy import, allocator
+    for _ in range(ctx['reps']):
+        timer.time(lambda: build_summary(rs), len(rs))
+    return timer
+
+
+def stage_filter(ctx):
+    from devlog.cli.results.facets import facets
+    from devlog.cli.results.query import compile_query
+
+    timer = StageTimer('queries')
+    rs = ctx['results']
+    rng = random.Random(ctx['seed'])
+    index = facets(rs)  # built once at load time in the shell, not per query
+    statuses = index.values('status')
+    events = index.values('event')
+    compile_query(status=statuses[0], min_severity=5).evaluate(rs)
+    for _ in range(ctx['reps'] * 20):
+        criteria = {'status': rng.choice(statuses)}
+        if rng.random() < 0.5:
+            criteria['event'] = rng.choice(events)
+        if rng.random() < 0.5:
+            criteria['min_severity'] = rng.randrange(10)
+        query = compile_query(**criteria)
+        timer.time(lambda: query.evaluate(rs).rows)
+    return timer
+
+
+def stage_search(ctx):
+    from devlog.cli.results.search import text_index
+
+    timer = StageTimer('queries')
+    rs = ctx['results']
+    rng = random.Random(ctx['seed'])
+    terms = ('deadlock', 'OOMKilled', 'Failed password', 'status=bounced', '/api/v1/orders',
+             'TimeoutError', 'DPT=22', 'Scrape failed', 'nonexistent-term')
+    patterns = (r'deadlock\s+detected', r'took=\d{4}ms', r'user=\d+ took', r'(GET|POST) /api')
+    index = text_index(rs)  # built once per result set, not per query
+    index.search(rs, 'Failed password')  # warm-up: lazy vocabulary + numpy import
+    for _ in range(ctx['reps'] * 2):
+        term = rng.choice(terms)
+        timer.time(lambda: index.search(rs, term))
+        pattern = rng.choice(patterns)
+        timer.time(lambda: index.search(rs, pattern, regex=True))
+    return timer
+
+
+def stage_chart(ctx):
+    from rich.console import Console
+    from devlog.cli.display.charts import create_ascii_bar_chart, create_confidence_heatmap, create_timeline_view
+    from devlog.cli.display.aggregate import timeline_buckets
+    from devlog.cli.results.summary import summarize
+
+    timer = StageTimer('renders')
+    rs = ctx['results']
+    summary = summarize(rs)
+    timeline = timeline_buckets(rs)
+    console = Console(file=io.StringIO(), width=120, force_terminal=True)
+
+    def render():
+        console.print(create_ascii_bar_chart(dict(summary.events.most_common(10)), title="Top Event Types"))
+        console.print(create_confidence_heatmap(bins=summary.confidence_bins))
+        console.print(create_timeline_view(buckets=timeline))
+        console.file.seek(0)
+        console.file.truncate()
+
+    render()
+    for _ in range(ctx['reps'] * 5):
+        timer.time(render)
+    return timer
+
+
+def stage_completion(ctx):
+    from prompt_toolkit.completion import CompleteEvent
+    from prompt_toolkit.document import Document
+    from devlog.cli.cli import DevLogShell
+    from devlog.cli.completer.completer import DynamicLogParserCompleter
+
+    timer = StageTimer('completions')
+    # Its commands go in the shell's own registry: the user's shell (when
+    # run from `benchmark`) keeps its commands, results and jobs
+    shell = DevLogShell(api=None, interactive=False)
+    shell.last_results = ctx['results']
+    completer = DynamicLogParserCompleter(shell)
+    event = CompleteEvent(completion_requested=True)
+    for text in COMPLETION_INPUTS:
+        list(completer.get_completions(Document(text, len(text)), event))
+    for _ in range(ctx['reps'] * 10):
+        for text in COMPLETION_INPUTS:
+            document = Document(text, len(text))
+            timer.time(lambda: list(completer.get_completions(document, event)))
+    return timer
+
+
+STAGE_FUNCS = {
+    'parse': stage_parse,
+    'stats': stage_stats,
+    'filter': stage_filter,
+    'search': stage_search,
+    'chart': stage_chart,
+    'completion': stage_completion,
+}
+
+
+def run_suite(size='64M', rows=100000, seed=0, reps=5, stages=STAGES, workdir=None, progress=None):
+    """Run the selected stages; returns {'meta': ..., 'stages': {name: result}}"""
+    from devlog.cli.results.resultset import ResultSet
+
+    ctx = {'seed': seed, 'reps': reps}
+    meta = {
+        'size': size, 'rows': rows, 'seed': seed, 'reps': reps,
+        'families': len(FAMILIES),
+        'generator': GENERATOR_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'started': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+    if 'parse' in stages:
+        workdir = workdir or tempfile.gettempdir()
+        ctx['log_path'] = ensure(workdir, "devlog-suite", parse_size(size), seed)
+    if any(stage != 'parse' for stage in stages):
+        ctx['results'] = ResultSet(result_records(rows, seed))
+
+    results = {}
+    for name in STAGES:
+        if name not in stages:
+            continue
+        if progress is not None:
+            progress(name)
+        results[name] = STAGE_FUNCS[name](ctx).result()
+    return {'meta': meta, 'stages': results}
+
+
+def compare(current, baseline, threshold):
+    """(stage, metric, current, baseline) for every regression past threshold"""
+    regressions = []
+    for name, result in current['stages'].items():
+        base = baseline.get('stages', {}).get(name)
+        if not base:
+            continue
+        if base['throughput'] and result['throughput'] < base['throughput'] * (1 - threshold):
+            regressions.append((name, 'throughput', result['throughput'], base['throughput']))
+        if base['p99_ms'] and result['p99_ms'] > base['p99_ms'] * (1 + threshold):
+            regressions.append((name, 'p99_ms', result['p99_ms'], base['p99_ms']))
+    return regressions
+
+
+def mismatched(current, baseline):
+    """Suite parameters that differ from the baseline's (comparison is then unreliable)"""
+    keys = ('size', 'rows', 'seed', 'reps')
+    base = baseline.get('meta', {})
+    return [k for k in keys if k in base and base[k] != current['meta'].get(k)]
+
+
+def load(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save(results, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DevLog performance suite")
+    parser.add_argument("--size", default="64M", help="Synthetic log size for the parse stage (default: 64M)")
+    parser.add_argument("--rows", type=int, default=100000, help="Result rows for the other stages (default: 100000)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reps", type=int, default=5, help="Repetition factor per stage (default: 5)")
+    parser.add_argument("--stage", action="append", choices=STAGES, help="Stages to run (default: all)")
+    parser.add_argument("--dir", help="Where the synthetic log is written (and reused)")
+    parser.add_argument("--save", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Compare against a saved run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed regression (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.size, args.rows, args.seed, args.reps, args.stage or STAGES, args.dir)
+    for name, r in results['stages'].items():
+        print(f"{name:11s} {r['throughput']:>14,.1f} {r['unit']}/s  p50 {r['p50_ms']:9.3f} ms  "
+              f"p99 {r['p99_ms']:9.3f} ms  peak RSS {r['peak_rss_mb']:7.1f} MB")
+    if args.save:
+        save(results, args.save)
+    if args.baseline:
+        base = load(args.baseline)
+        for key in mismatched(results, base):
+            print(f"WARNING baseline {key}={base['meta'][key]} vs {results['meta'][key]}")
+        regressions = compare(results, base, args.threshold)
+        for name, metric, value, base in regressions:
+            print(f"REGRESSION {name} {metric}: {value} vs baseline {base}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+"""
+Synthetic log generator for the benchmarks
+
+Deterministic for a given seed. Lines are drawn from the signature families
+the detector knows (display/signatures.py): web servers, databases,
+containers, queues, auth, firewall, mail, CI and plain application logs:
+
+    10.0.3.7 - - [01/Jan/2024:10:00:00 +0000] "GET /api/v1/users HTTP/1.1" 200 512 "-" "curl/8.0"
+    2024-01-01 10:00:00.123 UTC [4242] ERROR:  deadlock detected
+    2024-01-01T10:00:00Z kubelet E0101 10:00:00.123 pod api-7f9 OOMKilled
+
+A handful of randomly generated ~1 MB blocks are written in rotation, so
+multi-GB files are produced at disk speed while still varying enough to
+exercise the parser and the aggregates.
+"""
+
+import os
+import random
+
+
+LEVELS = ('DEBUG', 'INFO', 'INFO', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+EVENTS = ('auth', 'conn', 'db', 'disk', 'cache', 'http', 'queue', 'scheduler')
+ACTIONS = ('started', 'completed', 'failed', 'timeout', 'retry', 'refused', 'slow')
+STATUSES = ('success', 'success', 'success', 'warning', 'failed')
+PATHS = ('/', '/login', '/api/v1/users', '/api/v1/orders', '/static/app.js', '/health', '/admin')
+METHODS = ('GET', 'GET', 'GET', 'POST', 'PUT', 'DELETE')
+HTTP_CODES = (200, 200, 200, 201, 204, 301, 304, 400, 401, 403, 404, 500, 502, 503)
+BLOCK_SIZE = 1024 * 1024
+BLOCKS = 8
+GENERATOR_VERSION = 1   # bump whenever the generated lines change
+
+UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def parse_size(text):
+    """'512M' / '1G' / '1048576' -> bytes"""
+    text = str(text).strip().upper().rstrip('B')
+    if text and text[-1] in UNITS:
+        return int(float(text[:-1]) * UNITS[text[-1]])
+    return int(text)
+
+
+def _ip(rng):
+    return f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+
+
+def _nginx(rng, ts):
+    return (f'{_ip(rng)} - - [{ts["clf"]}] "{rng.choice(METHODS)} {rng.choice(PATHS)} HTTP/1.1" '
+            f'{rng.choice(HTTP_CODES)} {rng.randrange(20, 90000)} "-" "Mozilla/5.0"')
+
+
+def _apache(rng, ts):
+    level = rng.choice(('notice', 'warn', 'error'))
+    return (f'[{ts["ctime"]}] [core:{level}] [pid {rng.randrange(1000, 9999)}] '
+            f'[client {_ip(rng)}:{rng.randrange(1024, 65535)}] AH00128: File does not exist: /var/www{rng.choice(PATHS)}')
+
+
+def _postgresql(rng, ts):
+    message = rng.choice((
+        'LOG:  duration: {ms}.123 ms  statement: SELECT * FROM orders WHERE id = {n}',
+        'ERROR:  deadlock detected',
+        'FATAL:  password authentication failed for user "app"',
+        'WARNING:  there is already a transaction in progress',
+        'LOG:  checkpoint complete: wrote {n} buffers',
+    )).format(ms=rng.randrange(1, 5000), n=rng.randrange(100000))
+    return f'{ts["iso"]} UTC [{rng.randrange(1000, 65535)}] {message}'
+
+
+def _mysql(rng, ts):
+    return (f'{ts["isoz"]} {rng.randrange(1, 500)} [{rng.choice(("Note", "Warning", "ERROR"))}] '
+            f'[MY-0{rng.randrange(10000, 13000)}] [Server] Aborted connection {rng.randrange(100000)} to db: \'app\'')
+
+
+def _redis(rng, ts):
+    return (f'{rng.randrange(1, 9999)}:M {ts["redis"]} {rng.choice(("*", "#", "-"))} '
+            f'{rng.choice(("Background saving started", "DB saved on disk", "MASTER <-> REPLICA sync started", "OOM command not allowed"))}')
+
+
+def _kubernetes(rng, ts):
+    reason = rng.choice(('Started', 'Pulled', 'BackOff', 'OOMKilled', 'FailedScheduling', 'Unhealthy'))
+    return (f'{ts["isoz"]} kubelet {rng.choice("IWE")}0101 {ts["hms"]} {rng.randrange(1, 99999)} '
+            f'pod api-{rng.randrange(16 ** 3):03x} {reason} namespace=prod node=node-{rng.randrange(40)}')
+
+
+def _docker(rng, ts):
+    return (f'{ts["isoz"]} dockerd level={rng.choice(("info", "warning", "error"))} '
+            f'msg="container {rng.randrange(16 ** 12):012x} {rng.choice(ACTIONS)}"')
+
+
+def _ssh(rng, ts):
+    message = rng.choice((
+        'Accepted publickey for deploy from {ip} port {port} ssh2',
+        'Failed password for invalid user admin from {ip} port {port} ssh2',
+        'Connection closed by authenticating user root {ip} port {port} [preauth]',
+    )).format(ip=_ip(rng), port=rng.randrange(1024, 65535))
+    return f'{ts["syslog"]} host sshd[{rng.randrange(100, 99999)}]: {message}'
+
+
+def _sudo(rng, ts):
+    return (f'{ts["syslog"]} host sudo:   deploy : TTY=pts/{rng.randrange(9)} ; PWD=/srv ; '
+            f'USER=root ; COMMAND=/usr/bin/systemctl restart app')
+
+
+def _kafka(rng, ts):
+    return (f'[{ts["iso"]},{rng.randrange(1000):03d}] {rng.choice(LEVELS)} [ReplicaManager broker={rng.randrange(6)}] '
+            f'Partition orders-{rng.randrange(64)} {rng.choice(ACTIONS)} (kafka.server.ReplicaManager)')
+
+
+def _rabbitmq(rng, ts):
+    return (f'{ts["iso"]}.{rng.randrange(1000):03d} [{rng.choice(("info", "warning", "error"))}] '
+            f'<0.{rng.randrange(9999)}.0> closing AMQP connection ({_ip(rng)}:{rng.randrange(1024, 65535)})')
+
+
+def _python(rng, ts):
+    error = rng.choice(('ValueError', 'KeyError', 'TimeoutError', 'ConnectionResetError'))
+    return f'{ts["iso"]},{rng.randrange(1000):03d} {rng.choice(LEVELS)} app.worker: task {rng.randrange(10 ** 6)} raised {error}'
+
+
+def _java(rng, ts):
+    return (f'{ts["iso"]}.{rng.randrange(1000):03d} {rng.choice(LEVELS):5s} [http-nio-8080-exec-{rng.randrange(200)}] '
+            f'c.e.app.OrderService - java.sql.SQLTimeoutException: query took {rng.randrange(1000, 30000)}ms')
+
+
+def _iptables(rng, ts):
+    return (f'{ts["syslog"]} fw kernel: [UFW BLOCK] IN=eth0 OUT= SRC={_ip(rng)} DST={_ip(rng)} '
+            f'PROTO=TCP SPT={rng.randrange(1024, 65535)} DPT={rng.choice((22, 80, 443, 3306, 5432))}')
+
+
+def _postfix(rng, ts):
+    return (f'{ts["syslog"]} mail postfix/smtp[{rng.randrange(100, 99999)}]: {rng.randrange(16 ** 10):010X}: '
+            f'to=<user{rng.randrange(1000)}@example.com>, status={rng.choice(("sent", "deferred", "bounced"))}')
+
+
+def _jenkins(rng, ts):
+    return (f'{ts["iso"]}.{rng.randrange(1000):03d}+0000 [id={rng.randrange(999)}] {rng.choice(("INFO", "WARNING", "SEVERE"))} '
+            f'hudson.model.Run#execute: build #{rng.randrange(5000)} {rng.choice(("SUCCESS", "FAILURE", "ABORTED"))}')
+
+
+def _prometheus(rng, ts):
+    return (f'ts={ts["isoz"]} caller=scrape.go:{rng.randrange(100, 1500)} level={rng.choice(("info", "warn", "error"))} '
+            f'component="scrape manager" msg="Scrape failed" target=http://{_ip(rng)}:9100/metrics')
+
+
+def _app(rng, ts):
+    return (f'{ts["iso"]}.{rng.randrange(1000):03d} {rng.choice(LEVELS)} {rng.choice(EVENTS)} request '
+            f'{rng.choice(ACTIONS)} user={rng.randrange(10000)} took={rng.randrange(2000)}ms')
+
+
+FAMILIES = {
+    'nginx': _nginx, 'apache': _apache,
+    'postgresql': _postgresql, 'mysql': _mysql, 'redis': _redis,
+    'kubernetes': _kubernetes, 'docker': _docker,
+    'ssh': _ssh, 'sudo': _sudo,
+    'kafka': _kafka, 'rabbitmq': _rabbitmq,
+    'python': _python, 'java': _java,
+    'iptables': _iptables, 'postfix': _postfix,
+    'jenkins': _jenkins, 'prometheus': _prometheus,
+    'app': _app,
+}
+
+
+def _timestamps(rng, day):
+    hour, minute, second = rng.randrange(24), rng.randrange(60), rng.randrange(60)
+    month = MONTHS[0]
+    hms = f"{hour:02d}:{minute:02d}:{second:02d}"
+    return {
+        'hms': hms,
+        'iso': f"2024-01-{day:02d} {hms}",
+        'isoz': f"2024-01-{day:02d}T{hms}Z",
+        'clf': f"{day:02d}/{month}/2024:{hms} +0000",
+        'ctime': f"Mon {month} {day:02d} {hms}.{rng.randrange(10 ** 6):06d} 2024",
+        'syslog': f"{month} {day:2d} {hms}",
+        'redis': f"{day:02d} {month} 2024 {hms}.{rng.randrange(1000):03d}",
+    }
+
+
+def make_line(rng, day=1, families=None):
+    """(family, line) for one synthetic log line"""
+    family = rng.choice(families or tuple(FAMILIES))
+    return family, FAMILIES[family](rng, _timestamps(rng, day))
+
+
+def make_block(rng, size=BLOCK_SIZE, day=1, families=None):
+    lines = []
+    total = 0
+    while total < size:
+        _family, line = make_line(rng, day, families)
+        lines.append(line)
+        total += len(line) + 1
+    lines.append('')
+    return "\n".join(lines).encode('utf-8')
+
+
+def generate(path, size, seed=0, families=None):
+    """Write ~size bytes of synthetic log lines to path; returns bytes written"""
+    rng = random.Random(seed)
+    blocks = [make_block(rng, day=i + 1, families=families) for i in range(BLOCKS)]
+    written = 0
+    with open(path, 'wb') as f:
+        i = 0
+        while written < size:
+            block = blocks[i % len(blocks)]
+            f.write(block)
+            written += len(block)
+            i += 1
+    return written
+
+
+def ensure(directory, prefix, size, seed=0):
+    """
+    Path of a generated log in directory, written unless already there.
+    The name carries size, seed and GENERATOR_VERSION, so a file left by
+    another seed or an older generator is never reused.
+    """
+    path = os.path.join(directory, f"{prefix}-{size}-s{seed}-g{GENERATOR_VERSION}.log")
+    if os.path.exists(path) and abs(os.path.getsize(path) - size) <= BLOCK_SIZE:
+        return path
+    generate(path, size, seed)
+    return path
+
+
+def result_records(count, seed=0, families=None):
+    """
+    Deterministic analysis results ({'event', 'status', 'confidence', ...})
+    as the API returns them from a scan, for the result-set stages.
+    """
+    rng = random.Random(seed)
+    names = families or tuple(FAMILIES)
+    records = []
+    for i in range(count):
+        day = 1 + i * 7 // max(count, 1)
+        family, line = make_line(rng, day, names)
+        records.append({
+            'event': family,
+            'status': rng.choice(STATUSES),
+            'level': rng.choice(LEVELS),
+            'confidence': round(rng.random(), 3),
+            'severity': rng.randrange(10),
+            'timestamp': f"2024-01-{day:02d} {rng.randrange(24):02d}:{rng.randrange(60):02d}:00",
+            'file': f"/var/log/{family}.log",
+            'message': line,
+        })
+    return records
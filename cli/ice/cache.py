@@ -0,0 +1,193 @@
+"""
+Persistent parse cache - parse stats keyed by file identity
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import time
+from pathlib import Path
+
+
+CACHE_DIR = Path.home() / ".devlog_cache"
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3   # 2 GB
+FINGERPRINT_BLOCK = 64 * 1024       # bytes hashed at head and at cached end
+
+FRESH, APPENDED, STALE = 'fresh', 'appended', 'stale'
+
+
+def _digest(f, start, length):
+    f.seek(max(start, 0))
+    return hashlib.blake2b(f.read(length), digest_size=16).hexdigest()
+
+
+def fingerprint(path, size):
+    """(head hash, hash of the block ending at `size`) - detects rotation vs append"""
+    with open(path, 'rb') as f:
+        head = _digest(f, 0, min(size, FINGERPRINT_BLOCK))
+        tail = _digest(f, size - FINGERPRINT_BLOCK, min(size, FINGERPRINT_BLOCK))
+    return head, tail
+
+
+class CacheEntry:
+    """Index record for one cached file"""
+
+    __slots__ = ('key', 'path', 'size', 'mtime', 'head', 'tail',
+                 'disk_bytes', 'last_used', 'state')
+
+    def __init__(self, key, path, size, mtime, head, tail,
+                 disk_bytes=0, last_used=0.0, state=STALE):
+        self.key = key
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.head = head
+        self.tail = tail
+        self.disk_bytes = disk_bytes
+        self.last_used = last_used
+        self.state = state
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__ if name != 'state'}
+
+
+class ParseCache:
+    """
+    On-disk cache under ~/.devlog_cache.
+
+    An entry is keyed by absolute path and validated by size, mtime and a
+    content fingerprint. A file that only grew keeps its entry and the
+    caller parses just the tail; anything else is a miss. The total size is
+    capped and least-recently-used entries are evicted first.
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.root / "index.json"
+        self._index = self._load_index()
+
+    # -- index ---------------------------------------------------------
+
+    def _load_index(self):
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        entries = {}
+        for key, data in raw.items():
+            data.pop('has_events', None)    # written by versions that cached events
+            entries[key] = CacheEntry(**data)
+        return entries
+
+    def _save_index(self):
+        tmp = self._index_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({k: e.to_dict() for k, e in self._index.items()}, f)
+        os.replace(tmp, self._index_path)
+
+    @staticmethod
+    def key_for(path):
+        return hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+
+    def _file(self, key, suffix):
+        return self.root / f"{key}.{suffix}"
+
+    # -- lookup --------------------------------------------------------
+
+    def lookup(self, path):
+        """Entry for path with .state set to fresh/appended/stale, or None"""
+        entry = self._index.get(self.key_for(path))
+        if entry is None:
+            return None
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        if st.st_size == entry.size and st.st_mtime == entry.mtime:
+            entry.state = FRESH
+        elif st.st_size > entry.size and fingerprint(path, entry.size) == (entry.head, entry.tail):
+            entry.state = APPENDED
+        else:
+            entry.state = STALE
+        return entry
+
+    def load_stats(self, entry):
+        with open(self._file(entry.key, 'stats'), 'rb') as f:
+            stats = pickle.load(f)
+        self.touch(entry)
+        return stats
+
+    def touch(self, entry):
+        entry.last_used = time.time()
+        self._save_index()
+
+    # -- store ---------------------------------------------------------
+
+    def store(self, path, stats, size, mtime):
+        """
+        Record stats for the first `size` bytes of path - the size that was
+        parsed, taken before parsing, so lines appended meanwhile are picked
+        up as a tail next time instead of being skipped.
+        """
+        key = self.key_for(path)
+        head, tail = fingerprint(path, size)
+
+        stats_file = self._file(key, 'stats')
+        with open(stats_file, 'wb') as f:
+            pickle.dump(stats, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self._index[key] = CacheEntry(
+            key, os.path.abspath(path), size, mtime, head, tail,
+            disk_bytes=stats_file.stat().st_size, last_used=time.time(),
+        )
+        self._evict()
+        self._save_index()
+
+    def set_max_bytes(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._evict()
+        self._save_index()
+
+    def _evict(self):
+        total = self.total_bytes()
+        for entry in sorted(self._index.values(), key=lambda e: e.last_used):
+            if total <= self.max_bytes:
+                break
+            total -= entry.disk_bytes
+            self._drop(entry.key)
+
+    def _drop(self, key):
+        for suffix in ('stats', 'events'):     # .events: left by older versions
+            try:
+                self._file(key, suffix).unlink()
+            except FileNotFoundError:
+                pass
+        self._index.pop(key, None)
+
+    # -- inspection ----------------------------------------------------
+
+    def entries(self):
+        return sorted(self._index.values(), key=lambda e: e.last_used, reverse=True)
+
+    def total_bytes(self):
+        return sum(e.disk_bytes for e in self._index.values())
+
+    def clear(self, path=None):
+        """Drop one entry (by path) or everything; returns entries removed"""
+        if path is not None:
+            key = self.key_for(path)
+            if key not in self._index:
+                return 0
+            self._drop(key)
+            self._save_index()
+            return 1
+        count = len(self._index)
+        for key in list(self._index):
+            self._drop(key)
+        self._save_index()
+        return count
@@ -1,31 +1,196 @@
 import argparse
+import hashlib
+import os
+import pickle
+import shutil
+import subprocess
 from datetime import date
+from pathlib import Path
 
 from engine.toolbox.changelog import collect_changes, build_changelog, render_markdown
 
+
+CACHE_DIR = Path.home() / ".devlog_cache" / "changelog"
+HEAD_LINES = 64            # lines scanned for the title block above the first section
+COPY_CHUNK = 1024 * 1024   # bytes per copy step when rewriting the changelog
+CACHE_VERSION = 1          # bump when the cached segment layout changes
+
+
+def _git(*args):
+    return subprocess.run(("git",) + args, check=True, capture_output=True, text=True).stdout
+
+
+def resolve(*refs):
+    """Commit SHAs for refs, in one git call"""
+    out = _git("rev-parse", *(f"{ref}^{{commit}}" for ref in refs))
+    return out.split()
+
+
+def is_ancestor(a, b):
+    return subprocess.run(("git", "merge-base", "--is-ancestor", a, b), capture_output=True).returncode == 0
+
+
+class ChangeCache:
+    """
+    Parsed changes per history segment, keyed by (from SHA, to SHA).
+
+    A range is covered by chaining cached segments F..A, A..B, ... that
+    lie on it; only the part past the last cached commit goes through
+    collect_changes. Since F..T = F..A + A..T whenever A is between F and
+    T, the result is the same as one collect_changes(F, T).
+    """
+
+    def __init__(self, root=CACHE_DIR):
+        toplevel = _git("rev-parse", "--show-toplevel").strip()
+        key = hashlib.blake2b(toplevel.encode(), digest_size=8).hexdigest()
+        self.path = Path(root) / f"{key}.pkl"
+        self.segments = {}   # from SHA -> {to SHA: items}
+        self.dirty = False
+        try:
+            with open(self.path, "rb") as f:
+                data = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+            # Unreadable, or written against change classes that moved or
+            # changed since: start over
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            self.segments = data["segments"]
+
+    def changes(self, start, end):
+        """Items for start..end (SHAs), newest segment first"""
+        parts = []
+        current = start
+        while current != end:
+            cached = [(to, items) for to, items in self.segments.get(current, {}).items()
+                      if to == end or (is_ancestor(to, end) and is_ancestor(current, to))]
+            if cached:
+                # Longest cached step: the end closest to the target
+                to, items = cached[0] if len(cached) == 1 else max(
+                    cached, key=lambda c: (c[0] == end, _count(current, c[0])))
+            else:
+                to, items = end, list(collect_changes(current, end))
+                self.segments.setdefault(current, {})[to] = items
+                self.dirty = True
+            parts.append(items)
+            current = to
+        return [item for items in reversed(parts) for item in items]
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump({"version": CACHE_VERSION, "segments": self.segments}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+
+
+def _count(start, end):
+    return int(_git("rev-list", "--count", f"{start}..{end}"))
+
+
+def read_batch(path):
+    """(version, from, to, date) per line of 'VERSION FROM TO [DATE]', oldest first"""
+    ranges = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split("#", 1)[0].split()
+            if not parts:
+                continue
+            if len(parts) not in (3, 4):
+                raise ValueError(f"Bad batch line (want VERSION FROM TO [DATE]): {line.strip()}")
+            ranges.append(tuple(parts) if len(parts) == 4 else tuple(parts) + (None,))
+    return ranges
+
+
+def _split_title(src):
+    """
+    (title, rest) from the top of an open changelog: the lines above the
+    first '## ' section, read at most HEAD_LINES deep. Past that only a
+    '# ' first line counts as title.
+    """
+    head = []
+    for line in src:
+        head.append(line)
+        if line.startswith("## "):
+            return "".join(head[:-1]), head[-1]
+        if len(head) > HEAD_LINES:
+            break
+    if len(head) <= HEAD_LINES:
+        return "".join(head), ""
+    if head[0].startswith("# "):
+        return head[0], "".join(head[1:])
+    return "", "".join(head)
+
+
+def prepend_sections(path, md):
+    """
+    Put md on top of the changelog (below its title), streaming the old
+    content into a temporary file that then replaces it atomically.
+    """
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        src = open(path, "r", encoding="utf-8", newline="")
+    except FileNotFoundError:
+        src = None
+
+    try:
+        with open(tmp, "w", encoding="utf-8", newline="") as out:
+            if src is None:
+                out.write("# Changelog\n\n" + md.rstrip() + "\n")
+            else:
+                with src:
+                    title, rest = _split_title(src)
+                    if title.strip():
+                        out.write(title.rstrip() + "\n\n")
+                    out.write(md.rstrip() + "\n")
+                    if rest:
+                        out.write("\n" + rest)
+                    shutil.copyfileobj(src, out, COPY_CHUNK)
+                shutil.copymode(path, tmp)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(description="Generate changelog from git history.")
-    parser.add_argument("--from", dest="from_ref", required=True, help="Base ref (tag/branch/commit)")
+    parser.add_argument("--from", dest="from_ref", help="Base ref (tag/branch/commit)")
     parser.add_argument("--to", dest="to_ref", default="HEAD", help="Target ref (default: HEAD)")
-    parser.add_argument("--version", required=True, help="Release version (e.g. 0.4.0)")
+    parser.add_argument("--version", help="Release version (e.g. 0.4.0)")
     parser.add_argument("--date", default=None, help="Release date (YYYY-MM-DD, default: today)")
-    parser.add_argument("--append-file", default="CHANGELOG.md", help="File to append to (default: CHANGELOG.md)")
+    parser.add_argument("--append-file", default="CHANGELOG.md", help="Changelog to add the new sections to; they go at the top, below the title (default: CHANGELOG.md)")
+    parser.add_argument("--batch", help="File of 'VERSION FROM TO [DATE]' lines, oldest first: one section each")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not update the commit cache")
     args = parser.parse_args(argv)
 
-    d = args.date or str(date.today())
+    if args.batch:
+        ranges = read_batch(args.batch)
+    elif args.from_ref and args.version:
+        ranges = [(args.version, args.from_ref, args.to_ref, args.date)]
+    else:
+        parser.error("--from and --version are required (or use --batch)")
 
-    items = collect_changes(args.from_ref, args.to_ref)
-    ch = build_changelog(args.version, d, items)
-    md = render_markdown(ch)
+    today = str(date.today())
+    shas = resolve(*(ref for _v, start, end, _d in ranges for ref in (start, end)))
+    cache = None if args.no_cache else ChangeCache()
 
-    # Append in testa al file
-    try:
-        with open(args.append_file, "r", encoding="utf-8") as f:
-            existing = f.read()
-    except FileNotFoundError:
-        existing = "# Changelog\n\n"
+    sections = []
+    for i, (version, _start, _end, day) in enumerate(ranges):
+        start, end = shas[2 * i], shas[2 * i + 1]
+        items = cache.changes(start, end) if cache is not None else collect_changes(start, end)
+        ch = build_changelog(version, day or args.date or today, items)
+        sections.append(render_markdown(ch))
+    if cache is not None:
+        cache.save()
 
-    with open(args.append_file, "w", encoding="utf-8") as f:
-        f.write(existing.rstrip() + "\n\n" + md)
+    # In testa al file: la release più recente per prima
+    md = "\n\n".join(section.rstrip() for section in reversed(sections)) + "\n"
+    prepend_sections(args.append_file, md)
 
-    print(md)
\ No newline at end of file
+    print(md)
@@ -4,28 +4,24 @@ DevLog CLI Shell - Updated for DevLog name
 
 import shlex
 from pathlib import Path
-from rich.console import Console
-from prompt_toolkit import PromptSession
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.styles import Style
-from prompt_toolkit.formatted_text import HTML
 
-# Import shared commands
-from devlog.commands import CommandContext, registry, register_all_commands
-
-# Import completer (CLI specific)
-from devlog.cli.completer.completer import DynamicLogParserCompleter
+# rich / prompt_toolkit / shared commands are imported where first needed,
+# so `--startup-profile` can see them and quick paths don't pay for them.
 
 
 HISTORY_FILE = Path.home() / ".devlog_history"
 
-style = Style.from_dict({
+STYLE = {
     'prompt': 'cyan bold',
     'completion-menu.completion': 'bg:#008888 #ffffff',
     'completion-menu.completion.current': 'bg:#00aaaa #000000',
     'completion-menu.meta.completion': 'bg:#444444 #ffffff',
     'completion-menu.meta.completion.current': 'bg:#00aaaa #000000',
-})
+}
+
+
+class UnknownCommandError(Exception):
+    """Command name not found in the registry"""
 
 
 class DevLogShell:
@@ -33,119 +29,361 @@ class DevLogShell:
     Modern shell for DevLog using shared commands layer
     """
     
-    def __init__(self, api=None, debug=False):
-        self.console = Console()
+    def __init__(self, api=None, debug=False, lazy_commands=True, interactive=True, console=None,
+                 profile=None, metrics_file=None):
+        from rich.console import Console
+        from devlog.commands import registry
+        from devlog.cli.commands.manifest import register_commands
+        from devlog.cli.commands.base import ShellRegistry
+        from devlog.cli.results.resultset import ResultSet
+        from devlog.cli.jobs import JobManager
+        from devlog.cli.instrument import Instrumentation
+        
+        self.console = console or Console()
         self.api = api  # API Layer
         self.debug = debug
-        self.last_results = []
+        self._results = ResultSet()
+        self._parse_cache = None
+        self._history = None
+        self.jobs = JobManager()
+        self.log_files = []  # files given at startup (dashboard --live)
+        self.listing = None  # last paged listing (filter/search/top), see `more`
+        self.selection = None  # rows of the last complete filter (filter --refine, export --filter)
+        self.instrument = Instrumentation(profile=profile, metrics_file=metrics_file)
         
         # Config
         self.config = {
             'max_display': 20,
             'auto_save': False,
             'show_confidence': True,
+            'fuzzy_complete': False,
         }
         
-        # Use global registry with shared commands
-        register_all_commands()
-        self.registry = registry
+        # Global registry with shared commands (lazy proxies from the
+        # cached manifest; modules are imported on first execution)
+        self.commands_source = register_commands(registry, lazy=lazy_commands)
         
-        # Add CLI-specific utility commands
+        # CLI-specific commands are bound to this shell: they go in its own
+        # registry, layered over the shared one
+        self.registry = ShellRegistry(registry)
         self._register_cli_commands()
         
+        self.completer = None
+        self.session = None
+        if interactive:
+            self._init_prompt()
+        
+        self.running = True
+    
+    def _init_prompt(self):
+        """Completer + prompt session (skipped for batch/script use)"""
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.styles import Style
+        from devlog.cli.completer.completer import DynamicLogParserCompleter
+        
         # Dynamic completer
-        completer = DynamicLogParserCompleter(self)
+        self.completer = DynamicLogParserCompleter(self)
         
-        # Prompt session
+        # Prompt session (completions run off the input thread; the
+        # toolbar shows running jobs and is refreshed while they run)
         self.session = PromptSession(
-            history=FileHistory(str(HISTORY_FILE)),
-            completer=completer,
-            style=style,
+            history=self.history,
+            completer=self.completer,
+            complete_in_thread=True,
+            style=Style.from_dict(STYLE),
+            bottom_toolbar=self.get_toolbar,
+            refresh_interval=0.5,
         )
-        
-        self.running = True
     
     def _register_cli_commands(self):
-        """Register CLI-specific commands (help, exit, config, cls)"""
-        from devlog.commands.utility import (
-            HelpCommand, ExitCommand, ConfigCommand, ClearScreenCommand
-        )
-        
-        self.registry.register(HelpCommand())
-        self.registry.register(ExitCommand())
-        self.registry.register(ConfigCommand())
-        self.registry.register(ClearScreenCommand())
+        """Register CLI-specific commands that need the shell itself"""
+        from devlog.cli.commands.cache import CacheCommand
+        from devlog.cli.commands.results import FilterCommand, TopCommand, TimelineCommand, SearchCommand, MoreCommand
+        from devlog.cli.commands.jobs import JobsCommand, FgCommand, KillCommand
+        from devlog.cli.commands.dashboard import DashboardCommand
+        from devlog.cli.commands.benchmark import BenchmarkCommand
+        from devlog.cli.commands.metrics import MetricsCommand, ProfileCommand
+        from devlog.cli.commands.approx import StatsCommand, InsightsCommand
+        from devlog.cli.commands.history import HistoryCommand
+        from devlog.cli.commands.session import SessionCommand
+        from devlog.cli.commands.export import ExportCommand
+        from devlog.cli.commands.help import HelpCommand
+        shared = self.registry.shared
+        self.registry.register(CacheCommand(self))
+        self.registry.register(FilterCommand(self))
+        self.registry.register(TopCommand(self))
+        self.registry.register(TimelineCommand(self))
+        self.registry.register(SearchCommand(self))
+        self.registry.register(MoreCommand(self))
+        self.registry.register(JobsCommand(self))
+        self.registry.register(FgCommand(self))
+        self.registry.register(KillCommand(self))
+        self.registry.register(DashboardCommand(self))
+        self.registry.register(BenchmarkCommand(self))
+        self.registry.register(MetricsCommand(self))
+        self.registry.register(ProfileCommand(self))
+        self.registry.register(SessionCommand(self))
+        # Wrappers: new options handled here, the rest by the shared command
+        self.registry.register(StatsCommand(self, shared.get('stats')))
+        self.registry.register(InsightsCommand(self, shared.get('insights')))
+        self.registry.register(HistoryCommand(self, shared.get('history')))
+        self.registry.register(ExportCommand(self, shared.get('export')))
+        self.registry.register(HelpCommand(self, shared.get('help')))
+    
+    @property
+    def last_results(self):
+        """Current result set (columnar; rows still answer r.get(...))"""
+        return self._results
+    
+    @last_results.setter
+    def last_results(self, results):
+        from devlog.cli.results.resultset import ResultSet
+        from devlog.cli.results.facets import facets
+        self._results = ResultSet.from_records(results)
+        # Facets are built at load time so completion/filter never scan;
+        # a mapped snapshot builds them on first use so opening it stays instant
+        if not self._results.mapped:
+            facets(self._results)
+    
+    @property
+    def history(self):
+        """Command history (bounded, indexed), opened on first use"""
+        if self._history is None:
+            from devlog.cli.history import IndexedHistory
+            self._history = IndexedHistory(HISTORY_FILE)
+        return self._history
+    
+    @property
+    def parse_cache(self):
+        """Persistent parse cache, opened on first use"""
+        if self._parse_cache is None:
+            from devlog.cli.cache import ParseCache
+            self._parse_cache = ParseCache()
+        return self._parse_cache
     
     def get_prompt(self):
         """Return formatted prompt"""
+        from prompt_toolkit.formatted_text import HTML
         return HTML('<prompt>❯</prompt> ')
     
+    def get_toolbar(self):
+        """Bottom toolbar: one entry per running job, hidden when idle"""
+        running = self.jobs.running()
+        if not running:
+            return None
+        entries = []
+        for job in running:
+            progress = job.describe_progress()
+            detail = f"{progress} " if progress else ""
+            entries.append(f"%{job.id} {job.text[:30]} {detail}{job.elapsed:.0f}s")
+        return "  |  ".join(entries)
+    
+    def resolve(self, text):
+        """(command, args) for a command line; raises UnknownCommandError"""
+        parts = shlex.split(text)
+        if parts and parts[-1] == '&':
+            parts.pop()   # batch/daemon callers run `&` lines in the foreground
+        if not parts:
+            return None, []
+        
+        command_name = parts[0].lower()
+        command = self.registry.get(command_name)
+        if not command:
+            raise UnknownCommandError(f"Unknown command: {command_name}")
+        return command, parts[1:]
+    
+    def run_command(self, text, console=None, job=None, profile=None):
+        """
+        Parse and execute one command line through the registry.
+        
+        Returns False when the command asked the shell to stop. Raises
+        UnknownCommandError for unknown commands; command errors propagate.
+        With a job, the context carries it (ctx.job), its cancel token and
+        its progress hook.
+        Execution is timed by self.instrument; `profile` ('cpu', 'mem',
+        'all') profiles this one command.
+        """
+        from devlog.commands import CommandContext
+        
+        command, args = self.resolve(text)
+        if command is None:
+            return True
+        
+        # Create context with API
+        ctx = CommandContext(
+            api=self.api,
+            console=console or self.console,
+            args=args,
+            raw_input=text,
+            gui_callback=None  # CLI doesn't use callbacks
+        )
+        ctx.job = job
+        if job is not None:
+            ctx.cancel_token = job.token
+            ctx.progress = job.update
+        ctx.rows = None  # commands may report how many rows they processed
+        return bool(self.instrument.run(command.name, command.execute, ctx,
+                                        results=lambda: self._results, profile=profile))
+    
     def cmdloop(self):
         """Main command loop"""
+        import asyncio
+        
         self.console.print("\n[bold cyan]DevLog Shell[/bold cyan]")
         self.console.print("[dim]Type 'help' for commands, Tab for autocompletion[/dim]")
-        self.console.print("[dim]Use ↑↓ for history[/dim]\n")
+        self.console.print("[dim]Use ↑↓ for history, a trailing & to run in the background[/dim]\n")
         
-        while self.running:
-            try:
-                text = self.session.prompt(self.get_prompt())
-                
-                if not text.strip():
+        try:
+            asyncio.run(self.cmdloop_async())
+        finally:
+            self.jobs.cancel_all()
+    
+    async def cmdloop_async(self):
+        """
+        Prompt loop on prompt_async; every command runs as a job thread.
+        
+        The foreground job is awaited with SIGINT routed to it: the first
+        Ctrl-C asks it to cancel, a second one moves it to the background.
+        """
+        from prompt_toolkit.patch_stdout import patch_stdout
+        
+        with patch_stdout(raw=True):
+            while self.running:
+                self._report_finished_jobs()
+                try:
+                    text = await self.session.prompt_async(self.get_prompt())
+                except KeyboardInterrupt:
                     continue
+                except EOFError:
+                    break
                 
-                parts = shlex.split(text)
-                if not parts:
+                text = text.strip()
+                background = text.endswith('&')
+                if background:
+                    text = text[:-1].rstrip()
+                if not text:
                     continue
                 
-                command_name = parts[0].lower()
-                args = parts[1:]
+                try:
+                    command, _ = self.resolve(text)
+                except UnknownCommandError as e:
+                    self.console.print(f"[red]{e}[/red]")
+                    self.console.print("[dim]Type 'help' for available commands[/dim]")
+                    continue
+                except ValueError as e:  # shlex: unbalanced quotes
+                    self.console.print(f"[red]Error: {e}[/red]")
+                    continue
                 
-                command = self.registry.get(command_name)
+                job = self.jobs.submit(text, lambda job, text=text: self.run_command(text, job=job),
+                                       background=background)
+                if background:
+                    self.console.print(f"[dim][%{job.id}] started: {text}[/dim]")
+                    continue
                 
-                if command:
-                    # Create context with API
-                    ctx = CommandContext(
-                        api=self.api,
-                        console=self.console,
-                        args=args,
-                        raw_input=text,
-                        gui_callback=None  # CLI doesn't use callbacks
-                    )
-                    
-                    should_continue = command.execute(ctx)
-                    if not should_continue:
-                        break
-                else:
-                    self.console.print(f"[red]Unknown command: {command_name}[/red]")
-                    self.console.print("[dim]Type 'help' for available commands[/dim]")
-            
-            except KeyboardInterrupt:
-                self.console.print("\n[dim]Use 'exit' to leave[/dim]")
-            except EOFError:
-                break
-            except Exception as e:
-                self.console.print(f"[red]Error: {e}[/red]")
-                if self.debug:
-                    import traceback
-                    traceback.print_exc()
+                if not await self._wait_foreground(job):
+                    break
+    
+    async def _wait_foreground(self, job):
+        """Await a foreground job; returns False when the shell should stop"""
+        import asyncio
+        import signal
+        from devlog.cli.jobs import JobCancelled
+        
+        loop = asyncio.get_running_loop()
+        detach = asyncio.Event()
+        
+        def on_interrupt():
+            if job.token.cancelled:
+                detach.set()
+            else:
+                job.cancel()
+                self.console.print("\n[yellow]Cancelling... (Ctrl-C again to move it to the background)[/yellow]")
+        
+        try:
+            loop.add_signal_handler(signal.SIGINT, on_interrupt)
+        except (NotImplementedError, RuntimeError):
+            pass  # e.g. Windows: Ctrl-C is not forwarded while waiting
+        
+        waiter = asyncio.ensure_future(detach.wait())
+        result = asyncio.wrap_future(job.future)
+        try:
+            await asyncio.wait({result, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            waiter.cancel()
+            try:
+                loop.remove_signal_handler(signal.SIGINT)
+            except (NotImplementedError, RuntimeError):
+                pass
+        
+        if not result.done():
+            job.background = True
+            self.console.print(f"[dim][%{job.id}] moved to the background[/dim]")
+            return True
+        
+        try:
+            return result.result()
+        except JobCancelled:
+            self.console.print(f"[yellow]Cancelled: {job.text}[/yellow]")
+        except Exception as e:
+            self.console.print(f"[red]Error: {e}[/red]")
+            if self.debug:
+                import traceback
+                traceback.print_exception(type(e), e, e.__traceback__)
+        return True
+    
+    def _report_finished_jobs(self):
+        """Announce background jobs that ended since the last prompt"""
+        for job in self.jobs.finished_background():
+            state = job.state
+            color = {'done': 'green', 'cancelled': 'yellow'}.get(state, 'red')
+            line = f"[{color}][%{job.id}] {state} ({job.elapsed:.1f}s): {job.text}[/{color}]"
+            if state == 'failed':
+                line += f" [red]- {job.future.exception()}[/red]"
+            self.console.print(line)
 
 
-def main(debug=False, file_path=None):
-    """Main entry point for DevLog CLI"""
-    console = Console()
+def main(debug=False, file_path=None, workers=None, chunk_size=None, use_cache=True,
+         startup_profile=False, commands=None, script=None, keep_going=False, session=None,
+         json_output=None, daemon=False, profile=None, metrics_file=None):
+    """Main entry point for DevLog CLI
+    
+    file_path may be a single path, a glob, or a list of either; several
+    files are parsed in a process pool of `workers` processes.
+    
+    commands (list of lines) and/or script (path or '-') switch to batch
+    mode: no banner, no prompt, status messages on stderr. daemon=True
+    serves the shell over a Unix socket instead (see daemon.py).
+    
+    profile ('cpu', 'mem', 'all') profiles every command; metrics_file is
+    rewritten in Prometheus text format after each one. session names a
+    saved snapshot (see `session save`) loaded as the shell's results.
+    """
+    from devlog.cli.startup import ImportProfiler, NullProfiler
+    profiler = ImportProfiler() if startup_profile else NullProfiler()
+    batch = bool(commands or script or daemon)
+    
+    with profiler:
+        from rich.console import Console
+        console = Console(stderr=batch)
+        profiler.phase("rich")
     
     try:
         # Display banner
         try:
-            from devlog.cli.display.banner import display_banner
-            display_banner()
+            if not batch:
+                with profiler:
+                    from devlog.cli.display.banner import display_banner
+                    display_banner()
+                    profiler.phase("banner")
         except:
             console.print("[bold cyan]DevLog - Advanced Log Analysis v2.0[/bold cyan]\n")
         
         # Initialize API layer
         try:
-            from devlog.api import create_api
-            api = create_api(debug=debug)
+            with profiler:
+                from devlog.api import create_api
+                api = create_api(debug=debug)
+                profiler.phase("api")
             console.print("[green]✓ API initialized[/green]")
         except Exception as e:
             console.print(f"[red]✗ Failed to initialize API: {e}[/red]")
@@ -155,32 +393,70 @@ def main(debug=False, file_path=None):
             return 1
         
         # If file provided, analyze it directly
+        paths = []
         if file_path:
-            console.print(f"[yellow]Analyzing file: {file_path}[/yellow]")
             try:
-                # Quick analysis mode
-                from devlog.core.parsing.processor import LogProcessor
-                processor = LogProcessor()
-                processor.add_file(file_path)
+                # Quick analysis mode - events are streamed, never kept
+                from devlog.cli.quick import (
+                    expand_paths, analyze_file, analyze_files, print_summary,
+                    DEFAULT_CHUNK_SIZE,
+                )
+                paths = expand_paths(file_path)
+                cache = None
+                if use_cache:
+                    from devlog.cli.cache import ParseCache
+                    cache = ParseCache()
+                if not paths:
+                    console.print(f"[red]✗ No files match: {file_path}[/red]")
+                    return 1
                 
-                events = list(processor.process_all())
-                console.print(f"[green]✓ Parsed {len(events)} events[/green]")
+                if len(paths) == 1 and not workers:
+                    console.print(f"[yellow]Analyzing file: {paths[0]}[/yellow]")
+                    stats = analyze_file(paths[0], console, cache=cache)
+                else:
+                    console.print(f"[yellow]Analyzing {len(paths)} files[/yellow]")
+                    stats = analyze_files(
+                        paths, console,
+                        workers=workers,
+                        chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+                        cache=cache,
+                    )
+                console.print(f"[green]✓ Parsed {stats.total_events} events[/green]")
                 
                 # Show basic stats
-                from devlog.engine.analysis.stats import StatsCalculator
-                stats = StatsCalculator().calculate_stats(events)
-                
-                console.print(f"\n[bold]Summary:[/bold]")
-                console.print(f"  Events: {stats['total_events']}")
-                console.print(f"  Levels: {stats.get('level_distribution', {})}")
-                console.print(f"  Types: {stats.get('event_type_distribution', {})}")
+                print_summary(console, stats)
                 
             except Exception as e:
                 console.print(f"[red]✗ File analysis failed: {e}[/red]")
                 return 1
         
+        # Daemon mode: keep API + sessions resident for thin clients
+        if daemon:
+            from devlog.cli.daemon import serve
+            with api:
+                return serve(api, debug=debug, console=console)
+        
+        # Batch mode: same registry/context, no prompt
+        if batch:
+            from devlog.cli.batch import read_script, run_batch
+            lines = read_script(script) if script else []
+            lines += list(commands or [])
+            with api:
+                return run_batch(api, lines, debug=debug, json_lines=json_output,
+                                 keep_going=keep_going, log_files=paths,
+                                 profile=profile, metrics_file=metrics_file, session=session)
+        
         # Initialize shell with API
-        shell = DevLogShell(api=api, debug=debug)
+        with profiler:
+            shell = DevLogShell(api=api, debug=debug, profile=profile, metrics_file=metrics_file)
+            shell.log_files = paths
+            if session:
+                from devlog.cli.commands.session import load_session
+                from devlog.cli.results.snapshot import snapshot_path
+                rows = load_session(shell, snapshot_path(session))
+                console.print(f"[green]✓ Loaded {rows:,} results from session {session}[/green]")
+            profiler.phase(f"shell ({shell.commands_source})")
+        profiler.report(console)
         
         # Run shell
         with api:  # Context manager for cleanup
@@ -199,7 +475,44 @@ def main(debug=False, file_path=None):
         return 1
 
 
+def parse_args(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(prog="devlog", description="DevLog CLI shell")
+    parser.add_argument("files", nargs="*", help="Log files or globs to analyze before the shell starts")
+    parser.add_argument("--debug", action="store_true", help="Show tracebacks")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for multi-file analysis (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Split files larger than this many bytes across workers")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-parse, bypassing ~/.devlog_cache")
+    parser.add_argument("--startup-profile", action="store_true", help="Report per-module import time at startup")
+    parser.add_argument("-c", "--command", dest="commands", action="append", help="Run a shell command non-interactively (repeatable)")
+    parser.add_argument("--script", help="Run shell commands from a file ('-' for stdin)")
+    parser.add_argument("--session", help="Load a saved session snapshot (name or .dls path) as the current results")
+    parser.add_argument("--keep-going", action="store_true", help="In batch mode, continue after a failing command")
+    parser.add_argument("--json", dest="json_output", action="store_true", default=None, help="Batch output as JSON lines (default when not a TTY)")
+    parser.add_argument("--no-json", dest="json_output", action="store_false", help="Batch output as rendered text")
+    parser.add_argument("--daemon", action="store_true", help="Serve commands over a Unix socket (see devlog.cli.client)")
+    parser.add_argument("--profile", action="store_true", help="Profile every command and print its hot spots")
+    parser.add_argument("--profile-mode", choices=("cpu", "mem", "all"), default="cpu", help="cProfile (cpu), tracemalloc (mem) or both (default: cpu)")
+    parser.add_argument("--metrics-file", help="Rewrite Prometheus text metrics here after each command (node exporter textfile)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
     import sys
-    debug = '--debug' in sys.argv
-    sys.exit(main(debug=debug))
\ No newline at end of file
+    args = parse_args()
+    sys.exit(main(
+        debug=args.debug,
+        file_path=args.files or None,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        use_cache=not args.no_cache,
+        startup_profile=args.startup_profile,
+        commands=args.commands,
+        script=args.script,
+        keep_going=args.keep_going,
+        session=args.session,
+        json_output=args.json_output,
+        daemon=args.daemon,
+        profile=args.profile_mode if args.profile else None,
+        metrics_file=args.metrics_file,
+    ))
\ No newline at end of file
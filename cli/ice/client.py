@@ -0,0 +1,112 @@
+"""
+Thin client for the analysis daemon
+
+Imports only the standard library, so a cron job or hook pays for the
+interpreter and a socket round-trip, not for rich/prompt_toolkit/the API:
+
+    python -m devlog.cli.client -c "scan --limit 100" -c "stats"
+    python -m devlog.cli.client --ping
+    python -m devlog.cli.client --shutdown
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import sys
+from pathlib import Path
+
+
+SOCKET_PATH = Path(os.environ.get('DEVLOG_SOCKET', Path.home() / ".devlog.sock"))
+
+
+def request(message, path=SOCKET_PATH, timeout=None):
+    """Send one request, yield each response message"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(str(path))
+        sock.sendall((json.dumps(message) + "\n").encode('utf-8'))
+        with sock.makefile('r', encoding='utf-8') as stream:
+            for line in stream:
+                yield json.loads(line)
+    finally:
+        sock.close()
+
+
+def ping(path=SOCKET_PATH):
+    """Daemon status dict, or None when nothing is listening"""
+    try:
+        for message in request({'op': 'ping'}, path, timeout=2):
+            if message.get('type') == 'done':
+                return message.get('status', {})
+    except (OSError, ValueError):
+        return None
+    return None
+
+
+def run(commands, session='default', keep_going=False, path=SOCKET_PATH,
+        out=sys.stdout, err=sys.stderr):
+    """Forward commands and stream output; returns the daemon's exit code"""
+    message = {
+        'op': 'run',
+        'commands': commands,
+        'session': session,
+        'keep_going': keep_going,
+        'color': out.isatty(),
+        'width': shutil.get_terminal_size().columns,
+    }
+    code = 1
+    for response in request(message, path):
+        kind = response.get('type')
+        if kind == 'output':
+            out.write(response['data'])
+            out.flush()
+        elif kind == 'result' and not response.get('ok'):
+            err.write(f"✗ {response['command']}: {response['error']}\n")
+        elif kind == 'done':
+            code = response.get('exit', 1)
+    return code
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="devlog-client", description="Send commands to a running DevLog daemon")
+    parser.add_argument("-c", "--command", dest="commands", action="append", default=[], help="Command to run (repeatable)")
+    parser.add_argument("--script", help="Read commands from a file ('-' for stdin)")
+    parser.add_argument("--session", default="default", help="Daemon session (result set) to use")
+    parser.add_argument("--keep-going", action="store_true", help="Continue after a failing command")
+    parser.add_argument("--socket", default=str(SOCKET_PATH), help="Daemon socket path")
+    parser.add_argument("--ping", action="store_true", help="Show daemon status")
+    parser.add_argument("--shutdown", action="store_true", help="Stop the daemon")
+    args = parser.parse_args(argv)
+
+    commands = list(args.commands)
+    if args.script:
+        source = sys.stdin if args.script == '-' else open(args.script, 'r', encoding='utf-8')
+        with source:
+            commands = [l.strip() for l in source if l.strip() and not l.lstrip().startswith('#')] + commands
+
+    try:
+        if args.ping:
+            status = ping(args.socket)
+            if status is None:
+                print(f"No daemon on {args.socket}", file=sys.stderr)
+                return 1
+            print(json.dumps(status, indent=2))
+            return 0
+        if args.shutdown:
+            for _ in request({'op': 'shutdown'}, args.socket, timeout=5):
+                pass
+            return 0
+
+        if not commands:
+            parser.error("nothing to run (use -c or --script)")
+        return run(commands, session=args.session, keep_going=args.keep_going, path=args.socket)
+    except (ConnectionRefusedError, FileNotFoundError):
+        print(f"No daemon on {args.socket} - start one with `devlog --daemon`", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
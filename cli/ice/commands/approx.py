@@ -0,0 +1,64 @@
+"""
+stats / insights with --approx
+
+The shared stats command (devlog.commands) knows nothing about sketches,
+so the shell wraps it: `stats --approx` and `insights --approx` render from
+the result set's ApproxSummary, anything else goes to the shared command
+unchanged.
+"""
+
+import importlib
+
+from devlog.cli.commands.results import ResultsCommand
+
+
+class ApproxCommand(ResultsCommand):
+    """
+    Renders the result set with `display` ('module:function', called as
+    function(parser, results, approx=...)); without --approx the shared
+    command runs instead when there is one.
+    """
+
+    display = ''
+
+    def __init__(self, shell, shared=None):
+        super().__init__(shell)
+        self.shared = shared
+        if shared is not None:
+            self.aliases = list(getattr(shared, 'aliases', []))
+
+    def get_help(self) -> str:
+        base = self.shared.get_help() if self.shared is not None else self.help
+        return f"{base}\n--approx: sketch-based estimates with error bounds (for huge sessions)"
+
+    def get_completion_hints(self):
+        hints = list(self.shared.get_completion_hints()) if self.shared is not None else list(self.hints)
+        return hints if '--approx' in hints else hints + ['--approx']
+
+    def run(self, ctx) -> bool:
+        approx = '--approx' in ctx.args
+        if not approx and self.shared is not None:
+            return self.shared.execute(ctx)
+        results = self.results(ctx)
+        if results is None:
+            return True
+        module_name, _, function = self.display.partition(':')
+        display = getattr(importlib.import_module(module_name), function)
+        display(getattr(ctx.api, 'parser', None), results, approx=approx)
+        return True
+
+
+class StatsCommand(ApproxCommand):
+    name = 'stats'
+    aliases = []
+    help = "AI statistics dashboard\nUsage: stats [--approx]"
+    hints = []
+    display = 'devlog.cli.display.analytics:display_advanced_stats'
+
+
+class InsightsCommand(ApproxCommand):
+    name = 'insights'
+    aliases = []
+    help = "AI insights and recommendations\nUsage: insights [--approx]"
+    hints = []
+    display = 'devlog.cli.display.insights:display_ai_insights'
@@ -0,0 +1,67 @@
+"""
+Base class for CLI-only commands
+
+Shared commands live in devlog.commands and only see the API through
+CommandContext. The commands in this package also need the shell itself
+(result set, config, caches), so they are built with a reference to it and
+registered by DevLogShell._register_cli_commands - in the shell's own
+ShellRegistry, never in the process-wide one, since several shells can
+share a process (daemon sessions, benchmarks).
+"""
+
+
+class ShellCommand:
+    """Minimal command protocol used by the registry and the completer"""
+    
+    name = ''
+    aliases = []
+    help = ''
+    hints = []
+    
+    def __init__(self, shell):
+        self.shell = shell
+    
+    def get_help(self) -> str:
+        return self.help
+    
+    def get_completion_hints(self):
+        return list(self.hints)
+    
+    def execute(self, ctx) -> bool:
+        """Run the command; return False to stop the shell"""
+        raise NotImplementedError
+
+
+class ShellRegistry:
+    """
+    One shell's commands layered over the shared registry: lookups try the
+    shell's own commands first, then the shared ones.
+    """
+    
+    def __init__(self, shared):
+        self.shared = shared
+        self._commands = {}  # name and aliases -> command
+        self._registered = 0
+    
+    @property
+    def version(self):
+        """Changes when a command is registered here or added to the shared registry"""
+        return (self._registered, len(self.shared.get_all()))
+    
+    def register(self, command):
+        self._registered += 1
+        self._commands[command.name] = command
+        for alias in getattr(command, 'aliases', []):
+            self._commands[alias] = command
+    
+    def get(self, name):
+        command = self._commands.get(name)
+        return command if command is not None else self.shared.get(name)
+    
+    def get_own(self):
+        """Commands registered on this shell (each once)"""
+        return list({id(cmd): cmd for cmd in self._commands.values()}.values())
+    
+    def get_all(self):
+        own = self.get_own()
+        return own + [cmd for cmd in self.shared.get_all() if cmd.name not in self._commands]
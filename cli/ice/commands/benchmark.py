@@ -0,0 +1,83 @@
+"""
+benchmark - run the performance suite (bench/suite.py) from the shell
+"""
+
+from devlog.cli.commands.base import ShellCommand
+from devlog.cli.commands.results import pop_option
+
+
+class BenchmarkCommand(ShellCommand):
+    name = 'benchmark'
+    aliases = ['bench']
+    help = (
+        "Performance test: parse, stats, filter, search, chart, completion\n"
+        "Usage: benchmark [stage...] [--size 64M] [--rows N] [--reps N] [--seed N]\n"
+        "                 [--save FILE] [--baseline FILE] [--threshold 0.2]"
+    )
+    hints = ['parse', 'stats', 'filter', 'search', 'chart', 'completion',
+             '--size', '--rows', '--reps', '--seed', '--save', '--baseline', '--threshold']
+
+    def execute(self, ctx) -> bool:
+        from rich.table import Table
+        from devlog.cli.bench import suite
+
+        args = list(ctx.args)
+        size = pop_option(args, '--size', default='64M')
+        rows = pop_option(args, '--rows', default=100000, cast=int)
+        reps = pop_option(args, '--reps', default=5, cast=int)
+        seed = pop_option(args, '--seed', default=0, cast=int)
+        save = pop_option(args, '--save')
+        baseline = pop_option(args, '--baseline')
+        threshold = pop_option(args, '--threshold', default=0.2, cast=float)
+        unknown = [a for a in args if a not in suite.STAGES]
+        if unknown:
+            ctx.console.print(f"[red]Unknown stage(s): {', '.join(unknown)}[/red]")
+            return True
+
+        with ctx.console.status("[yellow]Benchmarking...[/yellow]") as status:
+            results = suite.run_suite(
+                size=size, rows=rows, seed=seed, reps=reps, stages=args or suite.STAGES,
+                progress=lambda stage: status.update(f"[yellow]Benchmarking {stage}...[/yellow]"),
+            )
+
+        regressions = []
+        base = None
+        if baseline:
+            base = suite.load(baseline)
+            regressions = suite.compare(results, base, threshold)
+            for key in suite.mismatched(results, base):
+                ctx.console.print(f"[yellow]⚠ Baseline was run with {key}={base['meta'][key]} "
+                                  f"(now {results['meta'][key]})[/yellow]")
+        flagged = {(name, metric) for name, metric, _, _ in regressions}
+
+        table = Table(title=f"Benchmark ({size} log, {rows:,} rows, seed {seed})")
+        table.add_column("Stage", style="cyan")
+        table.add_column("Throughput", justify="right")
+        table.add_column("p50 ms", justify="right")
+        table.add_column("p99 ms", justify="right")
+        table.add_column("Peak RSS", justify="right")
+        if base:
+            table.add_column("vs baseline", justify="right")
+        for name, r in results['stages'].items():
+            throughput = f"{r['throughput']:,.0f} {r['unit']}/s"
+            p99 = f"{r['p99_ms']:.3f}"
+            if (name, 'throughput') in flagged:
+                throughput = f"[red]{throughput}[/red]"
+            if (name, 'p99_ms') in flagged:
+                p99 = f"[red]{p99}[/red]"
+            row = [name, throughput, f"{r['p50_ms']:.3f}", p99, f"{r['peak_rss_mb']:.0f} MB"]
+            if base:
+                old = base.get('stages', {}).get(name)
+                row.append(f"{r['throughput'] / old['throughput'] - 1:+.0%}" if old and old['throughput'] else "-")
+            table.add_row(*row)
+        ctx.console.print(table)
+
+        if save:
+            suite.save(results, save)
+            ctx.console.print(f"[green]✓ Saved to {save}[/green]")
+        if baseline:
+            if regressions:
+                ctx.console.print(f"[red]✗ {len(regressions)} regression(s) past {threshold:.0%}[/red]")
+            else:
+                ctx.console.print(f"[green]✓ Within {threshold:.0%} of baseline[/green]")
+        return True
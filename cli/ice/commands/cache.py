@@ -0,0 +1,47 @@
+"""
+cache - inspect and clear the persistent parse cache
+"""
+
+import time
+
+from devlog.cli.commands.base import ShellCommand
+from devlog.cli.quick import format_bytes
+
+
+class CacheCommand(ShellCommand):
+    name = 'cache'
+    aliases = []
+    help = (
+        "Inspect or clear the parse cache\n"
+        "Usage: cache [list|clear [path]|max <MB>]"
+    )
+    hints = ['list', 'clear', 'max']
+    
+    def execute(self, ctx) -> bool:
+        cache = self.shell.parse_cache
+        console = ctx.console
+        action = ctx.args[0] if ctx.args else 'list'
+        
+        if action == 'clear':
+            path = ctx.args[1] if len(ctx.args) > 1 else None
+            removed = cache.clear(path)
+            console.print(f"[green]✓ Removed {removed} cache entries[/green]")
+            return True
+        
+        if action == 'max':
+            if len(ctx.args) < 2 or not ctx.args[1].isdigit():
+                console.print("[red]Usage: cache max <MB>[/red]")
+                return True
+            cache.set_max_bytes(int(ctx.args[1]) * 1024 * 1024)
+            console.print(f"[green]✓ Cache limit set to {format_bytes(cache.max_bytes)}[/green]")
+            return True
+        
+        entries = cache.entries()
+        console.print(f"[bold]Parse cache[/bold] [dim]{cache.root}[/dim]")
+        console.print(f"  {len(entries)} entries, {format_bytes(cache.total_bytes())} "
+                      f"of {format_bytes(cache.max_bytes)}")
+        for entry in entries[:self.shell.config.get('max_display', 20)]:
+            age = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.last_used))
+            console.print(f"  [cyan]{entry.path}[/cyan] [dim]{format_bytes(entry.size)} | "
+                          f"{format_bytes(entry.disk_bytes)} cached | used {age}[/dim]")
+        return True
@@ -0,0 +1,93 @@
+"""
+dashboard - stats dashboard, optionally following the log files live
+
+`dashboard --live` tails the files (rotation/truncation aware, see
+follow.py), parses only appended bytes and re-renders through rich Live
+when the running aggregates changed - at most once per --refresh seconds.
+Between polls it sleeps on the job's cancel token, so an idle dashboard
+costs nothing and Ctrl-C / `kill` stop it promptly.
+"""
+
+import time
+
+from devlog.cli.commands.base import ShellCommand
+from devlog.cli.commands.results import pop_option
+
+
+POLL_INTERVAL = 0.2   # seconds between tail polls when caught up
+
+
+class DashboardCommand(ShellCommand):
+    name = 'dashboard'
+    aliases = []
+    help = (
+        "Stats dashboard over log files (default: files given at startup)\n"
+        "Usage: dashboard [files...] [--live] [--refresh 5] [--from-end] [--duration S]"
+    )
+    hints = ['--live', '--refresh', '--from-end', '--duration']
+
+    def execute(self, ctx) -> bool:
+        from devlog.cli.follow import TailSession
+        from devlog.cli.quick import expand_paths
+        from devlog.cli.jobs import CancelToken
+
+        args = list(ctx.args)
+        refresh = pop_option(args, '--refresh', default=1.0, cast=float)
+        duration = pop_option(args, '--duration', cast=float)
+        live = '--live' in args
+        from_end = '--from-end' in args
+        args = [a for a in args if a not in ('--live', '--from-end')]
+
+        paths = expand_paths(args) if args else list(self.shell.log_files)
+        if not paths:
+            ctx.console.print("[yellow]No log files - pass paths or start devlog with files[/yellow]")
+            return True
+
+        session = TailSession(paths, from_start=not from_end)
+        token = getattr(ctx, 'cancel_token', None) or CancelToken()
+        try:
+            if live:
+                self._live(ctx.console, session, token, max(refresh, POLL_INTERVAL), duration)
+            else:
+                self._catch_up(session, token)
+                ctx.console.print(self._render(session))
+        except KeyboardInterrupt:
+            pass  # sync callers (batch) stop the live view with Ctrl-C
+        finally:
+            session.close()
+        return True
+
+    @staticmethod
+    def _render(session):
+        from devlog.cli.display.analytics import render_live_dashboard
+        return render_live_dashboard(session)
+
+    @staticmethod
+    def _catch_up(session, token):
+        """Poll until the files are read to their current end"""
+        while not token.cancelled:
+            _new, backlog = session.poll()
+            if not backlog:
+                return
+
+    def _live(self, console, session, token, refresh, duration):
+        from rich.live import Live
+
+        deadline = time.monotonic() + duration if duration else None
+        rendered = (None, None)
+        next_render = 0.0
+        with Live(self._render(session), console=console, auto_refresh=False) as live:
+            while not token.cancelled:
+                _new, backlog = session.poll()
+                now = time.monotonic()
+                # Re-render only when the aggregates (or the idle flag) moved
+                state = (session.version, session.idle())
+                if state != rendered and now >= next_render:
+                    live.update(self._render(session), refresh=True)
+                    rendered = state
+                    next_render = now + refresh
+                if deadline is not None and now >= deadline:
+                    break
+                if not backlog:
+                    token.wait(POLL_INTERVAL)
+            live.update(self._render(session), refresh=True)
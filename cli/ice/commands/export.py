@@ -0,0 +1,88 @@
+"""
+export - stream the current results to JSON Lines, CSV or columnar files
+
+The shared export command builds its whole output in memory; the shell
+handles the streaming formats itself (results/export.py) and passes any
+other format to the shared command unchanged.
+"""
+
+from devlog.cli.commands.results import ResultsCommand, pop_option, query_options, QUERY_HINTS
+from devlog.cli.quick import format_bytes
+
+
+class ExportCommand(ResultsCommand):
+    name = 'export'
+    aliases = []
+    help = (
+        "Export current results (streamed in chunks)\n"
+        "Usage: export jsonl|csv|columnar [--output FILE] [--compress gzip|xz] [--filter]\n"
+        "       [--status S] [--event TYPE] [--level L] [--severity N] [--conf X]\n"
+        "--filter exports the rows of the last `filter`; .gz/.xz outputs are compressed"
+    )
+    hints = ['jsonl', 'csv', 'columnar', '--output', '-o', '--compress', '--filter'] + QUERY_HINTS
+
+    def __init__(self, shell, shared=None):
+        super().__init__(shell)
+        self.shared = shared
+        if shared is not None:
+            self.aliases = list(getattr(shared, 'aliases', []))
+
+    def get_help(self) -> str:
+        if self.shared is None:
+            return self.help
+        return f"{self.help}\nOther formats:\n{self.shared.get_help()}"
+
+    def get_completion_hints(self):
+        hints = list(self.shared.get_completion_hints()) if self.shared is not None else []
+        return hints + [h for h in self.hints if h not in hints]
+
+    def run(self, ctx) -> bool:
+        from devlog.cli.results.export import FORMATS, default_path, compression_for, export
+
+        fmt = ctx.args[0].lower() if ctx.args else None
+        if fmt not in FORMATS:
+            if self.shared is not None:
+                return self.shared.execute(ctx)
+            ctx.console.print(f"[red]Usage: export {'|'.join(FORMATS)} [--output FILE] [--compress gzip|xz] [--filter][/red]")
+            return True
+
+        results = self.results(ctx)
+        if results is None:
+            return True
+
+        args = list(ctx.args[1:])
+        output = pop_option(args, '--output', '-o')
+        compression = pop_option(args, '--compress', '-z')
+        use_filter = '--filter' in args
+        if use_filter:
+            args.remove('--filter')
+        query = query_options(args)
+        if args:
+            ctx.console.print(f"[red]Unknown export options: {' '.join(args)}[/red]")
+            return True
+
+        within = None
+        if use_filter:
+            within = self.shell.selection
+            if within is None or not within.valid_for(results):
+                ctx.console.print("[yellow]No current filter - run filter first[/yellow]")
+                return True
+
+        try:
+            compression = compression_for(output or '', compression)
+        except ValueError as e:
+            ctx.console.print(f"[red]{e}[/red]")
+            return True
+        path = output or default_path(fmt, compression)
+
+        stats = export(results, path, fmt, query=query, within=within, compression=compression,
+                       progress=getattr(ctx, 'progress', None),
+                       cancel=getattr(ctx, 'cancel_token', None))
+        ctx.rows = stats.rows
+        packed = f", {format_bytes(stats.file_bytes)} {compression}" if compression else ""
+        ctx.console.print(
+            f"[green]✓ Exported {stats.rows:,} rows to {stats.path}[/green] "
+            f"[dim]({format_bytes(stats.raw_bytes)}{packed} in {stats.elapsed:.2f}s - "
+            f"{stats.rows_per_sec:,.0f} rows/s, {format_bytes(stats.bytes_per_sec)}/s)[/dim]"
+        )
+        return True
@@ -0,0 +1,46 @@
+"""
+help over the shell's own commands
+
+The shared help only knows the shared registry; this wrapper adds the
+commands registered on the shell (filter, jobs, session, ...).
+"""
+
+from devlog.cli.commands.base import ShellCommand
+
+
+class HelpCommand(ShellCommand):
+    name = 'help'
+    aliases = []
+    help = "Show available commands\nUsage: help [command]"
+    hints = []
+
+    def __init__(self, shell, shared=None):
+        super().__init__(shell)
+        self.shared = shared
+        if shared is not None:
+            self.aliases = list(getattr(shared, 'aliases', []))
+
+    def get_help(self) -> str:
+        return self.shared.get_help() if self.shared is not None else self.help
+
+    def get_completion_hints(self):
+        return [cmd.name for cmd in self.shell.registry.get_all()]
+
+    def execute(self, ctx) -> bool:
+        own = [cmd for cmd in self.shell.registry.get_own() if cmd is not self]
+        if ctx.args:
+            for cmd in own:
+                if ctx.args[0] in (cmd.name, *cmd.aliases):
+                    ctx.console.print(cmd.get_help(), markup=False, highlight=False)
+                    return True
+        if self.shared is not None:
+            result = self.shared.execute(ctx)
+            if ctx.args:
+                return result
+        # Wrappers of shared commands are already in the shared listing
+        own = [cmd for cmd in own if getattr(cmd, 'shared', None) is None]
+        ctx.console.print("\n[bold]Shell commands[/bold]")
+        for cmd in sorted(own, key=lambda c: c.name):
+            summary = cmd.get_help().split('\n', 1)[0]
+            ctx.console.print(f"  [cyan]{cmd.name:<12}[/cyan] {summary}")
+        return True
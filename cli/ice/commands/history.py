@@ -0,0 +1,61 @@
+"""
+history search / compact over the shell's indexed history
+
+Other forms (`history`, `history --clear`) go to the shared command.
+"""
+
+from devlog.cli.commands.base import ShellCommand
+from devlog.cli.commands.results import pop_option
+
+
+class HistoryCommand(ShellCommand):
+    name = 'history'
+    aliases = []
+    help = (
+        "Command history\n"
+        "Usage: history [--clear] | history search <text> [--prefix] [--limit N] | history compact"
+    )
+    hints = ['search', 'compact', '--prefix', '--limit', '--clear']
+
+    def __init__(self, shell, shared=None):
+        super().__init__(shell)
+        self.shared = shared
+        if shared is not None:
+            self.aliases = list(getattr(shared, 'aliases', []))
+
+    def get_help(self) -> str:
+        if self.shared is None:
+            return self.help
+        return f"{self.shared.get_help()}\nhistory search <text> [--prefix] [--limit N] | history compact"
+
+    def get_completion_hints(self):
+        hints = list(self.shared.get_completion_hints()) if self.shared is not None else []
+        return hints + [h for h in self.hints if h not in hints]
+
+    def execute(self, ctx) -> bool:
+        action = ctx.args[0] if ctx.args else None
+        if action == 'search':
+            return self._search(ctx, list(ctx.args[1:]))
+        if action == 'compact':
+            kept = self.shell.history.compact()
+            ctx.console.print(f"[green]✓ History compacted: {kept:,} distinct entries kept[/green]")
+            return True
+        if self.shared is not None:
+            return self.shared.execute(ctx)
+        for entry in self.shell.history.get_strings()[-20:]:
+            ctx.console.print(entry, markup=False, highlight=False)
+        return True
+
+    def _search(self, ctx, args):
+        limit = pop_option(args, '--limit', '-n', default=20, cast=int)
+        prefix = '--prefix' in args
+        text = ' '.join(a for a in args if a != '--prefix')
+        if not text:
+            ctx.console.print("[red]Usage: history search <text> [--prefix] [--limit N][/red]")
+            return True
+        matches = self.shell.history.search(text, prefix=prefix, limit=limit)
+        if not matches:
+            ctx.console.print("[yellow]No matching history entries[/yellow]")
+        for entry in matches:
+            ctx.console.print(entry, markup=False, highlight=False)
+        return True
@@ -0,0 +1,114 @@
+"""
+jobs / fg / kill - manage commands started with a trailing `&`
+"""
+
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from devlog.cli.commands.base import ShellCommand
+from devlog.cli.jobs import JobCancelled
+
+
+def _job_id(ctx, shell):
+    """Job from `%N` / `N` in the args, else the latest background job"""
+    if ctx.args:
+        raw = ctx.args[0].lstrip('%')
+        if not raw.isdigit():
+            ctx.console.print(f"[red]Invalid job id: {ctx.args[0]}[/red]")
+            return None
+        job = shell.jobs.get(int(raw))
+        if job is None:
+            ctx.console.print(f"[red]No such job: {raw}[/red]")
+        return job
+    job = shell.jobs.latest()
+    if job is None:
+        ctx.console.print("[yellow]No background jobs[/yellow]")
+    return job
+
+
+class JobsCommand(ShellCommand):
+    name = 'jobs'
+    aliases = []
+    help = (
+        "List running and recently finished jobs\n"
+        "Usage: jobs    (start a job with a trailing &, e.g. 'scan logs/ &')"
+    )
+    hints = []
+
+    def execute(self, ctx) -> bool:
+        from rich.table import Table
+
+        jobs = [job for job in self.shell.jobs.list() if job.background]
+        if not jobs:
+            ctx.console.print("[dim]No jobs[/dim]")
+            return True
+
+        table = Table(title="Jobs")
+        table.add_column("ID", justify="right", style="cyan")
+        table.add_column("State")
+        table.add_column("Elapsed", justify="right")
+        table.add_column("Progress")
+        table.add_column("Command")
+        for job in jobs:
+            table.add_row(f"%{job.id}", job.state, f"{job.elapsed:.1f}s",
+                          job.describe_progress(), job.text)
+        ctx.console.print(table)
+        return True
+
+
+class FgCommand(ShellCommand):
+    name = 'fg'
+    aliases = []
+    help = (
+        "Wait for a background job in the foreground (Ctrl-C cancels it)\n"
+        "Usage: fg [%id]"
+    )
+    hints = []
+
+    def execute(self, ctx) -> bool:
+        job = _job_id(ctx, self.shell)
+        if job is None:
+            return True
+
+        job.background = False
+        ctx.console.print(f"[dim]%{job.id} {job.text}[/dim]")
+        token = getattr(ctx, 'cancel_token', None)
+        while True:
+            try:
+                # False (e.g. a backgrounded `exit`) stops the shell, as in the foreground
+                return job.future.result(timeout=0.1)
+            except FutureTimeout:
+                # Ctrl-C on `fg` is forwarded to the job it waits for
+                if token is not None and token.cancelled:
+                    job.cancel()
+            except JobCancelled:
+                ctx.console.print(f"[yellow]%{job.id} cancelled[/yellow]")
+                return True
+
+
+class KillCommand(ShellCommand):
+    name = 'kill'
+    aliases = []
+    help = (
+        "Ask a background job to stop\n"
+        "Usage: kill <%id>|all"
+    )
+    hints = ['all']
+
+    def execute(self, ctx) -> bool:
+        if ctx.args and ctx.args[0] == 'all':
+            # Not the job running this `kill all`
+            current = getattr(ctx, 'job', None)
+            jobs = [job for job in self.shell.jobs.running() if job is not current]
+        else:
+            if not ctx.args:
+                ctx.console.print("[red]Usage: kill <%id>|all[/red]")
+                return True
+            job = _job_id(ctx, self.shell)
+            jobs = [job] if job is not None and not job.done else []
+
+        for job in jobs:
+            job.cancel()
+            ctx.console.print(f"[yellow]%{job.id} cancelling: {job.text}[/yellow]")
+        if not jobs:
+            ctx.console.print("[dim]Nothing to cancel[/dim]")
+        return True
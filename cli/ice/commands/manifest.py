@@ -0,0 +1,190 @@
+"""
+Lazy command registration from a cached manifest
+
+register_all_commands() imports every shared command module. The first run
+does that once and records, for each command, what the prompt needs before
+it runs: name, aliases, help text, completion hints and how to build it.
+Later startups register LazyCommand proxies from that manifest and build a
+command only the first time it is executed, the way the eager path does:
+the utility commands registered here are instantiated directly, the rest
+come from register_all_commands() itself (which then replaces every proxy
+with the real command). Registration happens once per process, however
+many shells are created.
+
+The manifest is rebuilt whenever any source file of devlog.commands is newer
+than the manifest itself.
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+import threading
+from pathlib import Path
+
+
+MANIFEST_FILE = Path.home() / ".devlog_commands.json"
+MANIFEST_VERSION = 2
+
+# How a proxy builds its command: the class with no arguments (the utility
+# commands, which _register_shared builds that way) or the instance
+# register_all_commands() registers under the command's name
+CLASS, SHARED = 'class', 'shared'
+
+_registered = {}        # id(registry) -> (registry, what register_commands() did)
+_register_lock = threading.Lock()
+
+
+class LazyCommand:
+    """Registry stand-in that imports the real command on first use"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec['name']
+        self.aliases = spec.get('aliases', [])
+        self._help = spec.get('help', '')
+        self._hints = spec.get('hints', [])
+        self._command = None
+
+    def get_help(self) -> str:
+        return self._help
+
+    def get_completion_hints(self):
+        return list(self._hints)
+
+    def load(self):
+        if self._command is None:
+            if self.spec.get('factory') == CLASS:
+                module_name, _, class_name = self.spec['target'].partition(':')
+                module = importlib.import_module(module_name)
+                self._command = getattr(module, class_name)()
+            else:
+                self._command = _shared_instance(self.name)
+        return self._command
+
+    def execute(self, ctx) -> bool:
+        return self.load().execute(ctx)
+
+    def __getattr__(self, attr):
+        # Anything beyond the manifest fields needs the real command
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = 'loaded' if self._command is not None else 'lazy'
+        return f"<LazyCommand {self.name} ({state})>"
+
+
+def _shared_instance(name):
+    """The command register_all_commands() registers under name"""
+    from devlog.commands import register_all_commands, registry
+
+    register_all_commands()
+    command = registry.get(name)
+    if command is None or isinstance(command, LazyCommand):
+        raise LookupError(f"Command {name!r} is not registered by register_all_commands()")
+    return command
+
+
+def _register_shared(registry):
+    """Eager path: import and register every shared command; returns the utility ones"""
+    from devlog.commands import register_all_commands
+    from devlog.commands.utility import (
+        HelpCommand, ExitCommand, ConfigCommand, ClearScreenCommand
+    )
+
+    register_all_commands()
+    utility = [HelpCommand(), ExitCommand(), ConfigCommand(), ClearScreenCommand()]
+    for command in utility:
+        registry.register(command)
+    return utility
+
+
+def _sources_mtime():
+    """Newest mtime among devlog.commands source files (no imports)"""
+    spec = importlib.util.find_spec('devlog.commands')
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    newest = 0.0
+    for location in spec.submodule_search_locations:
+        for root, _dirs, files in os.walk(location):
+            for name in files:
+                if name.endswith('.py'):
+                    newest = max(newest, os.stat(os.path.join(root, name)).st_mtime)
+    return newest
+
+
+def _snapshot(registry, utility=()):
+    specs = []
+    for cmd in registry.get_all():
+        if isinstance(cmd, LazyCommand):
+            # Still a proxy: its own spec says what it stands for
+            specs.append(dict(cmd.spec))
+            continue
+        cls = type(cmd)
+        specs.append({
+            'name': cmd.name,
+            'aliases': list(cmd.aliases),
+            'help': cmd.get_help(),
+            'hints': list(cmd.get_completion_hints()),
+            'target': f"{cls.__module__}:{cls.__qualname__}",
+            'factory': CLASS if any(cmd is u for u in utility) else SHARED,
+        })
+    return specs
+
+
+def load_manifest(path=MANIFEST_FILE):
+    """Command specs if the manifest is current, else None"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if data.get('version') != MANIFEST_VERSION:
+        return None
+    sources = _sources_mtime()
+    if sources is None or sources > data.get('sources_mtime', 0):
+        return None
+    return data.get('commands')
+
+
+def write_manifest(registry, path=MANIFEST_FILE, utility=()):
+    data = {
+        'version': MANIFEST_VERSION,
+        'sources_mtime': _sources_mtime() or 0,
+        'commands': _snapshot(registry, utility),
+    }
+    tmp = Path(str(path) + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def register_commands(registry, lazy=True):
+    """
+    Register shared + utility commands: proxies from the manifest when it
+    is current, otherwise the real thing (and refresh the manifest). Only
+    the first call for a registry registers; later ones (another shell)
+    return what it did.
+    """
+    with _register_lock:
+        done = _registered.get(id(registry))
+        if done is not None:
+            return done[1]
+        source = _register(registry, lazy)
+        _registered[id(registry)] = (registry, source)
+        return source
+
+
+def _register(registry, lazy):
+    specs = load_manifest() if lazy else None
+    if specs:
+        for spec in specs:
+            registry.register(LazyCommand(spec))
+        return 'manifest'
+
+    utility = _register_shared(registry)
+    try:
+        write_manifest(registry, utility=utility)
+    except OSError:
+        pass
+    return 'imported'
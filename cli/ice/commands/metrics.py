@@ -0,0 +1,148 @@
+"""
+metrics / profile - command timings, latency histograms and profiling hooks
+"""
+
+import time
+
+from devlog.cli.commands.base import ShellCommand
+
+
+class MetricsCommand(ShellCommand):
+    name = 'metrics'
+    aliases = []
+    help = (
+        "Per-command timings and latency histograms over the last 5 minutes\n"
+        "Usage: metrics [recent [N]|reset|export FILE.prom]\n"
+        "(export writes cumulative histograms since start or the last reset)"
+    )
+    hints = ['recent', 'reset', 'export']
+
+    def execute(self, ctx) -> bool:
+        from devlog.cli.instrument import write_prometheus
+
+        instrument = self.shell.instrument
+        action = ctx.args[0] if ctx.args else 'summary'
+
+        if action == 'reset':
+            instrument.reset()
+            ctx.console.print("[green]✓ Metrics reset[/green]")
+        elif action == 'export':
+            if len(ctx.args) < 2:
+                ctx.console.print("[red]Usage: metrics export FILE.prom[/red]")
+                return True
+            write_prometheus(ctx.args[1])
+            ctx.console.print(f"[green]✓ Prometheus metrics written to {ctx.args[1]}[/green]")
+        elif action == 'recent':
+            limit = int(ctx.args[1]) if len(ctx.args) > 1 and ctx.args[1].isdigit() else 20
+            self._recent(ctx.console, instrument.records()[-limit:])
+        else:
+            self._summary(ctx.console, instrument.records())
+        return True
+
+    @staticmethod
+    def _summary(console, records):
+        from rich.table import Table
+        from devlog.cli.metrics import WINDOW, all_histograms
+
+        per_command = {}
+        since = time.time() - WINDOW
+        for record in records:
+            if record.started < since:
+                continue
+            per_command.setdefault(record.command, []).append(record)
+
+        table = Table(title=f"Command latency, last {WINDOW / 60:g} min (wall ms)")
+        table.add_column("Command", style="cyan")
+        table.add_column("Runs", justify="right")
+        table.add_column("p50", justify="right")
+        table.add_column("p99", justify="right")
+        table.add_column("Max", justify="right")
+        table.add_column("CPU mean", justify="right")
+        table.add_column("Rows (last)", justify="right")
+        table.add_column("Alloc blocks, process (mean)", justify="right")
+        histograms = {name: h.window() for name, h in all_histograms().items()}
+        for name, h in sorted(histograms.items()):
+            kind, _, command = name.partition('.')
+            if kind != 'command' or not h.count:
+                continue
+            runs = per_command.get(command, [])
+            blocks = [r.alloc_blocks for r in runs if r.alloc_blocks is not None]
+            cpu = histograms.get(f"command_cpu.{command}")
+            table.add_row(
+                command, str(h.count),
+                f"≤{h.percentile(50):.1f}", f"≤{h.percentile(99):.1f}", f"{h.max_ms:.1f}",
+                f"{cpu.mean_ms:.1f}" if cpu else "-",
+                f"{runs[-1].rows:,}" if runs else "-",
+                f"{sum(blocks) / len(blocks):+,.0f}" if blocks else "-",
+            )
+        console.print(table)
+
+        others = [(name, h) for name, h in sorted(histograms.items())
+                  if not name.startswith(('command.', 'command_cpu.')) and h.count]
+        for name, h in others:
+            console.print(f"[bold]{name}[/bold] [dim]{h.count} samples | mean {h.mean_ms:.2f} ms | "
+                          f"p50 ≤{h.percentile(50):.2f} ms | p99 ≤{h.percentile(99):.2f} ms | max {h.max_ms:.1f} ms[/dim]")
+
+    @staticmethod
+    def _recent(console, records):
+        from rich.table import Table
+
+        table = Table(title=f"Last {len(records)} commands")
+        table.add_column("Time")
+        table.add_column("Command", style="cyan")
+        table.add_column("Wall ms", justify="right")
+        table.add_column("CPU ms", justify="right")
+        table.add_column("Rows", justify="right")
+        table.add_column("Alloc blocks, process", justify="right")
+        table.add_column("OK")
+        for r in records:
+            table.add_row(
+                time.strftime('%H:%M:%S', time.localtime(r.started)), r.command,
+                f"{r.wall_ms:.1f}", f"{r.cpu_ms:.1f}", f"{r.rows:,}",
+                f"{r.alloc_blocks:+,}" if r.alloc_blocks is not None else "[dim]overlap[/dim]",
+                "[green]✓[/green]" if r.ok else "[red]✗[/red]",
+            )
+        console.print(table)
+
+
+class ProfileCommand(ShellCommand):
+    name = 'profile'
+    aliases = []
+    help = (
+        "Profile commands with cProfile (cpu) and/or tracemalloc (mem)\n"
+        "Usage: profile on [cpu|mem|all] | off | status | run [--mem|--all] <command...>"
+    )
+    hints = ['on', 'off', 'status', 'run', 'cpu', 'mem', 'all']
+
+    def execute(self, ctx) -> bool:
+        from devlog.cli.instrument import PROFILE_MODES
+
+        instrument = self.shell.instrument
+        action = ctx.args[0] if ctx.args else 'status'
+
+        if action == 'on':
+            mode = ctx.args[1] if len(ctx.args) > 1 else 'cpu'
+            if mode not in PROFILE_MODES:
+                ctx.console.print(f"[red]Mode must be one of: {', '.join(PROFILE_MODES)}[/red]")
+                return True
+            instrument.profile = mode
+            ctx.console.print(f"[green]✓ Profiling every command ({mode})[/green]")
+        elif action == 'off':
+            instrument.profile = None
+            ctx.console.print("[green]✓ Profiling off[/green]")
+        elif action == 'run':
+            args = ctx.args[1:]
+            mode = 'cpu'
+            if args and args[0] in ('--mem', '--all', '--cpu'):
+                mode = args.pop(0)[2:]
+            if not args:
+                ctx.console.print("[red]Usage: profile run [--mem|--all] <command...>[/red]")
+                return True
+            import shlex
+            # Same job: `kill` and Ctrl-C still reach the profiled command
+            return self.shell.run_command(shlex.join(args), console=ctx.console,
+                                          job=getattr(ctx, 'job', None), profile=mode)
+        else:
+            state = instrument.profile or 'off'
+            ctx.console.print(f"Profiling: [cyan]{state}[/cyan]")
+        return True
@@ -0,0 +1,282 @@
+"""
+filter / top / timeline / search over the shell's current result set
+
+These read shell.last_results through the facet and text indexes, so
+selecting by status, event type or message text is a lookup rather than a
+scan of every row. Listings are paged (`more` shows the next page) and
+written as plain tab-separated lines when output is piped.
+
+Every command line runs on a job thread. A ResultsCommand runs with the
+result set's lock held (see ResultSet), so commands reading the results,
+the indexes they build and shell.listing are serialized against each
+other and against a command appending rows. Scans over all rows report
+ctx.progress and stop on ctx.cancel_token between blocks.
+"""
+
+import heapq
+import re
+import time
+
+from devlog.cli.commands.base import ShellCommand
+from devlog.cli.results.facets import facets
+
+
+def pop_option(args, *names, default=None, cast=str):
+    """Remove `--name value` from args and return value (cast), else default"""
+    for name in names:
+        if name in args:
+            i = args.index(name)
+            if i + 1 < len(args):
+                value = args[i + 1]
+                del args[i:i + 2]
+                try:
+                    return cast(value)
+                except ValueError:
+                    raise ValueError(f"Invalid value for {name}: {value}")
+            del args[i]
+    return default
+
+
+class ResultsCommand(ShellCommand):
+    """Shared plumbing: current results + 'no results' guard"""
+    
+    def execute(self, ctx) -> bool:
+        with self.shell.last_results.lock:
+            return self.run(ctx)
+    
+    def run(self, ctx) -> bool:
+        """The command itself, called with the result set locked"""
+        raise NotImplementedError
+    
+    def results(self, ctx):
+        results = self.shell.last_results
+        if not results:
+            ctx.console.print("[yellow]No results loaded - run scan or analyze first[/yellow]")
+            return None
+        ctx.rows = len(results)
+        return results
+    
+    def show(self, ctx, results, rows, title, limit=None):
+        """Page through rows on ctx.console (plain lines when piped); `more` continues it"""
+        from devlog.cli.display.output import show_rows
+        
+        self.shell.listing = show_rows(results, rows, title=title, limit=limit,
+                                       page_size=self.shell.config.get('max_display', 20),
+                                       out=ctx.console)
+
+
+def query_options(args):
+    """Pop the shared filter options from args into a compiled Query"""
+    from devlog.cli.results.query import compile_query
+    
+    return compile_query(
+        status=pop_option(args, '--status'),
+        event=pop_option(args, '--event', '-e'),
+        level=pop_option(args, '--level'),
+        min_severity=pop_option(args, '--severity', cast=float),
+        min_confidence=pop_option(args, '--conf', cast=float),
+    )
+
+
+QUERY_HINTS = ['--status', '--event', '--level', '--severity', '--conf']
+
+
+def job_hooks(ctx):
+    """cancel / progress keywords from the job running this command (none in batch mode)"""
+    return {'cancel': getattr(ctx, 'cancel_token', None),
+            'progress': getattr(ctx, 'progress', None)}
+
+
+class FilterCommand(ResultsCommand):
+    name = 'filter'
+    aliases = []
+    help = (
+        "Filter current results by status/event/level/severity/confidence\n"
+        "Usage: filter [status] [--event TYPE] [--level L] [--severity N] [--conf X] [--limit N] [--refine]\n"
+        "--refine narrows the previous filter's rows instead of all results"
+    )
+    hints = QUERY_HINTS + ['-e', '--limit', '--refine']
+    
+    def run(self, ctx) -> bool:
+        from devlog.cli.results.query import Clause, Query
+        
+        results = self.results(ctx)
+        if results is None:
+            return True
+        
+        args = list(ctx.args)
+        refine = '--refine' in args
+        if refine:
+            args.remove('--refine')
+        limit = pop_option(args, '--limit', '-n', cast=int)
+        query = query_options(args)
+        if args:
+            query = Query(query.clauses + [Clause('status', '==', args[0])])
+        
+        within = self.shell.selection if refine else None
+        if refine and (within is None or not within.valid_for(results)):
+            ctx.console.print("[yellow]Nothing to refine - filtering all results[/yellow]")
+            within = None
+        selection = query.evaluate(results, within=within, limit=limit, **job_hooks(ctx))
+        if selection.complete:
+            self.shell.selection = selection
+        
+        title = "Filtered results" if selection.complete else f"Filtered results (first {limit})"
+        self.show(ctx, results, selection.rows, title)
+        return True
+
+
+class TopCommand(ResultsCommand):
+    name = 'top'
+    aliases = []
+    help = (
+        "Top items in current results\n"
+        "Usage: top [N] [--by type|severity|confidence] [--status S] [--event TYPE] [--severity N] [--conf X]\n"
+        "       top [N] --approx   (event types from a count-min sketch, with error bound)"
+    )
+    hints = ['--by', '--approx'] + QUERY_HINTS
+    
+    def run(self, ctx) -> bool:
+        from devlog.cli.display.charts import create_ascii_bar_chart
+        from devlog.cli.results.query import top_n, value_counts
+        
+        results = self.results(ctx)
+        if results is None:
+            return True
+        
+        args = list(ctx.args)
+        approx = '--approx' in args
+        if approx:
+            args.remove('--approx')
+        by = pop_option(args, '--by', default='type')
+        query = query_options(args)
+        n = int(args[0]) if args and args[0].isdigit() else 10
+        
+        if approx:
+            from devlog.cli.results.approx import approx_summary
+            if by != 'type' or query:
+                ctx.console.print("[red]--approx only supports top by type over all results[/red]")
+                return True
+            summary = approx_summary(results)
+            top = dict(summary.event_counts.most_common(n))
+            bound = summary.error_bounds()['counts']
+            ctx.console.print(create_ascii_bar_chart(top, title=f"Top {n} Event Types (≈, {bound})"))
+            return True
+        selection = query.evaluate(results) if query else None
+        
+        if by == 'type':
+            if selection is None:
+                counts = facets(results).counts('event')
+            else:
+                counts = value_counts(results, 'event', selection)
+            top = dict(heapq.nlargest(n, counts.items(), key=lambda x: x[1]))
+            ctx.console.print(create_ascii_bar_chart(top, title=f"Top {n} Event Types"))
+            return True
+        
+        if by not in ('severity', 'confidence'):
+            ctx.console.print(f"[red]Unknown --by value: {by}[/red]")
+            return True
+        
+        self.show(ctx, results, top_n(results, by, n, selection), f"Top {n} by {by}")
+        return True
+
+
+class TimelineCommand(ResultsCommand):
+    name = 'timeline'
+    aliases = []
+    help = (
+        "Event timeline of current results\n"
+        "Usage: timeline [--granularity hour|day] [--event TYPE] [--status S]"
+    )
+    hints = ['--granularity', '--event', '--status', '-g']
+    
+    def run(self, ctx) -> bool:
+        from devlog.cli.display.charts import create_timeline_view
+        
+        results = self.results(ctx)
+        if results is None:
+            return True
+        
+        args = list(ctx.args)
+        granularity = pop_option(args, '--granularity', '-g', default='hour')
+        event = pop_option(args, '--event', '-e')
+        status = pop_option(args, '--status')
+        
+        if event or status:
+            results = results.take(facets(results).select(status=status, event=event))
+        
+        ctx.console.print(create_timeline_view(results, granularity=granularity))
+        return True
+
+
+class SearchCommand(ResultsCommand):
+    name = 'search'
+    aliases = []
+    help = (
+        "Search in events (message text, case-insensitive by default)\n"
+        "Usage: search <text> [--regex] [--case] [--limit N] [--save-index]"
+    )
+    hints = ['--regex', '--case', '--limit', '--save-index']
+    
+    def run(self, ctx) -> bool:
+        from devlog.cli.display.output import is_plain
+        from devlog.cli.results.search import text_index, index_path
+        
+        results = self.results(ctx)
+        if results is None:
+            return True
+        
+        args = list(ctx.args)
+        limit = pop_option(args, '--limit', '-n', cast=int)
+        flags = {flag for flag in ('--regex', '--case', '--save-index') if flag in args}
+        args = [a for a in args if a not in flags]
+        query = ' '.join(args)
+        if not query and '--save-index' not in flags:
+            ctx.console.print("[red]Usage: search <text> [--regex] [--case] [--limit N] [--save-index][/red]")
+            return True
+        
+        started = time.perf_counter()
+        hooks = job_hooks(ctx)
+        index = text_index(results, **hooks)
+        if '--save-index' in flags:
+            path = index.save(index_path(results))
+            ctx.console.print(f"[green]✓ Search index saved to {path}[/green]")
+            if not query:
+                return True
+        
+        try:
+            rows = index.search(results, query, regex='--regex' in flags, case='--case' in flags, **hooks)
+        except re.error as e:
+            ctx.console.print(f"[red]Invalid regex: {e}[/red]")
+            return True
+        elapsed = (time.perf_counter() - started) * 1000
+        
+        self.show(ctx, results, rows, f"Search: {query}", limit=limit)
+        if not is_plain(ctx.console):
+            ctx.console.print(f"[dim]{len(rows):,} matches in {elapsed:.1f} ms[/dim]")
+        return True
+
+
+class MoreCommand(ResultsCommand):
+    name = 'more'
+    aliases = ['next']
+    help = (
+        "Next page of the last filter/search/top listing\n"
+        "Usage: more [PAGE]   (more 1 goes back to the first page)"
+    )
+    hints = []
+    
+    def run(self, ctx) -> bool:
+        listing = self.shell.listing
+        if listing is None or not listing.valid_for(self.shell.last_results):
+            ctx.console.print("[yellow]Nothing to page through - run filter, search or top first[/yellow]")
+            return True
+        
+        if ctx.args and ctx.args[0].isdigit():
+            page = int(ctx.args[0]) - 1
+        else:
+            page = listing.page + 1
+        if not listing.show(page, out=ctx.console):
+            ctx.console.print(f"[yellow]No page {page + 1} (listing has {listing.pages})[/yellow]")
+        ctx.rows = len(listing.rows)
+        return True
@@ -0,0 +1,114 @@
+"""
+session - save the current result set to a snapshot and load it back
+"""
+
+import time
+
+from devlog.cli.commands.base import ShellCommand
+from devlog.cli.quick import format_bytes
+
+
+class SessionCommand(ShellCommand):
+    name = 'session'
+    aliases = []
+    help = (
+        "Save / restore the current results (memory-mapped snapshots)\n"
+        "Usage: session [list] | session save <name> | session load <name> | session delete <name>\n"
+        "<name> may also be a path to a .dls file (save / load only: delete takes saved names)"
+    )
+    hints = ['list', 'save', 'load', 'delete']
+
+    def execute(self, ctx) -> bool:
+        from devlog.cli.results.snapshot import snapshot_path, SnapshotError
+
+        console = ctx.console
+        action = ctx.args[0] if ctx.args else 'list'
+        if action == 'list':
+            return self._list(ctx)
+        if action not in ('save', 'load', 'delete') or len(ctx.args) < 2:
+            console.print("[red]Usage: session [list] | session save|load|delete <name>[/red]")
+            return True
+
+        name = ctx.args[1]
+        try:
+            path = snapshot_path(name)
+        except ValueError as e:
+            console.print(f"[red]{e}[/red]")
+            return True
+
+        if action == 'save':
+            return self._save(ctx, name, path)
+        if action == 'delete':
+            return self._delete(ctx, name, path)
+
+        try:
+            rows = load_session(self.shell, path)
+        except FileNotFoundError:
+            console.print(f"[red]No saved session {name} ({path})[/red]")
+            return True
+        except SnapshotError as e:
+            console.print(f"[red]✗ {path}: {e}[/red]")
+            return True
+        ctx.rows = rows
+        console.print(f"[green]✓ Loaded {rows:,} results from {name}[/green]")
+        return True
+
+    def _save(self, ctx, name, path):
+        from devlog.cli.results.snapshot import save
+
+        results = self.shell.last_results
+        if not results:
+            ctx.console.print("[yellow]No results loaded - nothing to save[/yellow]")
+            return True
+        started = time.perf_counter()
+        with results.lock:
+            size = save(results, path, meta={'name': name, 'log_files': [str(p) for p in self.shell.log_files]})
+        elapsed = (time.perf_counter() - started) * 1000
+        ctx.rows = len(results)
+        ctx.console.print(f"[green]✓ Saved {len(results):,} results to {path} "
+                          f"({format_bytes(size)}, {elapsed:.0f} ms)[/green]")
+        return True
+
+    def _delete(self, ctx, name, path):
+        from devlog.cli.results.snapshot import read_footer, SESSIONS_DIR, SnapshotError
+
+        # Only saved sessions: never an arbitrary file named on the command line
+        if path.resolve().parent != SESSIONS_DIR.resolve():
+            ctx.console.print(f"[red]session delete only removes saved sessions ({SESSIONS_DIR})[/red]")
+            return True
+        try:
+            read_footer(path)
+        except FileNotFoundError:
+            ctx.console.print(f"[yellow]No saved session {name}[/yellow]")
+            return True
+        except (OSError, SnapshotError) as e:
+            ctx.console.print(f"[red]✗ {path}: {e} - not deleted[/red]")
+            return True
+        path.unlink()
+        ctx.console.print(f"[green]✓ Deleted session {name}[/green]")
+        return True
+
+    def _list(self, ctx):
+        from devlog.cli.results.snapshot import list_snapshots, SESSIONS_DIR
+
+        sessions = list_snapshots()
+        if not sessions:
+            ctx.console.print(f"[yellow]No saved sessions in {SESSIONS_DIR}[/yellow]")
+            return True
+        ctx.console.print(f"[bold]Saved sessions[/bold] [dim]{SESSIONS_DIR}[/dim]")
+        for name, path, footer in sessions:
+            created = time.strftime('%Y-%m-%d %H:%M', time.localtime(footer.get('created', 0)))
+            ctx.console.print(f"  [cyan]{name}[/cyan] [dim]{footer.get('rows', 0):,} results | "
+                              f"{format_bytes(path.stat().st_size)} | saved {created}[/dim]")
+        return True
+
+
+def load_session(shell, path):
+    """Map the snapshot at path into shell.last_results; returns the row count"""
+    from devlog.cli.results.snapshot import load, read_footer
+
+    results = load(path)
+    shell.last_results = results
+    if not shell.log_files:
+        shell.log_files = list(read_footer(path).get('meta', {}).get('log_files', []))
+    return len(results)
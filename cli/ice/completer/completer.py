@@ -7,6 +7,12 @@ Dynamic Auto-Completer using Command Registry
 
 from prompt_toolkit.completion import Completer, Completion, PathCompleter
 from typing import Iterable
+import time
+
+from devlog.cli.completer.trie import CommandIndex
+from devlog.cli.completer.providers import BackgroundProvider
+from devlog.cli.metrics import histogram
+from devlog.cli.results.facets import facets
 
 
 class DynamicLogParserCompleter(Completer):
@@ -15,53 +21,59 @@ class DynamicLogParserCompleter(Completer):
     def __init__(self, shell):
         self.shell = shell
         self.path_completer = PathCompleter(expanduser=True)
+        self.latency = histogram('completion')
+        
+        # Command names/aliases/help/hints, rebuilt when the registry changes
+        self.index = CommandIndex(shell.registry)
+        
+        # Slow sources, refreshed in the background with a short TTL
+        self.file_ids = BackgroundProvider(self._fetch_file_ids)
+    
+    def refresh(self):
+        """Rebuild the command index after (un)registering commands"""
+        self.index.build(self.shell.registry)
     
     def get_completions(self, document, complete_event) -> Iterable[Completion]:
+        started = time.perf_counter()
+        try:
+            self.index.current(self.shell.registry)
+            yield from self._complete(document)
+        finally:
+            self.latency.record((time.perf_counter() - started) * 1000)
+    
+    def _complete(self, document):
         text = document.text_before_cursor
         words = text.split()
         
         # Empty line - suggest all commands
         if not words:
-            for cmd in self._get_all_commands():
-                yield Completion(
-                    cmd.name,
-                    start_position=0,
-                    display_meta=self._get_command_description(cmd)
-                )
+            for name, meta in self.index.complete(''):
+                yield Completion(name, start_position=0, display_meta=meta)
             return
         
-        # First word - command completion
+        # First word - command (and alias) completion from the trie
         if len(words) == 1 and not text.endswith(' '):
             word = words[0]
-            for cmd in self._get_all_commands():
-                if cmd.name.startswith(word.lower()):
-                    yield Completion(
-                        cmd.name,
-                        start_position=-len(word),
-                        display_meta=self._get_command_description(cmd)
-                    )
-                # Also check aliases
-                for alias in cmd.aliases:
-                    if alias.startswith(word.lower()) and alias != cmd.name:
-                        yield Completion(
-                            alias,
-                            start_position=-len(word),
-                            display_meta=f"→ {cmd.name}"
-                        )
+            fuzzy = self.shell.config.get('fuzzy_complete', False)
+            for name, meta in self.index.complete(word.lower(), fuzzy=fuzzy):
+                yield Completion(name, start_position=-len(word), display_meta=meta)
             return
         
         # Get command
         command_name = words[0].lower()
-        command = self.shell.registry.get(command_name)
+        command = self.index.get(command_name) or self.shell.registry.get(command_name)
         
         if not command:
             return
         
         current_word = words[-1] if not text.endswith(' ') else ''
         
-        # Flag completion from command hints
+        # Flag completion from (cached) command hints
         if current_word.startswith('-'):
-            for hint in command.get_completion_hints():
+            hints = self.index.hints.get(command.name)
+            if hints is None:
+                hints = command.get_completion_hints()
+            for hint in hints:
                 if hint.startswith(current_word):
                     yield Completion(
                         hint,
@@ -73,15 +85,8 @@ class DynamicLogParserCompleter(Completer):
         # Context-specific completions
         yield from self._get_context_completions(command, words, current_word)
     
-    def _get_all_commands(self):
-        """Get all unique commands from registry"""
-        return self.shell.registry.get_all()
-    
-    def _get_command_description(self, command) -> str:
-        """Extract first line of help as description"""
-        help_text = command.get_help()
-        first_line = help_text.split('\n')[0]
-        return first_line[:50] if len(first_line) > 50 else first_line
+    def _fetch_file_ids(self):
+        return [log.name for log in self.shell.parser.list_paths()]
     
     def _get_hint_meta(self, command_name: str, hint: str) -> str:
         """Get metadata for a completion hint"""
@@ -119,20 +124,16 @@ class DynamicLogParserCompleter(Completer):
                 yield completion
             return
         
-        # Database file ID completions for remove
+        # Database file ID completions for remove (fetched in background)
         if command.name == 'remove':
-            try:
-                logs = self.shell.parser.list_paths()
-                for idx, log in enumerate(logs):
-                    id_str = str(idx)
-                    if id_str.startswith(current_word):
-                        yield Completion(
-                            id_str,
-                            start_position=-len(current_word),
-                            display_meta=log.name
-                        )
-            except:
-                pass
+            for idx, name in enumerate(self.file_ids.get()):
+                id_str = str(idx)
+                if id_str.startswith(current_word):
+                    yield Completion(
+                        id_str,
+                        start_position=-len(current_word),
+                        display_meta=name
+                    )
             return
         
         # Status completions for filter command
@@ -147,20 +148,26 @@ class DynamicLogParserCompleter(Completer):
                     )
             return
         
-        # Event type completions from results
+        # Event type completions from the facet index (a lookup, no scan)
         if command.name == 'filter' and '--event' in words:
+            results = self.shell.last_results
+            # Never wait on a command holding the results: no counts this time
+            if not results.lock.acquire(blocking=False):
+                return
             try:
-                events = set(r.get('event', '') for r in self.shell.last_results)
-                for event in sorted(events):
-                    if event.startswith(current_word):
-                        count = sum(1 for r in self.shell.last_results if r.get('event') == event)
-                        yield Completion(
-                            event,
-                            start_position=-len(current_word),
-                            display_meta=f"{count} events"
-                        )
+                # Kept up to date per result-set version, so no background fetch
+                counts = facets(results).counts('event')
             except:
-                pass
+                return
+            finally:
+                results.lock.release()
+            for event in sorted(e for e in counts if e):
+                if event.startswith(current_word):
+                    yield Completion(
+                        event,
+                        start_position=-len(current_word),
+                        display_meta=f"{counts[event]} events"
+                    )
             return
         
         # Sort options for list command
@@ -0,0 +1,57 @@
+"""
+Background completion providers
+
+Expensive completion sources (file IDs from the parser backend, facet
+values of large result sets) are computed on a worker thread and cached
+for a short TTL. A keystroke only ever reads the cache: on a miss it
+schedules a refresh and returns whatever is there (possibly nothing), so
+the prompt never waits on a slow backend.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_TTL = 5.0   # seconds
+
+
+class BackgroundProvider:
+    """TTL cache in front of a slow callable, refreshed off the input thread"""
+    
+    _executor = None
+    _executor_lock = threading.Lock()
+    
+    def __init__(self, fetch, ttl=DEFAULT_TTL):
+        self.fetch = fetch
+        self.ttl = ttl
+        self._entry = None      # (key, value, stamp), replaced atomically
+        self._pending = None
+    
+    @classmethod
+    def executor(cls):
+        with cls._executor_lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="completion")
+            return cls._executor
+    
+    def get(self, key=None, default=()):
+        """Cached value for key; schedules a refresh when missing or expired"""
+        entry = self._entry
+        hit = entry is not None and entry[0] == key
+        if not (hit and time.monotonic() - entry[2] < self.ttl):
+            if self._pending is None or self._pending.done():
+                self._pending = self.executor().submit(self._refresh, key)
+        return entry[1] if hit else default
+    
+    def _refresh(self, key):
+        try:
+            value = self.fetch()
+        except Exception:
+            return
+        self._entry = (key, value, time.monotonic())
+    
+    def invalidate(self):
+        entry = self._entry
+        if entry is not None:
+            self._entry = (entry[0], entry[1], 0.0)
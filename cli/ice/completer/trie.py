@@ -0,0 +1,122 @@
+"""
+Prefix trie for command completion
+
+Built once from the registry (names, aliases, help line, flag hints) so a
+keystroke is a walk down at most len(word) nodes instead of calling
+get_all()/get_help() on every command.
+"""
+
+
+class PrefixTrie:
+    """Trie whose nodes keep every entry below them, already sorted"""
+
+    __slots__ = ('children', 'entries')
+
+    def __init__(self):
+        self.children = {}
+        self.entries = []     # (key, payload) for all keys under this node
+
+    def insert(self, key, payload):
+        node = self
+        node.entries.append((key, payload))
+        for ch in key:
+            node = node.children.setdefault(ch, PrefixTrie())
+            node.entries.append((key, payload))
+
+    def freeze(self):
+        """Sort entries once after all inserts"""
+        self.entries.sort(key=lambda e: e[0])
+        for child in self.children.values():
+            child.freeze()
+        return self
+
+    def find(self, prefix):
+        """(key, payload) pairs whose key starts with prefix"""
+        node = self
+        for ch in prefix:
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return node.entries
+
+    def fuzzy(self, query, limit=20):
+        """Subsequence matches, tightest first (for when no prefix matches)"""
+        scored = []
+        for key, payload in self.entries:
+            score = _subsequence_span(query, key)
+            if score is not None:
+                scored.append((score, key, payload))
+        scored.sort(key=lambda s: (s[0], s[1]))
+        return [(key, payload) for _, key, payload in scored[:limit]]
+
+
+def _subsequence_span(query, key):
+    """Length of the shortest window of key containing query in order, or None"""
+    if not query:
+        return 0
+    best = None
+    start = key.find(query[0])
+    while start >= 0:
+        # Earliest end for this start, then the latest start for that end
+        end = start
+        for ch in query[1:]:
+            end = key.find(ch, end + 1)
+            if end < 0:
+                return best
+        begin = end
+        for ch in reversed(query[:-1]):
+            begin = key.rfind(ch, start, begin)
+        span = end - begin
+        if best is None or span < best:
+            best = span
+        start = key.find(query[0], begin + 1)
+    return best
+
+
+class CommandIndex:
+    """Completion metadata for every registered command"""
+
+    def __init__(self, registry):
+        self.trie = PrefixTrie()
+        self.commands = {}    # name -> command
+        self.hints = {}       # name -> [flag, ...]
+        self.version = None   # registry.version the index was built from
+        self.build(registry)
+
+    def build(self, registry):
+        self.version = getattr(registry, 'version', None)
+        trie = PrefixTrie()
+        commands, hints = {}, {}
+        for cmd in registry.get_all():
+            commands[cmd.name] = cmd
+            hints[cmd.name] = sorted(cmd.get_completion_hints())
+            trie.insert(cmd.name, describe(cmd))
+            for alias in cmd.aliases:
+                if alias != cmd.name:
+                    commands.setdefault(alias, cmd)
+                    trie.insert(alias, f"→ {cmd.name}")
+        self.trie = trie.freeze()
+        self.commands = commands
+        self.hints = hints
+        return self
+
+    def current(self, registry):
+        """Rebuild when commands were registered since the last build"""
+        if getattr(registry, 'version', None) != self.version:
+            self.build(registry)
+        return self
+
+    def complete(self, word, fuzzy=False):
+        matches = self.trie.find(word)
+        if not matches and fuzzy and word:
+            matches = self.trie.fuzzy(word)
+        return matches
+
+    def get(self, name):
+        return self.commands.get(name)
+
+
+def describe(command) -> str:
+    """First line of help, clipped to 50 chars"""
+    first_line = command.get_help().split('\n')[0]
+    return first_line[:50] if len(first_line) > 50 else first_line
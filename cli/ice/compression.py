@@ -0,0 +1,162 @@
+"""
+Transparent decompression for rotated logs (.gz / .bz2 / .xz)
+
+Compression is detected from the magic bytes, not the extension, and the
+file is decompressed as a stream: lines come out of a bounded buffer and
+nothing is written to disk.
+
+Multi-member gzip files (`cat a.gz b.gz`, pigz/bgzip output) can be split
+across worker processes: member_ranges() finds gzip headers near the chunk
+boundaries and each worker decompresses its members on its own. Header
+candidates are test-inflated while planning; one that still slips through
+fails its worker's CRC32/ISIZE check and is reported like any failed unit.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import zlib
+
+
+GZIP, BZIP2, XZ = 'gzip', 'bzip2', 'xz'
+
+MAGIC = (
+    (b'\x1f\x8b', GZIP),
+    (b'BZh', BZIP2),
+    (b'\xfd7zXZ\x00', XZ),
+)
+OPENERS = {GZIP: gzip.open, BZIP2: bz2.open, XZ: lzma.open}
+
+READ_SIZE = 1024 * 1024          # compressed bytes per read
+MAX_OUTPUT = 4 * 1024 * 1024     # decompressed bytes per inflate step
+SCAN_WINDOW = 8 * 1024 * 1024    # how far past a boundary to look for a header
+
+
+def detect(path):
+    """Compression name from the file's magic bytes, None for plain text"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(6)
+    except OSError:
+        return None
+    for magic, name in MAGIC:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+def open_lines(path, kind=None):
+    """Decoded lines of a compressed file, newline stripped"""
+    kind = kind or detect(path)
+    with OPENERS[kind](path, 'rb') as raw:
+        # Split on '\n' only, like the mapped reader: a bare '\r' stays in its line
+        text = io.TextIOWrapper(io.BufferedReader(raw, READ_SIZE), encoding='utf-8',
+                                errors='replace', newline='\n')
+        for line in text:
+            yield line.rstrip('\r\n')
+
+
+def _header_candidates(data, base):
+    """Offsets of plausible gzip member headers (deflate, no reserved flags)"""
+    pos = data.find(b'\x1f\x8b\x08')
+    while pos >= 0:
+        if pos + 3 < len(data) and not data[pos + 3] & 0xE0:
+            yield base + pos
+        pos = data.find(b'\x1f\x8b\x08', pos + 1)
+
+
+def member_ranges(path, size, chunk_size):
+    """
+    (path, start, end) units for a gzip file, cut at candidate member
+    headers about chunk_size apart. A single unit when none are found.
+    """
+    cuts = [0]
+    with open(path, 'rb') as f:
+        target = chunk_size
+        while target < size:
+            f.seek(target)
+            window = f.read(SCAN_WINDOW)
+            offset = next((c for c in _header_candidates(window, target) if _is_member(f, c)), None)
+            if offset is None:
+                target += SCAN_WINDOW
+                continue
+            cuts.append(offset)
+            target = offset + chunk_size
+    cuts.append(size)
+    return [(path, start, end) for start, end in zip(cuts, cuts[1:])]
+
+
+def _inflate(f, start):
+    """(member offset, decompressed bytes) for consecutive gzip members from start"""
+    f.seek(start)
+    pos = member = start            # file offset of pending[0] / current member
+    pending = f.read(READ_SIZE)
+    decomp = zlib.decompressobj(31)
+    while pending:
+        out = decomp.decompress(pending, MAX_OUTPUT)
+        rest = decomp.unused_data if decomp.eof else decomp.unconsumed_tail
+        pos += len(pending) - len(rest)
+        if out:
+            yield member, out
+        if decomp.eof:
+            member = pos
+            decomp = zlib.decompressobj(31)
+            if not rest.strip(b'\x00'):
+                rest = b''  # zero padding after the last member (tape-style tools)
+        pending = rest or f.read(READ_SIZE)
+    if member != pos:
+        out = decomp.flush()
+        if out:
+            yield member, out
+        if not decomp.eof:
+            raise zlib.error(f"truncated gzip member at offset {member}")
+
+
+def _is_member(f, offset):
+    """Cheap check that a header candidate really starts a deflate stream"""
+    f.seek(offset)
+    try:
+        zlib.decompressobj(31).decompress(f.read(64 * 1024), 64 * 1024)
+    except zlib.error:
+        return False
+    return True
+
+
+def member_lines(path, start, end):
+    """
+    Lines owned by the gzip unit [start, end) (compressed member offsets).
+
+    Same ownership rule as plain byte ranges: the line in progress where a
+    unit begins belongs to the previous unit, which reads on into the next
+    member until that line is complete.
+    """
+    with open(path, 'rb') as f:
+        partial = b''
+        skipping = start > 0
+        for member, data in _inflate(f, start):
+            if member >= end:
+                # Past our range: only finish the line we are in
+                nl = data.find(b'\n')
+                if nl >= 0:
+                    partial += data[:nl]
+                    break
+                partial += data
+                continue
+            if skipping:
+                nl = data.find(b'\n')
+                if nl < 0:
+                    continue
+                data = data[nl + 1:]
+                skipping = False
+            chunk = partial + data
+            cut = chunk.rfind(b'\n')
+            if cut < 0:
+                partial = chunk
+                continue
+            partial = chunk[cut + 1:]
+            text = chunk[:cut].decode('utf-8', 'replace')
+            for line in text.split('\n'):
+                yield line.rstrip('\r')
+        if partial:
+            yield partial.decode('utf-8', 'replace').rstrip('\r')
@@ -0,0 +1,176 @@
+"""
+Analysis daemon - keeps the API, detector state and result sets resident
+
+`devlog --daemon` starts a server on a Unix domain socket. Clients (see
+client.py) send newline-delimited JSON requests and receive the rendered
+output streamed back as it is printed:
+
+    request   {"op": "run", "commands": [...], "session": "default",
+               "width": 120, "color": true, "keep_going": false}
+    responses {"type": "output", "data": "..."}            (0..n)
+              {"type": "result", "command": ..., "ok": ..., "error": ...,
+               "elapsed_ms": ...}                          (per command)
+              {"type": "done", "exit": 0}
+
+Other ops: "ping" (status) and "shutdown".
+
+Each client connection is served on its own thread. Named sessions hold a
+prompt-less DevLogShell (and so its result set) that every client naming
+the session shares; commands within one session are serialized.
+"""
+
+import json
+import os
+import socketserver
+import threading
+import time
+from pathlib import Path
+
+from devlog.cli.client import SOCKET_PATH, ping
+
+
+class _StreamWriter:
+    """File-like sink that forwards rendered output to the client as it comes"""
+
+    def __init__(self, send):
+        self._send = send
+
+    def write(self, text):
+        if text:
+            self._send({'type': 'output', 'data': text})
+        return len(text)
+
+    def flush(self):
+        pass
+
+    def isatty(self):
+        return False
+
+
+class DaemonState:
+    """API + sessions shared by every connection"""
+
+    def __init__(self, api, debug=False):
+        self.api = api
+        self.debug = debug
+        self.started = time.time()
+        self.requests = 0
+        self._sessions = {}      # name -> (shell, lock)
+        self._lock = threading.Lock()
+
+    def session(self, name):
+        from devlog.cli.cli import DevLogShell
+
+        with self._lock:
+            entry = self._sessions.get(name)
+            if entry is None:
+                shell = DevLogShell(api=self.api, debug=self.debug, interactive=False)
+                entry = self._sessions[name] = (shell, threading.Lock())
+            return entry
+
+    def status(self):
+        with self._lock:
+            sessions = {name: len(shell.last_results) for name, (shell, _) in self._sessions.items()}
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.started, 1),
+            'requests': self.requests,
+            'sessions': sessions,
+        }
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def send(self, message):
+        self.wfile.write((json.dumps(message) + "\n").encode('utf-8'))
+        self.wfile.flush()
+
+    def handle(self):
+        state = self.server.state
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except ValueError:
+            self.send({'type': 'done', 'exit': 2, 'error': 'invalid request'})
+            return
+
+        state.requests += 1
+        op = request.get('op', 'run')
+        if op == 'ping':
+            self.send({'type': 'done', 'exit': 0, 'status': state.status()})
+        elif op == 'shutdown':
+            self.send({'type': 'done', 'exit': 0})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif op == 'run':
+            self.send({'type': 'done', 'exit': self.run(state, request)})
+        else:
+            self.send({'type': 'done', 'exit': 2, 'error': f'unknown op: {op}'})
+
+    def run(self, state, request):
+        from rich.console import Console
+        from devlog.cli.batch import display_router, execute_line
+
+        shell, lock = state.session(request.get('session') or 'default')
+        writer = _StreamWriter(self.send)
+        color = bool(request.get('color'))
+        console = Console(file=writer, width=request.get('width') or 100,
+                          force_terminal=color, color_system='truecolor' if color else None)
+        keep_going = request.get('keep_going', False)
+
+        failures = 0
+        with lock, display_router().redirect(writer):
+            for text in request.get('commands', []):
+                started = time.perf_counter()
+                keep_running, error = execute_line(shell, text, console)
+                self.send({
+                    'type': 'result',
+                    'command': text,
+                    'ok': error is None,
+                    'error': error,
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 3),
+                })
+                if error:
+                    failures += 1
+                if not keep_running or (error and not keep_going):
+                    break
+        return 0 if failures == 0 else 1
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, state):
+        self.state = state
+        super().__init__(str(path), _Handler)
+
+
+def serve(api, path=SOCKET_PATH, debug=False, console=None):
+    """Run the daemon until a shutdown request or Ctrl-C"""
+    path = Path(path)
+    if path.exists():
+        if ping(path) is not None:
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        path.unlink()  # stale socket from a crashed daemon
+
+    state = DaemonState(api, debug=debug)
+    old_umask = os.umask(0o177)   # socket readable/writable by owner only
+    try:
+        server = DaemonServer(path, state)
+    finally:
+        os.umask(old_umask)
+
+    if console is not None:
+        console.print(f"[green]✓ Daemon listening on {path} (pid {os.getpid()})[/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+    return 0
@@ -0,0 +1,44 @@
+"""
+Aggregation backend for the charts
+
+The histograms come from the shared ResultSummary (results/summary.py),
+which is computed in one pass over the ResultSet columns - with NumPy when
+it is installed - and memoized until the set changes. The functions here
+only adapt it to what the chart functions in charts.py accept as
+pre-aggregated input, so a dashboard refresh never rescans the rows.
+"""
+
+from datetime import datetime, timedelta
+
+from ..results.resultset import as_result_set
+from ..results.summary import summarize, HOUR
+
+
+DAY = 24 * HOUR
+_EPOCH = datetime(1970, 1, 1)
+
+
+def category_counts(results, name='event'):
+    """Counter of a categorical column (event, status, ...)"""
+    if name == 'event':
+        return summarize(results).events
+    if name == 'status':
+        return summarize(results).statuses
+    return as_result_set(results).value_counts(name)
+
+
+def confidence_bins(results):
+    """Confidence histogram keyed 0, 10, ... 100 (as create_confidence_heatmap)"""
+    return summarize(results).confidence_bins
+
+
+def _bucket_label(bucket, width):
+    dt = _EPOCH + timedelta(seconds=bucket * width)
+    return dt.strftime('%Y-%m-%d %H' if width == HOUR else '%Y-%m-%d')
+
+
+def timeline_buckets(results, granularity="hour"):
+    """Event counts per hour/day, keyed 'YYYY-MM-DD HH' / 'YYYY-MM-DD'"""
+    width = HOUR if granularity == "hour" else DAY
+    buckets = summarize(results).buckets(granularity)
+    return {_bucket_label(b, width): n for b, n in buckets.items()}
@@ -1,8 +1,10 @@
 from .console import console
+from .output import is_plain, write_lines
 
-from collections import Counter, defaultdict
+from collections import defaultdict
 from rich.panel import Panel
 from .charts import create_ascii_bar_chart, create_confidence_heatmap
+from ..results.summary import summarize
 from rich.tree import Tree
 from rich.layout import Layout
 from datetime import datetime
@@ -10,8 +12,6 @@ from datetime import datetime
 
 def display_pattern_tree(learning_stats):
     """Mostra albero dei pattern imparati con Neural Detector stats"""
-    tree = Tree("🌳 [bold cyan]Pattern Learning Tree (Neural)[/bold cyan]")
-    
     top_patterns = learning_stats.get('top_patterns', [])[:15]
     pattern_stats = learning_stats.get('pattern_stats', {})
     
@@ -21,6 +21,12 @@ def display_pattern_tree(learning_stats):
         prefix = pattern.split('_')[0] if '_' in pattern else 'other'
         groups[prefix].append((pattern, score))
     
+    if is_plain():
+        write_lines(f"{prefix}\t{pattern}\t{score:.0f}"
+                    for prefix, patterns in sorted(groups.items()) for pattern, score in patterns[:5])
+        return
+    
+    tree = Tree("🌳 [bold cyan]Pattern Learning Tree (Neural)[/bold cyan]")
     for prefix, patterns in sorted(groups.items()):
         branch = tree.add(f"[yellow]{prefix.upper()}[/yellow]")
         for pattern, score in patterns[:5]:
@@ -29,8 +35,16 @@ def display_pattern_tree(learning_stats):
     
     console.print(tree)
 
-def display_advanced_stats(parser, results):
-    """Statistiche avanzate con visualizzazioni (Neural Enhanced)"""
+def display_advanced_stats(parser, results, approx=False):
+    """Statistiche avanzate con visualizzazioni (Neural Enhanced; approx: da sketch)"""
+    if approx:
+        from ..results.approx import approx_summary
+        display_approx_stats(approx_summary(results))
+        return
+    if is_plain():
+        _plain_stats(summarize(results))
+        return
+    
     layout = Layout()
     
     layout.split_column(
@@ -47,23 +61,63 @@ def display_advanced_stats(parser, results):
         Layout(name="right")
     )
     
+    # Shared summary: same scan as insights/stats on this result set
+    summary = summarize(results)
+    
     # Left: Event distribution
-    event_dist = Counter(r.get('event') for r in results)
-    left_content = create_ascii_bar_chart(dict(event_dist.most_common(10)), title="Top Event Types")
+    left_content = create_ascii_bar_chart(dict(summary.events.most_common(10)), title="Top Event Types")
     layout["left"].update(Panel(left_content, border_style="green", title="Event Distribution"))
     
     # Right: Confidence heatmap
-    right_content = create_confidence_heatmap(results)
+    right_content = create_confidence_heatmap(bins=summary.confidence_bins)
     layout["right"].update(Panel(right_content, border_style="yellow", title="Confidence Analysis"))
     
     # Footer with neural stats
-    learning_stats = parser.get_learning_stats()
+    learning_stats = parser.get_learning_stats() if parser is not None else {}
     detector_stats = learning_stats.get('detector_stats', {})
-    footer_text = f"Total Events: {len(results)} | Neural Weights: {len(detector_stats.get('neural_weights', {}))} | Analyzed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    footer_text = f"Total Events: {summary.total} | Neural Weights: {len(detector_stats.get('neural_weights', {}))} | Analyzed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
     layout["footer"].update(Panel(footer_text, border_style="dim"))
     
     console.print(layout)
 
+def _plain_stats(summary):
+    """stats senza layout: una riga tab-separata per valore"""
+    lines = [f"total\t{summary.total}",
+             f"confidence_avg\t{summary.confidence_avg:.4f}",
+             f"severity_avg\t{summary.severity_avg:.2f}"]
+    lines += [f"status\t{status}\t{count}" for status, count in summary.statuses.most_common()]
+    lines += [f"event\t{event}\t{count}" for event, count in summary.events.most_common()]
+    lines += [f"confidence_bin\t{pct}\t{summary.confidence_bins[pct]}" for pct in sorted(summary.confidence_bins)]
+    write_lines(lines)
+
+def display_approx_stats(summary):
+    """Statistiche approssimate (sketch) con i relativi margini di errore"""
+    from rich.table import Table
+    
+    bounds = summary.error_bounds()
+    header = (f"[bold]Events:[/bold] {summary.total:,}   "
+              f"[bold]Distinct event types:[/bold] ≈{summary.distinct_events:,} [dim]{bounds['distinct']}[/dim]\n"
+              f"[bold]Avg confidence:[/bold] {summary.confidence_avg:.1%}   "
+              f"[bold]Avg severity:[/bold] {summary.severity_avg:.1f}/10")
+    console.print(Panel(header, title="≈ Approximate statistics", border_style="cyan"))
+    
+    console.print(create_ascii_bar_chart(dict(summary.events.most_common(10)),
+                                         title=f"Top Event Types (≈, {bounds['counts']})"))
+    
+    table = Table(title=f"Quantiles (≈, {bounds['quantiles']})")
+    table.add_column("Field", style="cyan")
+    for q in (0.5, 0.9, 0.99):
+        table.add_column(f"p{q * 100:g}", justify="right")
+    for name in ('confidence', 'severity'):
+        values = summary.quantiles(name, (0.5, 0.9, 0.99))
+        table.add_row(name, *("-" if v is None else f"{v:.3g}" for v in values.values()))
+    console.print(table)
+    
+    statuses = summary.statuses
+    if statuses:
+        console.print("  ".join(f"{status or 'unknown'}: ≈{summary.rate(status):.1%}"
+                                for status, _n in statuses.most_common()))
+
 def display_neural_network_stats(detector_stats):
     """Display detailed neural network statistics"""
     content = f"""
@@ -95,3 +149,40 @@ def display_neural_network_stats(detector_stats):
     
     console.print(Panel(content, title="🔬 Neural Network Analysis", border_style="yellow"))
 
+
+def render_live_dashboard(session):
+    """Dashboard live (dashboard --live): renderable dai contatori in streaming"""
+    from rich.console import Group
+    from rich.table import Table
+    from .charts import create_ascii_bar_chart
+    from ..quick import format_bytes
+    
+    stats = session.stats
+    rate = session.rate()
+    state = "[dim]idle[/dim]" if session.idle() else f"[green]{rate:,.0f} ev/s[/green]"
+    header = Panel(f"[bold cyan]📡 Live Dashboard[/bold cyan]  {state}", border_style="cyan")
+    
+    body = Table.grid(expand=True)
+    body.add_column(ratio=1)
+    body.add_column(ratio=1)
+    body.add_row(
+        Panel(create_ascii_bar_chart(dict(stats.event_types.most_common(10)), title="Top Event Types"),
+              border_style="green", title="Event Distribution"),
+        Panel(create_ascii_bar_chart(dict(stats.levels.most_common(10)), title="Levels"),
+              border_style="yellow", title="Level Distribution"),
+    )
+    
+    files = []
+    for follower in session.followers:
+        note = ""
+        if follower.rotations or follower.truncations:
+            note = f" [dim](rotated {follower.rotations}, truncated {follower.truncations})[/dim]"
+        files.append(f"{follower.path}: {session.per_file[follower.path]:,} events{note}")
+    footer = Panel(
+        "\n".join(files + [
+            f"Total Events: {stats.total_events:,} | Read: {format_bytes(session.bytes_read())} | "
+            f"Updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        ]),
+        border_style="dim",
+    )
+    return Group(header, body, footer)
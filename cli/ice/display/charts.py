@@ -1,32 +1,34 @@
-from collections import defaultdict, Counter
+import heapq
+
+from .aggregate import confidence_bins, timeline_buckets
 
 def create_ascii_bar_chart(data, max_width=40, title="Distribution"):
     """Crea un grafico a barre ASCII"""
     if not data:
         return "No data"
     
-    max_val = max(data.values())
+    total = sum(data.values())
+    top = heapq.nlargest(10, data.items(), key=lambda x: x[1])
+    max_val = top[0][1]
     lines = [f"[bold]{title}[/bold]\n"]
     
-    for label, value in sorted(data.items(), key=lambda x: x[1], reverse=True)[:10]:
+    for label, value in top:
         bar_len = int((value / max_val) * max_width) if max_val > 0 else 0
         bar = "█" * bar_len
-        pct = (value / sum(data.values())) * 100 if sum(data.values()) > 0 else 0
-        lines.append(f"{label:20s} [{value:5d}] [cyan]{bar}[/cyan] {pct:5.1f}%")
+        pct = (value / total) * 100 if total > 0 else 0
+        lines.append(f"{str(label):20s} [{value:5d}] [cyan]{bar}[/cyan] {pct:5.1f}%")
     
     return "\n".join(lines)
 
-def create_confidence_heatmap(results):
-    """Crea heatmap della confidence"""
-    if not results:
+def create_confidence_heatmap(results=None, bins=None):
+    """Crea heatmap della confidence (bins: istogramma già aggregato)"""
+    if bins is None:
+        if not results:
+            return "No data"
+        bins = confidence_bins(results)
+    if not bins:
         return "No data"
     
-    bins = defaultdict(int)
-    for r in results:
-        conf = r.get('confidence', 1.0)
-        bin_key = int(conf * 10) * 10
-        bins[bin_key] += 1
-    
     heatmap = ["[bold]Confidence Heatmap[/bold]\n"]
     max_count = max(bins.values()) if bins else 1
     
@@ -48,21 +50,13 @@ def create_confidence_heatmap(results):
     
     return "\n".join(heatmap)
 
-def create_timeline_view(results, granularity="hour"):
-    """Crea timeline degli eventi"""
-    if not results:
-        return "No events"
-    
-    timeline = defaultdict(int)
-    
-    for r in results:
-        ts = r.get('timestamp', '')
-        if isinstance(ts, str) and len(ts) >= 10:
-            if granularity == "hour":
-                bucket = ts[:13]  # YYYY-MM-DD HH
-            else:
-                bucket = ts[:10]  # YYYY-MM-DD
-            timeline[bucket] += 1
+def create_timeline_view(results=None, granularity="hour", buckets=None):
+    """Crea timeline degli eventi (buckets: conteggi già aggregati)"""
+    if buckets is None:
+        if not results:
+            return "No events"
+        buckets = timeline_buckets(results, granularity)
+    timeline = buckets
     
     if not timeline:
         return "No timeline data"
@@ -15,12 +15,13 @@ def display_quick_guide():
             ("scan [--conf 0.7] [--limit 100] [--file X]", "Smart scan with filters"),
             ("quick [--summary]", "Fast report generation"),
             ("analyze [--deep]", "Deep pattern analysis"),
-            ("filter <status> [--severity N]", "Multi-filter results"),
+            ("filter [status] [--event E] [--severity N] [--conf X] [--refine]", "Multi-filter results"),
             ("search <text> [--regex] [--case]", "Search in events"),
-            ("top [N] [--by type|severity|confidence]", "Top items analysis")
+            ("top [N] [--by type|severity|confidence] [--approx]", "Top items analysis"),
+            ("more [PAGE]", "Next page of the last listing")
         ]),
         ("🤖 AI & Machine Learning", [
-            ("stats [--visual] [--export]", "AI statistics dashboard"),
+            ("stats [--visual] [--export] [--approx]", "AI statistics dashboard"),
             ("learning [--patterns] [--evolution]", "Pattern learning analysis"),
             ("confidence [--heatmap] [--threshold X]", "Confidence distribution"),
             ("patterns [--learned] [--top N]", "Pattern explorer"),
@@ -30,7 +31,7 @@ def display_quick_guide():
             ("signatures [--coverage]", "Show log signatures (100+)")
         ]),
         ("📊 Reports & Export", [
-            ("export <format> [--output file] [--filter]", "Export with options"),
+            ("export jsonl|csv|columnar [--output file] [--compress gzip|xz] [--filter]", "Streaming export"),
             ("report [--detailed] [--html] [--dashboard]", "Generate reports"),
             ("compare <file1> <file2>", "Compare log files"),
             ("timeline [--granularity hour|day]", "Event timeline"),
@@ -41,7 +42,8 @@ def display_quick_guide():
             ("debug [--verbose] [--detector]", "Deep diagnostics"),
             ("benchmark", "Performance test"),
             ("config [--show] [--set key=value]", "Configuration"),
-            ("history [--clear]", "Command history"),
+            ("session [list|save|load|delete] <name>", "Save / restore results (snapshots)"),
+            ("history [--clear | search <text> | compact]", "Command history, reverse search"),
             ("plugin [list|load|unload] <name>", "Plugin management"),
             ("features [--all]", "Show feature extraction"),
             ("help <command>", "Detailed help"),
@@ -1,23 +1,29 @@
 from .console import console
-from collections import Counter
 from rich.panel import Panel
+from ..results.summary import summarize
 
 
-def display_ai_insights(parser, results):
-    """Mostra insights AI avanzati con Neural Detector 2.0"""
-    learning_stats = parser.get_learning_stats()
+def display_ai_insights(parser, results, approx=False):
+    """Mostra insights AI avanzati con Neural Detector 2.0 (approx: da sketch)"""
+    learning_stats = parser.get_learning_stats() if parser is not None else {}
     
-    total = len(results)
+    # One shared pass over the results (memoized on the result set)
+    if approx:
+        from ..results.approx import approx_summary
+        summary = approx_summary(results)
+    else:
+        summary = summarize(results)
+    total = summary.total
     if total == 0:
         console.print("[yellow]No results to analyze[/yellow]")
         return
     
-    status_dist = Counter(r.get('status') for r in results)
-    confidence_avg = sum(r.get('confidence', 0) for r in results) / total
-    severity_avg = sum(r.get('severity', 0) for r in results) / total
+    status_dist = summary.statuses
+    confidence_avg = summary.confidence_avg
+    severity_avg = summary.severity_avg
     
     # Pattern diversity
-    event_types = len(set(r.get('event') for r in results))
+    event_types = summary.distinct_events
     learned_structures = learning_stats.get('learned_structures', 0)
     
     # Neural metrics
@@ -77,4 +83,9 @@ def display_ai_insights(parser, results):
     if avg_neural_weight > 1.2:
         insights += "  🚀 Neural network highly optimized!\n"
     
+    if approx:
+        bounds = summary.error_bounds()
+        insights += (f"\n[dim]≈ Approximate: distinct {bounds['distinct']}, "
+                     f"counts {bounds['counts']}[/dim]\n")
+    
     console.print(Panel(insights, border_style="cyan"))
\ No newline at end of file
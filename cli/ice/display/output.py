@@ -0,0 +1,168 @@
+"""
+Output path for large listings
+
+On a terminal only the visible page is turned into rich renderables: a
+Listing keeps the selected row indices and renders one page at a time
+(`more` shows the next one), so the cost of a listing does not depend on
+how many rows matched.
+
+When the display console is not a TTY (piped, redirected, batch/daemon)
+no markup is built at all: rows go out as tab-separated lines read
+straight from the result set's columns, written in large blocks.
+"""
+
+from .console import console
+from ..results.resultset import format_timestamp
+
+
+PLAIN_FIELDS = ('timestamp', 'status', 'event', 'confidence', 'severity', 'message')
+WRITE_ROWS = 8192    # lines per write() in plain mode
+
+
+def is_plain(out=None):
+    """True when output is not going to a terminal (no markup, no pages)"""
+    return not (out or console).is_terminal
+
+
+def _clean(value):
+    text = str(value)
+    if '\t' in text or '\n' in text or '\r' in text:
+        text = text.replace('\t', ' ').replace('\r', ' ').replace('\n', ' ')
+    return text
+
+
+def _formatted(column, fmt):
+    """i -> fmt(column[i]), memoized per value ('' for NaN): stamps and scores repeat a lot"""
+    memo = {}
+
+    def cell(i):
+        value = column[i]
+        text = memo.get(value)
+        if text is None:
+            text = '' if value != value else fmt(value)
+            if value == value:
+                memo[value] = text
+        return text
+    return cell
+
+
+def _cell(results, field):
+    """i -> plain text of one column, with the column resolved once"""
+    raw = results.raw(field)
+    if raw is not None:
+        # Originals the parsed column cannot give back win over it
+        parsed = _parsed_cell(results, field)
+        return lambda i: parsed(i) if raw[i] is None else _clean(raw[i])
+    return _parsed_cell(results, field)
+
+
+def _parsed_cell(results, field):
+    if field == 'timestamp':
+        return _formatted(results.floats('timestamp'), format_timestamp)
+    try:
+        codes, values = results.codes(field)
+    except KeyError:
+        pass
+    else:
+        text = ['' if v is None else _clean(v) for v in values]
+        return lambda i: text[codes[i]]
+    try:
+        floats = results.floats(field)
+    except KeyError:
+        pass
+    else:
+        return _formatted(floats, '{:g}'.format)
+    objects = results.objects(field)
+    if field == 'message':
+        lines = results.objects('line')
+        return lambda i: _clean(objects[i] or lines[i] or '')
+    return lambda i: '' if objects[i] is None else _clean(objects[i])
+
+
+def write_plain(results, rows, out=None, fields=PLAIN_FIELDS):
+    """Rows (indices into results) as tab-separated lines; returns the count"""
+    file = (out or console).file
+    cells = [_cell(results, field) for field in fields]
+    count = 0
+    for start in range(0, len(rows), WRITE_ROWS):
+        chunk = rows[start:start + WRITE_ROWS]
+        # Column by column, then one join per line and one write per chunk
+        columns = [[cell(i) for i in chunk] for cell in cells]
+        file.write('\n'.join(map('\t'.join, zip(*columns))) + '\n')
+        count += len(chunk)
+    file.flush()
+    return count
+
+
+def write_lines(lines, out=None):
+    """Plain lines (already tab-separated) in blocks"""
+    file = (out or console).file
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= WRITE_ROWS:
+            file.write('\n'.join(buffer) + '\n')
+            buffer.clear()
+    if buffer:
+        file.write('\n'.join(buffer) + '\n')
+    file.flush()
+
+
+class Listing:
+    """Row indices of one listing, rendered a page at a time"""
+
+    def __init__(self, results, rows, title="Results", page_size=20):
+        self.results = results
+        self.rows = rows
+        self.title = title
+        self.page_size = max(1, page_size)
+        self.version = results.version
+        self.page = 0
+
+    @property
+    def pages(self):
+        return max(1, -(-len(self.rows) // self.page_size))
+
+    def valid_for(self, results):
+        return results is self.results and results.version == self.version
+
+    def show(self, page=None, out=None):
+        """
+        Render one page (default: the current one) to out (default: the
+        display console); False when out of range
+        """
+        from .rows import display_result_rows
+
+        page = self.page if page is None else page
+        if not 0 <= page < self.pages:
+            return False
+        self.page = page
+        start = page * self.page_size
+        window = self.rows[start:start + self.page_size]
+        display_result_rows(
+            (self.results[i] for i in window),
+            total=len(self.rows),
+            limit=self.page_size,
+            title=self.title,
+            first=start + 1,
+            out=out,
+        )
+        if page + 1 < self.pages:
+            (out or console).print(f"[dim]Page {page + 1}/{self.pages} - 'more' for the next page, 'more N' to jump[/dim]")
+        return True
+
+
+def show_rows(results, rows, title="Results", limit=None, page_size=20, out=None):
+    """
+    Listing entry point for commands: plain lines when out (default: the
+    display console) is piped, otherwise the first page of a Listing
+    (returned, so `more` can page through it).
+    """
+    if limit is not None:
+        rows = rows[:limit]
+    if is_plain(out):
+        write_plain(results, rows, out=out)
+        return None
+    listing = Listing(results, rows, title=title, page_size=page_size)
+    listing.show(0, out=out)
+    return listing
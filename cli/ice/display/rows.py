@@ -0,0 +1,57 @@
+from .console import console
+from itertools import islice
+from rich.table import Table
+from rich.text import Text
+
+
+MESSAGE_WIDTH = 120
+
+
+def _number(value, spec):
+    """Numbers formatted with spec, kept originals (e.g. 'high') as they are"""
+    if value is None:
+        return ''
+    if isinstance(value, (int, float)):
+        return format(value, spec)
+    return str(value)
+
+
+def display_result_rows(rows, total=None, limit=20, title="Results", first=1, out=None):
+    """Tabella compatta dei risultati (solo le prime `limit` righe, dalla riga `first`), su `out`"""
+    out = out or console
+    rows = list(islice(rows, limit))
+    total = len(rows) if total is None else total
+    
+    if not rows:
+        out.print("[yellow]No matching results[/yellow]")
+        return
+    
+    if first > 1 or len(rows) < total:
+        shown = f"{first}-{first + len(rows) - 1}/{total}"
+    else:
+        shown = f"{total}/{total}"
+    table = Table(title=f"{title} ({shown})", show_lines=False)
+    table.add_column("Time", style="dim", no_wrap=True, min_width=19)
+    table.add_column("Status", no_wrap=True, min_width=7)
+    table.add_column("Event", style="cyan", no_wrap=True, min_width=8)
+    table.add_column("Conf", justify="right", no_wrap=True, min_width=4)
+    table.add_column("Sev", justify="right", no_wrap=True, min_width=3)
+    table.add_column("Message", overflow="ellipsis")
+    
+    colors = {'success': 'green', 'warning': 'yellow', 'failed': 'red'}
+    for r in rows:
+        status = r.get('status') or ''
+        color = colors.get(status, 'white')
+        conf = r.get('confidence')
+        sev = r.get('severity')
+        table.add_row(
+            # Log text is data, not markup: '[admin]' or '[/red]' print as is
+            Text(str(r.get('timestamp') or '')),
+            Text(str(status), style=color),
+            Text(str(r.get('event') or '')),
+            Text(_number(conf, '.0%')),
+            Text(_number(sev, '.0f')),
+            Text(str(r.get('message') or r.get('line') or '')[:MESSAGE_WIDTH]),
+        )
+    
+    out.print(table)
@@ -1,4 +1,5 @@
 from .console import console
+from .output import is_plain, write_lines
 from rich.tree import Tree
 
 def display_log_signatures(parser):
@@ -6,8 +7,6 @@ def display_log_signatures(parser):
     detector = parser.detector
     signatures = detector.log_signatures
     
-    tree = Tree(f"[bold cyan]📋 Log Signature Database ({len(signatures)} types)[/bold cyan]")
-    
     # Group by category
     categories = {
         'Web Servers': ['nginx', 'apache', 'iis', 'haproxy', 'traefik', 'caddy'],
@@ -36,6 +35,13 @@ def display_log_signatures(parser):
         if not found:
             categorized['Other'].append((sig_name, sig_data))
     
+    if is_plain():
+        # Tutte le firme, non solo le prime 10 per categoria
+        write_lines(f"{category}\t{sig_name}\t{sig_data.get('weight', 0)}\t{len(sig_data.get('patterns', []))}"
+                    for category, sigs in categorized.items() for sig_name, sig_data in sorted(sigs))
+        return
+    
+    tree = Tree(f"[bold cyan]📋 Log Signature Database ({len(signatures)} types)[/bold cyan]")
     for category, sigs in categorized.items():
         if sigs:
             branch = tree.add(f"[bold yellow]{category}[/bold yellow] ({len(sigs)})")
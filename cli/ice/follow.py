@@ -0,0 +1,164 @@
+"""
+Follow mode - tail log files and fold appended events into running stats
+
+FileFollower keeps each file open and reads only the bytes appended since
+the last poll, carrying a partial last line over to the next one. A new
+inode at the path (logrotate's rename + create) drains the old file and
+reopens the new one from the start; a file shorter than our offset
+(copytruncate) is re-read from 0.
+
+TailSession parses the new lines with the processor and feeds them into a
+StreamingStats; its `version` only moves when events arrive, so a display
+can skip re-rendering while nothing changes.
+"""
+
+import os
+import time
+from collections import Counter, deque
+
+from devlog.cli.quick import StreamingStats, _new_processor
+
+
+READ_SIZE = 8 * 1024 * 1024  # max bytes read per file per poll
+RATE_WINDOW = 10.0           # seconds of history behind the ev/s figure
+
+
+class FileFollower:
+    """Appended complete lines of one file, across rotation/truncation"""
+
+    def __init__(self, path, from_start=True, read_size=READ_SIZE):
+        self.path = path
+        self.read_size = read_size
+        self.offset = 0
+        self.bytes_read = 0
+        self.rotations = 0
+        self.truncations = 0
+        self._file = None
+        self._ident = None
+        self._partial = b''
+        self._open(seek_end=not from_start)
+
+    def _open(self, seek_end=False):
+        try:
+            self._file = open(self.path, 'rb')
+        except OSError:
+            self._file = None  # not created yet; retried on every poll
+            return
+        st = os.fstat(self._file.fileno())
+        self._ident = (st.st_dev, st.st_ino)
+        self.offset = st.st_size if seek_end else 0
+        self._file.seek(self.offset)
+        self._partial = b''
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotated(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False, None  # mid-rotation: keep draining the old file
+        return (st.st_dev, st.st_ino) != self._ident, st.st_size
+
+    def poll(self):
+        """(lines, more): new complete lines; more=True when a read was capped"""
+        if self._file is None:
+            self._open()
+            if self._file is None:
+                return [], False
+
+        rotated, size = self._rotated()
+        if not rotated and size is not None and size < self.offset:
+            # copytruncate: the same inode started over
+            self.truncations += 1
+            self._file.seek(0)
+            self.offset = 0
+            self._partial = b''
+
+        data = self._file.read(self.read_size)
+        if not data and rotated:
+            # Old file fully drained; switch to the new one
+            tail = self._partial
+            self.close()
+            self.rotations += 1
+            self._open()
+            return ([tail.decode('utf-8', errors='replace').rstrip('\r')] if tail else []), True
+
+        self.offset += len(data)
+        self.bytes_read += len(data)
+        if not data:
+            return [], False
+
+        chunk = self._partial + data
+        cut = chunk.rfind(b'\n')
+        if cut < 0:
+            self._partial = chunk
+            return [], len(data) == self.read_size
+        self._partial = chunk[cut + 1:]
+        text = chunk[:cut].decode('utf-8', errors='replace')
+        lines = text.split('\n')
+        if '\r' in text:
+            lines = [line.rstrip('\r') for line in lines]
+        return lines, len(data) == self.read_size
+
+
+class TailSession:
+    """Followers for several files + the aggregates their events feed"""
+
+    def __init__(self, paths, from_start=True, read_size=READ_SIZE):
+        self.followers = [FileFollower(p, from_start, read_size) for p in paths]
+        self.stats = StreamingStats()
+        self.per_file = Counter()
+        self.version = 0
+        self.started = time.time()
+        self.last_event = None
+        self._samples = deque()   # (time, total_events)
+        processor = _new_processor()
+        self._process_lines = getattr(processor, 'process_lines', None)
+
+    def _events(self, lines, path):
+        if self._process_lines is not None:
+            return self._process_lines(lines, source=path)
+        # No line-level parser available: count lines only
+        return ({'raw': line, 'level': None, 'event_type': None} for line in lines)
+
+    def poll(self):
+        """Read and fold everything new; returns (new events, backlog left)"""
+        before = self.stats.total_events
+        backlog = False
+        for follower in self.followers:
+            lines, more = follower.poll()
+            backlog = backlog or more
+            if lines:
+                count = self.stats.total_events
+                self.stats.consume(self._events(lines, follower.path))
+                self.per_file[follower.path] += self.stats.total_events - count
+        new = self.stats.total_events - before
+
+        now = time.time()
+        self._samples.append((now, self.stats.total_events))
+        while len(self._samples) > 2 and now - self._samples[0][0] > RATE_WINDOW:
+            self._samples.popleft()
+        if new:
+            self.version += 1
+            self.last_event = now
+        return new, backlog
+
+    def rate(self):
+        """Events/sec over the last RATE_WINDOW seconds"""
+        if len(self._samples) < 2:
+            return 0.0
+        (t0, n0), (t1, n1) = self._samples[0], self._samples[-1]
+        return (n1 - n0) / (t1 - t0) if t1 > t0 else 0.0
+
+    def bytes_read(self):
+        return sum(follower.bytes_read for follower in self.followers)
+
+    def idle(self, after=RATE_WINDOW):
+        return self.last_event is None or time.time() - self.last_event > after
+
+    def close(self):
+        for follower in self.followers:
+            follower.close()
@@ -0,0 +1,276 @@
+"""
+Bounded, indexed command history (~/.devlog_history)
+
+The file keeps prompt_toolkit's FileHistory layout, so other readers of
+~/.devlog_history still work:
+
+    # 2024-01-01 10:00:00.000000
+    +scan --conf 0.7
+
+but it is never read in full at startup: the prompt gets the most recent
+WINDOW distinct entries, read backwards from the end of the file, so
+startup cost does not grow with the history. New entries are appended;
+once the file has grown past COMPACT_BYTES it is compacted in the
+background (duplicates dropped, newest MAX_ENTRIES kept, atomic rename).
+
+search() answers prefix and substring reverse-search over the whole
+history from an index built on first use and kept up to date on append.
+The prompt gets the older entries from the same index once the window is
+in (see load), so Up and Ctrl-R also reach past the window.
+"""
+
+import datetime
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from prompt_toolkit.history import History
+
+
+WINDOW = 1000                      # entries handed to the prompt before the index is built
+MAX_ENTRIES = 20000                # distinct entries kept by compaction
+COMPACT_BYTES = 4 * 1024 * 1024    # compact once the log is bigger than this
+READ_BLOCK = 64 * 1024
+
+
+def _entries_reversed(path):
+    """Entries of a history file, newest first, reading backwards by block"""
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        carry = b''
+        lines = []
+        while pos > 0:
+            step = min(READ_BLOCK, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step) + carry
+            parts = block.split(b'\n')
+            carry = parts.pop(0)   # may be the tail of a line in the previous block
+            for raw in reversed(parts):
+                entry = _feed(lines, raw)
+                if entry is not None:
+                    yield entry
+        for raw in (carry, b''):
+            entry = _feed(lines, raw)
+            if entry is not None:
+                yield entry
+
+
+def _feed(lines, raw):
+    # '+' lines belong to the entry being read backwards; any other line ends it
+    if raw.startswith(b'+'):
+        lines.append(raw[1:].decode('utf-8', 'replace'))
+        return None
+    if not lines:
+        return None
+    entry = '\n'.join(reversed(lines))
+    lines.clear()
+    return entry
+
+
+def _records(path, end=None):
+    """(stamp, entry) of a history file, oldest first (streaming), up to byte offset end"""
+    lines = []
+    stamp = None
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    offset = 0
+    with f:
+        for raw in f:
+            offset += len(raw)
+            if end is not None and offset > end:
+                break
+            if raw.startswith(b'+'):
+                lines.append(raw[1:].rstrip(b'\n').decode('utf-8', 'replace'))
+                continue
+            if lines:
+                yield stamp, '\n'.join(lines)
+                lines = []
+                stamp = None
+            if raw.startswith(b'# '):
+                stamp = raw[2:].strip().decode('utf-8', 'replace')
+    if lines:
+        yield stamp, '\n'.join(lines)
+
+
+def _entries(path, end=None):
+    """Entries of a history file, oldest first (streaming), up to byte offset end"""
+    for _stamp, entry in _records(path, end):
+        yield entry
+
+
+def _format(entry, stamp=None):
+    stamp = stamp or datetime.datetime.now()
+    return f"\n# {stamp}\n" + "".join(f"+{line}\n" for line in entry.split("\n"))
+
+
+class HistoryIndex:
+    """Distinct entries by recency, with prefix (sorted) and substring (joined text) lookups"""
+
+    def __init__(self, entries=()):
+        self.recency = {}           # entry -> sequence number of its last use
+        self.seq = 0
+        self._sorted = None
+        self._ordered = None
+        self._text = None
+        for entry in entries:
+            self.add(entry)
+
+    def add(self, entry):
+        self.seq += 1
+        if entry not in self.recency:
+            self._sorted = None
+        self.recency[entry] = self.seq
+        self._ordered = None
+        self._text = None
+
+    def __len__(self):
+        return len(self.recency)
+
+    def ordered(self):
+        """Distinct entries, most recently used first (do not mutate)"""
+        if self._ordered is None:
+            self._ordered = sorted(self.recency, key=self.recency.get, reverse=True)
+        return self._ordered
+
+    def _ranked(self, entries, limit):
+        return sorted(entries, key=self.recency.get, reverse=True)[:limit]
+
+    def prefix(self, text, limit=50):
+        if self._sorted is None:
+            self._sorted = sorted(self.recency)
+        lo = bisect_left(self._sorted, text)
+        hi = bisect_right(self._sorted, text + '\U0010ffff')
+        return self._ranked(self._sorted[lo:hi], limit)
+
+    def substring(self, text, limit=50):
+        if self._text is None:
+            # Newest first, so the first `limit` hits are the most recent
+            ordered = self.ordered()
+            starts, pos = [], 0
+            for entry in ordered:
+                starts.append(pos)
+                pos += len(entry) + 1
+            self._text = ('\0'.join(ordered), starts, ordered)
+        joined, starts, ordered = self._text
+        found = []
+        pos = joined.find(text)
+        while pos >= 0 and len(found) < limit:
+            k = bisect_right(starts, pos) - 1
+            found.append(ordered[k])
+            pos = joined.find(text, starts[k] + len(ordered[k]) + 1)
+        return found
+
+
+class IndexedHistory(History):
+    """prompt_toolkit History over a bounded, compacted append-only log"""
+
+    def __init__(self, filename, window=WINDOW, max_entries=MAX_ENTRIES, compact_bytes=COMPACT_BYTES):
+        super().__init__()
+        self.filename = Path(filename)
+        self.window = window
+        self.max_entries = max_entries
+        self.compact_bytes = compact_bytes
+        self._lock = threading.Lock()
+        self._index = None
+        self._compacting = None
+
+    # -- History backend -----------------------------------------------
+
+    async def load(self):
+        """
+        The newest WINDOW entries right away, then - once the index is built
+        off the event loop - every older distinct entry, so the prompt's
+        Up and Ctrl-R search cover the whole history.
+        """
+        import asyncio
+
+        async for entry in super().load():
+            yield entry
+        index = await asyncio.get_running_loop().run_in_executor(None, self.index)
+        loaded = set(self._loaded_strings)
+        for entry in index.ordered():
+            if entry not in loaded:
+                yield entry
+
+    def load_history_strings(self):
+        """Newest WINDOW distinct entries, newest first"""
+        seen = set()
+        for entry in _entries_reversed(self.filename):
+            if entry in seen:
+                continue
+            seen.add(entry)
+            yield entry
+            if len(seen) >= self.window:
+                break
+        self.maybe_compact()
+
+    def store_string(self, string):
+        with self._lock:
+            with open(self.filename, 'ab') as f:
+                f.write(_format(string).encode('utf-8'))
+            if self._index is not None:
+                self._index.add(string)
+        self.maybe_compact()
+
+    # -- reverse search ------------------------------------------------
+
+    def index(self):
+        """Index over the whole file, built on first use"""
+        with self._lock:
+            if self._index is None:
+                self._index = HistoryIndex(_entries(self.filename))
+            return self._index
+
+    def search(self, text, prefix=False, limit=50):
+        """Most recent first: entries starting with (prefix) or containing text"""
+        index = self.index()
+        return index.prefix(text, limit) if prefix else index.substring(text, limit)
+
+    # -- compaction ----------------------------------------------------
+
+    def maybe_compact(self):
+        try:
+            size = self.filename.stat().st_size
+        except OSError:
+            return
+        if size <= self.compact_bytes:
+            return
+        if self._compacting is not None and self._compacting.is_alive():
+            return
+        self._compacting = threading.Thread(target=self.compact, name="history-compact", daemon=True)
+        self._compacting.start()
+
+    def compact(self):
+        """Rewrite the log with the newest max_entries distinct entries"""
+        with self._lock:
+            try:
+                size = self.filename.stat().st_size
+            except OSError:
+                return 0
+            recent = {}    # entry -> stamp of its last use, in order of last use
+            for stamp, entry in _records(self.filename, size):
+                recent.pop(entry, None)
+                recent[entry] = stamp
+            keep = list(recent.items())[-self.max_entries:]
+            tmp = self.filename.with_name(f".{self.filename.name}.{os.getpid()}.tmp")
+            with open(tmp, 'wb') as out:
+                for entry, stamp in keep:
+                    out.write(_format(entry, stamp).encode('utf-8'))
+                # Another shell may have appended while we read: carry it over
+                with open(self.filename, 'rb') as f:
+                    f.seek(size)
+                    out.write(f.read())
+            os.replace(tmp, self.filename)
+            # Long entries can leave the compacted log near the threshold
+            self.compact_bytes = max(self.compact_bytes, 2 * self.filename.stat().st_size)
+            self._index = None
+            return len(keep)
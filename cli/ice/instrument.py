@@ -0,0 +1,262 @@
+"""
+Per-command instrumentation around command.execute
+
+Every command run through DevLogShell.run_command is measured for wall
+time, CPU time of the thread running it, rows processed and the change in
+allocated memory blocks. The block count is process-wide, so it is only
+recorded for runs no other command overlapped (None otherwise). Wall/CPU
+land in per-command histograms (see metrics.py: a rolling window for the
+`metrics` command, cumulative totals for the Prometheus export) and the
+last RECENT runs are kept for the `metrics` command.
+
+Profiling is opt-in: `devlog --profile` or `profile on [cpu|mem|all]`
+capture every command, `profile run <command>` a single one. CPU profiles
+use cProfile (only the thread running the command), memory profiles
+tracemalloc snapshots; the hot spots are printed after the command.
+tracemalloc is process-wide: concurrent jobs share one trace, started by
+the first profiled command and stopped when the last one ends, and their
+snapshots include each other's allocations.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+from devlog.cli.metrics import histogram
+
+
+RECENT = 500           # command runs kept for `metrics recent`
+PROFILE_TOP = 15       # hot spots printed per profiled command
+PROFILE_MODES = ('cpu', 'mem', 'all')
+
+_trace_lock = threading.Lock()
+_tracers = 0           # profiled commands currently using tracemalloc
+_own_trace = False     # tracemalloc was started here (not by -X tracemalloc)
+
+
+def _trace_start():
+    global _tracers, _own_trace
+    import tracemalloc
+    with _trace_lock:
+        if _tracers == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            _own_trace = True
+        _tracers += 1
+
+
+def _trace_stop():
+    global _tracers, _own_trace
+    import tracemalloc
+    with _trace_lock:
+        _tracers -= 1
+        if _tracers == 0 and _own_trace:
+            tracemalloc.stop()
+            _own_trace = False
+
+
+class CommandRecord:
+    __slots__ = ('command', 'started', 'wall_ms', 'cpu_ms', 'rows', 'alloc_blocks', 'ok')
+
+    def __init__(self, command, started, wall_ms, cpu_ms, rows, alloc_blocks, ok):
+        self.command = command
+        self.started = started
+        self.wall_ms = wall_ms
+        self.cpu_ms = cpu_ms
+        self.rows = rows
+        self.alloc_blocks = alloc_blocks
+        self.ok = ok
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Instrumentation:
+    """Wraps command execution with timing, optional profiling and metric export"""
+
+    def __init__(self, profile=None, metrics_file=None):
+        self.recent = deque(maxlen=RECENT)
+        self.profile = profile           # None or one of PROFILE_MODES
+        self.metrics_file = Path(metrics_file) if metrics_file else None
+        self._lock = threading.Lock()
+        self._active = 0       # commands running now
+        self._starts = 0       # commands started so far
+
+    def run(self, name, execute, ctx, results=None, profile=None):
+        """execute(ctx) measured; `results` is the shell's result set getter"""
+        mode = profile or self.profile
+        before_rows = len(results()) if results is not None else 0
+        with self._lock:
+            self._active += 1
+            self._starts += 1
+            alone, starts = self._active == 1, self._starts
+        blocks = sys.getallocatedblocks()
+        started = time.time()
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        ok = False
+        profiler = _Profiler(mode) if mode else None
+        try:
+            if profiler is not None:
+                profiler.start()
+            value = execute(ctx)
+            ok = True
+            return value
+        finally:
+            cpu_ms = (time.thread_time() - cpu) * 1000
+            wall_ms = (time.perf_counter() - wall) * 1000
+            alloc_blocks = sys.getallocatedblocks() - blocks
+            with self._lock:
+                self._active -= 1
+                if not alone or self._starts != starts:
+                    alloc_blocks = None  # other commands allocated meanwhile
+            if profiler is not None:
+                profiler.stop()
+            rows = getattr(ctx, 'rows', None)
+            if rows is None and results is not None:
+                rows = abs(len(results()) - before_rows)
+            self.record(CommandRecord(
+                name, started, wall_ms, cpu_ms, rows or 0, alloc_blocks, ok,
+            ))
+            if profiler is not None:
+                profiler.report(ctx.console, name)
+
+    def record(self, record):
+        histogram(f"command.{record.command}").record(record.wall_ms)
+        histogram(f"command_cpu.{record.command}").record(record.cpu_ms)
+        with self._lock:
+            self.recent.append(record)
+        if self.metrics_file is not None:
+            try:
+                write_prometheus(self.metrics_file)
+            except OSError:
+                pass
+
+    def records(self):
+        with self._lock:
+            return list(self.recent)
+
+    def reset(self):
+        from devlog.cli.metrics import all_histograms
+        with self._lock:
+            self.recent.clear()
+        for h in all_histograms().values():
+            h.reset()
+
+
+class _Profiler:
+    """cProfile and/or tracemalloc around one command"""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.cpu = None
+        self.snapshot = None
+        self._tracing = False
+
+    def start(self):
+        if self.mode in ('mem', 'all'):
+            import tracemalloc
+            _trace_start()
+            self._tracing = True
+            self.snapshot = tracemalloc.take_snapshot()
+        if self.mode in ('cpu', 'all'):
+            import cProfile
+            self.cpu = cProfile.Profile()
+            try:
+                self.cpu.enable()
+            except ValueError:
+                self.cpu = None  # an outer command is already being profiled
+
+    def stop(self):
+        if self.cpu is not None:
+            self.cpu.disable()
+        if self.snapshot is not None:
+            import tracemalloc
+            # Leave out the profilers' own bookkeeping and import machinery
+            ignore = [tracemalloc.Filter(False, pattern) for pattern in (
+                tracemalloc.__file__, '*/cProfile.py', '*/profile.py', '*/pstats.py',
+                '<frozen importlib._bootstrap*>', '<unknown>',
+            )]
+            after = tracemalloc.take_snapshot().filter_traces(ignore)
+            self.snapshot = after.compare_to(self.snapshot.filter_traces(ignore), 'lineno')
+        if self._tracing:
+            _trace_stop()
+            self._tracing = False
+
+    def report(self, console, name):
+        from rich.table import Table
+
+        if self.cpu is not None:
+            import pstats
+            stats = pstats.Stats(self.cpu)
+            table = Table(title=f"CPU hot spots: {name} (by cumulative time)")
+            table.add_column("Function", style="cyan")
+            table.add_column("Calls", justify="right")
+            table.add_column("Self ms", justify="right")
+            table.add_column("Cumulative ms", justify="right")
+            entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)
+            for (filename, line, func), (_cc, calls, tottime, cumtime, _callers) in entries[:PROFILE_TOP]:
+                where = f"{Path(filename).name}:{line}" if line else filename
+                table.add_row(f"{func} [dim]{where}[/dim]", str(calls),
+                              f"{tottime * 1000:.1f}", f"{cumtime * 1000:.1f}")
+            console.print(table)
+
+        if self.snapshot is not None:
+            table = Table(title=f"Allocation hot spots: {name} (net growth, whole process)")
+            table.add_column("Line", style="cyan")
+            table.add_column("Size", justify="right")
+            table.add_column("Blocks", justify="right")
+            growth = [s for s in self.snapshot if s.size_diff > 0][:PROFILE_TOP]
+            for stat in growth:
+                frame = stat.traceback[0]
+                table.add_row(f"{Path(frame.filename).name}:{frame.lineno}",
+                              f"{stat.size_diff / 1024:+.1f} KB", f"{stat.count_diff:+d}")
+            console.print(table)
+
+
+# -- Prometheus text export ----------------------------------------------
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text():
+    """All histograms in Prometheus exposition format (seconds, cumulative buckets)"""
+    from devlog.cli.metrics import all_histograms
+
+    families = {}
+    for name, h in sorted(all_histograms().items()):
+        kind, _, command = name.partition('.')
+        if kind == 'command':
+            metric, labels = 'devlog_command_duration_seconds', f'command="{_label(command)}"'
+        elif kind == 'command_cpu':
+            metric, labels = 'devlog_command_cpu_seconds', f'command="{_label(command)}"'
+        else:
+            metric, labels = f"devlog_{kind}_latency_seconds", ''
+        families.setdefault(metric, []).append((labels, h))
+
+    lines = []
+    for metric, series in families.items():
+        lines.append(f"# TYPE {metric} histogram")
+        for labels, h in series:
+            sep = ',' if labels else ''
+            cumulative = 0
+            for bound, count in zip(h.bounds, h.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound / 1000)
+                lines.append(f'{metric}_bucket{{{labels}{sep}le="{le}"}} {cumulative}')
+            suffix = f"{{{labels}}}" if labels else ''
+            lines.append(f"{metric}_sum{suffix} {h.total_ms / 1000:.6f}")
+            lines.append(f"{metric}_count{suffix} {h.count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """Atomically (re)write a node-exporter textfile (*.prom)"""
+    path = Path(path)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
@@ -0,0 +1,153 @@
+"""
+Command jobs - every command line runs as a job on its own thread
+
+The interactive loop (DevLogShell.cmdloop_async) awaits the foreground job
+while prompt_toolkit keeps the terminal alive; a trailing `&` leaves the job
+running in the background so the prompt comes straight back.
+
+Cancellation is cooperative: run_command puts the job's CancelToken on the
+CommandContext (ctx.cancel_token) together with ctx.progress(done, total,
+label). Long-running commands call ctx.cancel_token.check() between batches
+and report progress, which the prompt's bottom toolbar shows.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+
+
+class JobCancelled(Exception):
+    """Raised by CancelToken.check() once the job was asked to stop"""
+
+
+class CancelToken:
+    """Thread-safe cancellation flag shared by a job and its command"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self):
+        self._event.set()
+
+    def check(self):
+        if self._event.is_set():
+            raise JobCancelled()
+
+    def wait(self, timeout=None):
+        return self._event.wait(timeout)
+
+
+class Job:
+    """One command line running on a daemon thread"""
+
+    def __init__(self, job_id, text, background=False):
+        self.id = job_id
+        self.text = text
+        self.background = background
+        self.token = CancelToken()
+        self.future = Future()
+        self.started = time.time()
+        self.finished = None
+        self.progress = None        # (done, total or None, label)
+        self.announced = False
+
+    def update(self, done, total=None, label=None):
+        """Progress hook handed to commands as ctx.progress"""
+        self.progress = (done, total, label)
+
+    def cancel(self):
+        self.token.cancel()
+
+    @property
+    def done(self):
+        return self.future.done()
+
+    @property
+    def state(self):
+        if not self.future.done():
+            return 'cancelling' if self.token.cancelled else 'running'
+        error = self.future.exception()
+        if error is None:
+            return 'done'
+        return 'cancelled' if isinstance(error, JobCancelled) else 'failed'
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.time()) - self.started
+
+    def describe_progress(self):
+        if self.progress is None:
+            return ''
+        done, total, label = self.progress
+        text = f"{done / total:.0%}" if total else f"{done:,}"
+        return f"{label} {text}" if label else text
+
+    def _run(self, fn):
+        if not self.future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(self)
+        except BaseException as e:
+            self.finished = time.time()
+            self.future.set_exception(e)
+        else:
+            self.finished = time.time()
+            self.future.set_result(result)
+
+
+class JobManager:
+    """Numbered jobs, like a shell's job table"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def submit(self, text, fn, background=False):
+        """Start fn(job) on a new thread and return the Job"""
+        with self._lock:
+            job = Job(self._next_id, text, background=background)
+            self._jobs[job.id] = job
+            self._next_id += 1
+        thread = threading.Thread(target=job._run, args=(fn,),
+                                  name=f"devlog-job-{job.id}", daemon=True)
+        thread.start()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def running(self):
+        return [job for job in self.list() if not job.done]
+
+    def latest(self, background_only=True):
+        """Most recent unfinished job (background ones by default)"""
+        for job in reversed(self.running()):
+            if job.background or not background_only:
+                return job
+        return None
+
+    def cancel_all(self):
+        for job in self.running():
+            job.cancel()
+
+    def finished_background(self):
+        """Background jobs that finished since the last call (to announce)"""
+        finished = []
+        with self._lock:
+            for job_id, job in list(self._jobs.items()):
+                if job.done and job.background and not job.announced:
+                    job.announced = True
+                    finished.append(job)
+                if job.done and (job.announced or not job.background):
+                    del self._jobs[job_id]
+        return finished
@@ -0,0 +1,115 @@
+"""
+Lightweight latency histograms
+
+Fixed log-spaced buckets (in milliseconds) so recording is a bisect and an
+increment, cheap enough to sit on the completion and command paths.
+
+Each histogram keeps two views of the same samples: cumulative totals
+since start (or the last reset), which is what Prometheus expects from a
+histogram, and a rolling window of the last WINDOW seconds for the
+`metrics` command, kept as SLOTS time slices that age out as a whole.
+"""
+
+import bisect
+import threading
+import time
+from collections import deque
+
+
+# Upper bounds in ms; the last bucket catches everything above
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 16, 25, 50, 100, 250, 500, 1000, 2500, 5000, float('inf'))
+WINDOW = 300.0      # seconds covered by window()
+SLOTS = 10          # slices of the window (it moves in WINDOW / SLOTS steps)
+
+
+class Distribution:
+    """Bucket counts with count/sum/max, and what can be read off them"""
+    
+    def __init__(self, bounds=BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def add(self, bucket, ms):
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+    
+    def merge(self, other):
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        return self
+    
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile (0-100)"""
+        if not self.count:
+            return 0.0
+        target = self.count * p / 100
+        seen = 0
+        for bound, n in zip(self.bounds, self.counts):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max_ms)
+        return self.max_ms
+    
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class LatencyHistogram(Distribution):
+    """Cumulative bucketed latency distribution plus a rolling window of it"""
+    
+    def __init__(self, name, bounds=BUCKETS_MS, window=WINDOW, slots=SLOTS):
+        super().__init__(bounds)
+        self.name = name
+        self.window_s = window
+        self._step = window / slots
+        self._slots = deque(maxlen=slots)   # (slice start, Distribution), oldest first
+        self._lock = threading.Lock()
+    
+    def record(self, ms, now=None):
+        now = time.monotonic() if now is None else now
+        start = now - now % self._step
+        bucket = bisect.bisect_left(self.bounds, ms)
+        with self._lock:
+            if not self._slots or self._slots[-1][0] != start:
+                self._slots.append((start, Distribution(self.bounds)))
+            self._slots[-1][1].add(bucket, ms)
+            self.add(bucket, ms)
+    
+    def window(self, now=None):
+        """Distribution of the samples recorded in the last window_s seconds"""
+        now = time.monotonic() if now is None else now
+        recent = Distribution(self.bounds)
+        with self._lock:
+            for start, slot in self._slots:
+                if start >= now - self.window_s:
+                    recent.merge(slot)
+        return recent
+    
+    def reset(self):
+        with self._lock:
+            Distribution.__init__(self, self.bounds)
+            self._slots.clear()
+
+
+_histograms = {}
+
+
+def histogram(name):
+    """Process-wide histogram by name (created on first use)"""
+    h = _histograms.get(name)
+    if h is None:
+        h = _histograms.setdefault(name, LatencyHistogram(name))
+    return h
+
+
+def all_histograms():
+    return dict(_histograms)
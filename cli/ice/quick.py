@@ -0,0 +1,337 @@
+"""
+Quick analysis - streaming stats for main(file_path=...)
+"""
+
+import glob
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+PROGRESS_INTERVAL = 0.5  # seconds between progress refreshes
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024  # split files bigger than this
+
+
+def _field(event, name, default=None):
+    """Read a field from a parsed event (dict or object)"""
+    if isinstance(event, dict):
+        return event.get(name, default)
+    return getattr(event, name, default)
+
+
+def _event_bytes(event):
+    """Size of the raw line behind an event, 0 if the parser dropped it"""
+    for name in ('raw', 'raw_line', 'line'):
+        raw = _field(event, name)
+        if isinstance(raw, (str, bytes)):
+            return len(raw) + 1
+    return 0
+
+
+class StreamingStats:
+    """
+    Incremental accumulators for the quick-analysis summary.
+
+    Produces the same keys StatsCalculator.calculate_stats exposes to
+    main() (total_events, level_distribution, event_type_distribution)
+    without ever holding the events.
+    """
+
+    __slots__ = ('total_events', 'levels', 'event_types', 'bytes_read')
+
+    def __init__(self):
+        self.total_events = 0
+        self.levels = Counter()
+        self.event_types = Counter()
+        self.bytes_read = 0
+
+    def add(self, event):
+        self.total_events += 1
+        self.levels[_field(event, 'level')] += 1
+        self.event_types[_field(event, 'event_type')] += 1
+        self.bytes_read += _event_bytes(event)
+
+    def consume(self, events, progress=None):
+        """Fold an event iterator into the accumulators"""
+        for event in events:
+            self.add(event)
+            if progress is not None:
+                progress.tick(self)
+        return self
+
+    def merge(self, other):
+        """Fold partial stats from another worker into this one"""
+        self.total_events += other.total_events
+        self.levels.update(other.levels)
+        self.event_types.update(other.event_types)
+        self.bytes_read += other.bytes_read
+        return self
+
+    def to_dict(self):
+        return {
+            'total_events': self.total_events,
+            'level_distribution': dict(self.levels),
+            'event_type_distribution': dict(self.event_types),
+        }
+
+
+class ProgressReporter:
+    """Throttled events/sec + bytes read line on a rich status spinner"""
+
+    def __init__(self, status, total_bytes=0):
+        self.status = status
+        self.total_bytes = total_bytes
+        self.started = time.perf_counter()
+        self._next = self.started + PROGRESS_INTERVAL
+
+    def tick(self, stats):
+        # Cheap check first: only every 1024 events look at the clock
+        if stats.total_events & 1023:
+            return
+        now = time.perf_counter()
+        if now < self._next:
+            return
+        self._next = now + PROGRESS_INTERVAL
+        self.status.update(self.render(stats, now))
+
+    def render(self, stats, now=None):
+        elapsed = max((now or time.perf_counter()) - self.started, 1e-9)
+        rate = stats.total_events / elapsed
+        line = f"[yellow]{stats.total_events:,} events | {rate:,.0f} ev/s"
+        if stats.bytes_read:
+            line += f" | {format_bytes(stats.bytes_read)}"
+            if self.total_bytes:
+                line += f" / {format_bytes(self.total_bytes)}"
+        return line + "[/yellow]"
+
+
+def format_bytes(n):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} TB"
+
+
+def expand_paths(patterns):
+    """Expand globs, keep plain paths as given, drop duplicates"""
+    if isinstance(patterns, (str, os.PathLike)):
+        patterns = [patterns]
+    paths = []
+    seen = set()
+    for pattern in patterns:
+        pattern = os.path.expanduser(str(pattern))
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in seen and not os.path.isdir(path):
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def _new_processor():
+    from devlog.core.parsing.processor import LogProcessor
+    return LogProcessor()
+
+
+def iter_source(source):
+    """
+    Parsed events for a work unit: a path, or a (path, start, end) range.
+
+    Ranges are read through a private memory mapping (reader.py); whole
+    files keep the processor's own buffered reader, which is faster for a
+    single sequential pass.
+    """
+    from devlog.cli.compression import GZIP, detect, member_lines, open_lines
+
+    processor = _new_processor()
+    path = source[0] if isinstance(source, tuple) else source
+    kind = detect(path)
+    if kind is not None:
+        # Compressed: stream-decompress into the line parser, no temp files
+        if not hasattr(processor, 'process_lines'):
+            raise ValueError(f"{kind}-compressed input needs LogProcessor.process_lines")
+        if isinstance(source, tuple) and kind == GZIP:
+            return processor.process_lines(member_lines(*source), source=path)
+        return processor.process_lines(open_lines(path, kind), source=path)
+    if isinstance(source, tuple):
+        from devlog.cli.reader import iter_lines
+        _, start, end = source
+        return processor.process_lines(iter_lines(path, start, end), source=path)
+    processor.add_file(source)
+    return processor.process_all()
+
+
+def split_ranges(path, chunk_size):
+    """Byte ranges of ~chunk_size, each ending right after a newline"""
+    from devlog.cli.reader import split_ranges as mapped_ranges
+    return mapped_ranges(path, chunk_size)
+
+
+def supports_ranges():
+    """True when the processor can parse lines it did not open itself"""
+    return hasattr(_new_processor(), 'process_lines')
+
+
+def supports_tail(path):
+    """Appended bytes can be parsed on their own (plain text only)"""
+    from devlog.cli.compression import detect
+    return supports_ranges() and detect(path) is None
+
+
+def plan_work(paths, chunk_size):
+    """
+    One unit per file; big files become byte ranges when the processor
+    supports it.
+    """
+    splittable = chunk_size and supports_ranges()
+    from devlog.cli.compression import GZIP, detect, member_ranges
+
+    units = []
+    for path in paths:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        if splittable and size > chunk_size:
+            kind = detect(path)
+            if kind is None:
+                units.extend(split_ranges(path, chunk_size))
+            elif kind == GZIP:
+                # Multi-member gzip: one unit per run of members
+                units.extend(member_ranges(path, size, chunk_size))
+            else:
+                units.append(path)
+        else:
+            units.append(path)
+    return units
+
+
+def _analyze_unit(source):
+    """Process-pool worker: parse one unit, return only its partial stats"""
+    return StreamingStats().consume(iter_source(source))
+
+
+def _file_stat(path):
+    """(size, mtime) before parsing - what a cache entry is recorded against"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 0, 0.0
+    return st.st_size, st.st_mtime
+
+
+def analyze_file(file_path, console, cache=None):
+    """Stream a single file through LogProcessor into StreamingStats"""
+    from devlog.cli.cache import FRESH, APPENDED
+
+    total_bytes, mtime = _file_stat(file_path)
+    entry = cache.lookup(file_path) if cache is not None else None
+
+    if entry is not None and entry.state == FRESH:
+        console.print("[dim]✓ Cache hit[/dim]")
+        return cache.load_stats(entry)
+
+    source = file_path
+    stats = StreamingStats()
+    if entry is not None and entry.state == APPENDED and supports_tail(file_path):
+        # Only the appended tail needs parsing
+        console.print(f"[dim]Cache: parsing {format_bytes(total_bytes - entry.size)} appended[/dim]")
+        stats = cache.load_stats(entry)
+        source = (file_path, entry.size, total_bytes)
+    elif cache is not None and supports_tail(file_path):
+        # Parse exactly the bytes the cache entry will claim
+        source = (file_path, 0, total_bytes)
+
+    before = stats.total_events
+    from devlog.cli.compression import detect
+    with console.status("[yellow]Parsing...[/yellow]") as status:
+        # Decompressed bytes are not comparable with the on-disk size
+        progress = ProgressReporter(status, total_bytes if detect(file_path) is None else 0)
+        tail = StreamingStats().consume(iter_source(source), progress)
+    stats.merge(tail)
+
+    if cache is not None:
+        cache.store(file_path, stats, total_bytes, mtime)
+
+    elapsed = time.perf_counter() - progress.started
+    console.print(f"[dim]{progress.render(tail)} in {elapsed:.2f}s[/dim]")
+    if before:
+        console.print(f"[dim]+{tail.total_events} new events on top of {before} cached[/dim]")
+    return stats
+
+
+def analyze_files(paths, console, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, cache=None):
+    """
+    Parse many files (or ranges of big ones) in a process pool and merge.
+    A file with a unit that fails is reported and left out of the totals.
+    """
+    from devlog.cli.cache import FRESH, APPENDED
+
+    stamps = {path: _file_stat(path) for path in paths}
+    units = plan_work(paths, chunk_size)
+    if len(units) <= 1 or workers == 1:
+        stats = StreamingStats()
+        for path in paths:
+            stats.merge(analyze_file(path, console, cache=cache))
+        return stats
+
+    stats = StreamingStats()
+    per_file = {}  # path -> stats of a file being parsed (cached part + new units)
+    pending = []
+    for path in paths:
+        entry = cache.lookup(path) if cache is not None else None
+        if entry is not None and entry.state == FRESH:
+            stats.merge(cache.load_stats(entry))
+        elif entry is not None and entry.state == APPENDED and supports_tail(path):
+            per_file[path] = cache.load_stats(entry)
+            pending.append((path, entry.size, stamps[path][0]))
+        else:
+            per_file[path] = StreamingStats()
+            pending.extend(u for u in units if (u[0] if isinstance(u, tuple) else u) == path)
+    units = pending
+
+    total_bytes = sum(size for size, _ in stamps.values())
+    failed = {}
+    seen = StreamingStats().merge(stats)   # progress only: includes files that fail later
+    with console.status("[yellow]Parsing...[/yellow]") as status:
+        progress = ProgressReporter(status, total_bytes)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_analyze_unit, unit): unit for unit in units}
+            for done, future in enumerate(as_completed(futures), 1):
+                unit = futures[future]
+                path = unit[0] if isinstance(unit, tuple) else unit
+                try:
+                    result = future.result()
+                except Exception as e:
+                    failed.setdefault(path, e)
+                    continue
+                seen.merge(result)
+                per_file[path].merge(result)
+                status.update(f"{progress.render(seen)} [dim]({done}/{len(units)} units)[/dim]")
+
+    # A file counts only when every unit of it parsed: no partial totals
+    for path, file_stats in per_file.items():
+        if path in failed:
+            continue
+        stats.merge(file_stats)
+        if cache is not None:
+            cache.store(path, file_stats, *stamps[path])
+
+    elapsed = time.perf_counter() - progress.started
+    console.print(f"[dim]{progress.render(seen)} in {elapsed:.2f}s "
+                  f"({len(paths)} files, {len(units)} units parsed)[/dim]")
+    for path, error in failed.items():
+        console.print(f"[red]✗ {path}: {error} - file left out of the summary[/red]")
+    return stats
+
+
+def print_summary(console, stats):
+    """Print the summary block shown by the quick-analysis mode"""
+    if isinstance(stats, StreamingStats):
+        stats = stats.to_dict()
+    console.print(f"\n[bold]Summary:[/bold]")
+    console.print(f"  Events: {stats['total_events']}")
+    console.print(f"  Levels: {stats.get('level_distribution', {})}")
+    console.print(f"  Types: {stats.get('event_type_distribution', {})}")
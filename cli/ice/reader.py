@@ -0,0 +1,112 @@
+"""
+Memory-mapped reader for quick analysis
+
+MappedFile maps a log read-only and cuts it into ~4 MB blocks on newline
+boundaries, found with mmap.rfind/find directly on the mapping (no
+readline buffering, no per-line syscalls). A block is a memoryview of the
+mapping, decoded straight from the mapped pages and split in C - no bytes
+copy of the block is made. Byte ranges from
+split_ranges are plain (path, start, end) tuples, so worker processes map
+the file themselves instead of receiving lines through a pipe.
+"""
+
+import mmap
+import os
+
+
+BLOCK_SIZE = 4 * 1024 * 1024   # bytes handed to split() at a time
+PAGE = mmap.ALLOCATIONGRANULARITY
+_DONTNEED = getattr(mmap, 'MADV_DONTNEED', None)
+
+
+class MappedFile:
+    """Read-only mapping of one file (empty files map to nothing)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        self.map = None
+        if self.size:
+            self.map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            if hasattr(self.map, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+                self.map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def line_end(self, pos):
+        """Offset just past the newline at/after pos (or the file size)"""
+        if self.map is None or pos >= self.size:
+            return self.size
+        nl = self.map.find(b'\n', pos)
+        return self.size if nl < 0 else nl + 1
+
+    def blocks(self, start=0, end=None, block_size=BLOCK_SIZE):
+        """
+        (offset, memoryview) blocks of [start, end) cut after a newline.
+
+        A block is a view of the mapping, released when the generator moves
+        on: use it (or copy it) before asking for the next one. Pages behind
+        the cursor are dropped from this process (MADV_DONTNEED
+        on a read-only mapping only unmaps them; the page cache keeps them),
+        so RSS stays at about one block whatever the file size.
+        """
+        if self.map is None:
+            return
+        end = self.size if end is None else min(end, self.size)
+        released = start - start % PAGE
+        pos = start
+        with memoryview(self.map) as view:
+            while pos < end:
+                cut = min(pos + block_size, end)
+                if cut < end:
+                    nl = self.map.rfind(b'\n', pos, cut)
+                    cut = nl + 1 if nl >= 0 else self.line_end(cut)
+                with view[pos:cut] as block:
+                    yield pos, block
+                pos = cut
+                page = pos - pos % PAGE
+                if _DONTNEED is not None and page > released:
+                    self.map.madvise(_DONTNEED, released, page - released)
+                    released = page
+
+    def lines(self, start=0, end=None):
+        """Decoded lines of [start, end): one C-level decode + split per block"""
+        for _offset, block in self.blocks(start, end):
+            text = str(block, 'utf-8', 'replace')
+            lines = text.split('\n')
+            if not lines[-1]:
+                lines.pop()  # block ends with a newline
+            if '\r' in text:
+                lines = [line.rstrip('\r') for line in lines]
+            yield from lines
+
+
+def iter_lines(path, start=0, end=None):
+    """Lines of a file (range) through a private mapping, closed when exhausted"""
+    with MappedFile(path) as mapped:
+        yield from mapped.lines(start, end)
+
+
+def split_ranges(path, chunk_size):
+    """Byte ranges of ~chunk_size, each ending right after a newline"""
+    with MappedFile(path) as mapped:
+        ranges = []
+        start = 0
+        while start < mapped.size:
+            target = start + chunk_size
+            end = mapped.line_end(target - 1) if target < mapped.size else mapped.size
+            ranges.append((path, start, end))
+            start = end
+        return ranges
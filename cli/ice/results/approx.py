@@ -0,0 +1,159 @@
+"""
+Approximate summary of a ResultSet - the `--approx` mode of stats/top/insights
+
+Same questions as ResultSummary (counts per event/status, distinct event
+types, confidence/severity) answered from fixed-size sketches: HyperLogLog
+for distinct events, count-min + heavy hitters for the frequencies and KLL
+for the quantiles. Memory stays flat however many rows the session holds,
+new rows are folded in incrementally, and summaries of separate result sets
+(files, workers) merge().
+
+Categorical columns are already dictionary-encoded, so each batch of rows
+is reduced to (value, count) pairs before touching the sketches; only the
+numeric columns feed every value, and those go in as sorted batches.
+"""
+
+from collections import Counter
+
+from devlog.cli.sketches import HyperLogLog, CountMinSketch, KLLSketch, hash64
+from .backend import numpy
+from .resultset import as_result_set
+
+
+QUANTILES = (0.5, 0.9, 0.99)
+BATCH = 1 << 20
+
+
+class ApproxSummary:
+    """Sketch-backed counterpart of ResultSummary"""
+
+    def __init__(self):
+        self.size = 0                  # rows of the result set folded in
+        self.total = 0
+        self.confidence_sum = 0.0      # exact: sums are as cheap as sketches
+        self.severity_sum = 0.0
+        self.distinct = HyperLogLog()
+        self.event_counts = CountMinSketch()
+        self.status_counts = CountMinSketch(width=256, top=16)
+        self.confidence = KLLSketch()
+        self.severity = KLLSketch()
+
+    # -- building ------------------------------------------------------
+
+    def add(self, event=None, status=None, confidence=None, severity=None):
+        """Fold in one row (streaming sources)"""
+        self.total += 1
+        self.distinct.add_hash(hash64(event))
+        self.event_counts.add(event)
+        self.status_counts.add(status)
+        if confidence is not None:
+            self.confidence_sum += confidence
+            self.confidence.update(confidence)
+        if severity is not None:
+            self.severity_sum += severity
+            self.severity.update(severity)
+
+    def extend(self, rs):
+        """Fold in rows [self.size, len(rs)) of a ResultSet"""
+        start, end = self.size, len(rs)
+        for lo in range(start, end, BATCH):
+            self._fold(rs, lo, min(lo + BATCH, end))
+        self.size = end
+        return self
+
+    def _fold(self, rs, start, end):
+        self.total += end - start
+        for name, sketch in (('event', self.event_counts), ('status', self.status_counts)):
+            for value, count in _counts(rs, name, start, end).items():
+                sketch.add(value, count)
+                if name == 'event':
+                    self.distinct.add_hash(hash64(value))
+        for name, sketch in (('confidence', self.confidence), ('severity', self.severity)):
+            values = rs.floats(name)[start:end]
+            np = numpy()
+            if np is not None:
+                column = np.frombuffer(values, dtype=np.float64)
+                column = column[~np.isnan(column)]
+                total = float(column.sum())
+                values = column.tolist()
+            else:
+                values = [v for v in values if v == v]
+                total = sum(values)
+            if name == 'confidence':
+                self.confidence_sum += total
+            else:
+                self.severity_sum += total
+            sketch.update_many(values)
+
+    def merge(self, other):
+        self.total += other.total
+        self.confidence_sum += other.confidence_sum
+        self.severity_sum += other.severity_sum
+        self.distinct.merge(other.distinct)
+        self.event_counts.merge(other.event_counts)
+        self.status_counts.merge(other.status_counts)
+        self.confidence.merge(other.confidence)
+        self.severity.merge(other.severity)
+        return self
+
+    # -- ResultSummary-compatible reads ---------------------------------
+
+    @property
+    def events(self):
+        return Counter(dict(self.event_counts.most_common()))
+
+    @property
+    def statuses(self):
+        return Counter(dict(self.status_counts.most_common()))
+
+    @property
+    def distinct_events(self):
+        return len(self.distinct)
+
+    @property
+    def confidence_avg(self):
+        return self.confidence_sum / self.total if self.total else 0.0
+
+    @property
+    def severity_avg(self):
+        return self.severity_sum / self.total if self.total else 0.0
+
+    def rate(self, status):
+        return self.status_counts.estimate(status) / self.total if self.total else 0.0
+
+    def quantiles(self, name, qs=QUANTILES):
+        sketch = self.confidence if name == 'confidence' else self.severity
+        return sketch.quantiles(qs)
+
+    def error_bounds(self):
+        """Human-readable guarantee of each estimate"""
+        return {
+            'distinct': f"±{self.distinct.error_bound():.1%} (1 std err)",
+            'counts': (f"+{self.event_counts.error_bound() * self.total:,.0f} max overcount "
+                       f"({self.event_counts.confidence():.1%} conf.)"),
+            'quantiles': f"±{self.confidence.error_bound():.1%} of rank (99% conf.)",
+        }
+
+
+def _counts(rs, name, start, end):
+    codes, values = rs.codes(name)
+    np = numpy()
+    if np is not None:
+        chunk = np.frombuffer(codes, dtype=np.int32)[start:end]
+        counts = np.bincount(chunk, minlength=len(values))
+        return {values[c]: int(counts[c]) for c in np.flatnonzero(counts)}
+    per_code = Counter(codes[start:end])
+    return {values[c]: n for c, n in per_code.items()}
+
+
+def _build(rs):
+    return ApproxSummary().extend(rs)
+
+
+def _update(summary, rs):
+    return summary.extend(rs)
+
+
+def approx_summary(results):
+    """ApproxSummary of a ResultSet, kept up to date as rows are appended"""
+    return as_result_set(results).derived('approx', _build, _update)
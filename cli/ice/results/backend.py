@@ -0,0 +1,22 @@
+"""
+Optional NumPy backend
+
+NumPy costs ~100 ms to import, so it is loaded on first use by an
+aggregation rather than when the shell starts.
+"""
+
+_numpy = None
+_checked = False
+
+
+def numpy():
+    """The numpy module if installed, else None"""
+    global _numpy, _checked
+    if not _checked:
+        try:
+            import numpy as np
+            _numpy = np
+        except ImportError:  # optional dependency
+            _numpy = None
+        _checked = True
+    return _numpy
@@ -0,0 +1,365 @@
+"""
+Streaming export of a result set - JSON Lines, CSV or columnar
+
+Rows go from the result set's columns to the output file a chunk at a
+time: the query (if any) is evaluated per chunk (Query.chunks), only the
+chunk's cells are decoded, and the encoded chunk is written - through
+gzip / xz when asked - before the next one is read. Memory stays at one
+chunk whatever the size of the export.
+
+The columnar format is a stream of self-describing row groups, so it can
+be written and read sequentially (also compressed):
+
+    MAGIC + format version                                     (16 bytes)
+    per row group:  uint32 header length, JSON header, blocks
+        header: {"rows": n, "columns": [{"name", "kind", "blocks": [lengths]}]}
+        kind    blocks
+        dict    int32 index per row + value list of the group's distinct values
+        floats  float64 per row (NaN = missing; timestamp as epoch seconds),
+                optionally + value list of kept originals (None = use float)
+        values  value list (type bytes, uint64 ends, data - see snapshot.py)
+    uint32 0, then uint32 length + JSON summary {"rows", "columns"}
+
+All numbers are little-endian. read_columnar() yields each row group as
+{column: list}.
+"""
+
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+
+from .backend import numpy
+from .query import CHUNK, Query
+from .resultset import CATEGORICAL, NUMERIC, TIMESTAMP, as_result_set, format_timestamp
+from .snapshot import MappedValues, pack_values
+
+
+FORMATS = {'jsonl': '.jsonl', 'csv': '.csv', 'columnar': '.dlc'}
+COMPRESSORS = {
+    'gzip': ('.gz', lambda f: gzip.GzipFile(fileobj=f, mode='wb', compresslevel=6)),
+    'xz': ('.xz', lambda f: lzma.LZMAFile(f, mode='wb', preset=3)),
+}
+COLUMNAR_MAGIC = b"DLOGCOLS"
+COLUMNAR_VERSION = 1
+COLUMNAR_HEADER = struct.Struct("<8sII")
+U32 = struct.Struct("<I")
+WRITE_BUFFER = 1024 * 1024
+
+
+def compression_for(path, compression=None):
+    """Explicit compression, else inferred from the file suffix (.gz / .xz)"""
+    if compression:
+        if compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression: {compression} (gzip, xz)")
+        return compression
+    suffix = Path(path).suffix
+    for name, (ext, _) in COMPRESSORS.items():
+        if suffix == ext:
+            return name
+    return None
+
+
+def default_path(fmt, compression=None):
+    stamp = time.strftime('%Y%m%d_%H%M%S')
+    ext = COMPRESSORS[compression][0] if compression else ''
+    return Path(f"devlog_export_{stamp}{FORMATS[fmt]}{ext}")
+
+
+class ExportStats:
+    """Rows / bytes written and how fast"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.rows = 0
+        self.raw_bytes = 0      # before compression
+        self.elapsed = 0.0
+
+    @property
+    def file_bytes(self):
+        return self.path.stat().st_size
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def bytes_per_sec(self):
+        return self.raw_bytes / self.elapsed if self.elapsed else 0.0
+
+
+class _Counting(io.RawIOBase):
+    """Byte counter between the encoder and the compressor"""
+
+    def __init__(self, target):
+        self.target = target
+        self.count = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        n = self.target.write(data)
+        self.count += len(data)
+        return n
+
+
+# -- column chunks -----------------------------------------------------
+
+def _pick(buffer, rows, dtype):
+    np = numpy()
+    if np is not None and not isinstance(rows, list):
+        return np.frombuffer(buffer, dtype=dtype)[rows]
+    return [buffer[i] for i in rows]
+
+
+def _tolist(values):
+    return values.tolist() if hasattr(values, 'tolist') else values
+
+
+def column_chunk(rs, name, rows, memo):
+    """Python values of one column for the given rows (None when missing)"""
+    values = _parsed_chunk(rs, name, rows, memo)
+    raw = rs.raw(name)
+    if raw is not None:
+        for k, i in enumerate(_tolist(rows)):
+            if raw[i] is not None:
+                values[k] = raw[i]
+    return values
+
+
+def _parsed_chunk(rs, name, rows, memo):
+    if name in CATEGORICAL:
+        codes, values = rs.codes(name)
+        return [values[c] for c in _tolist(_pick(codes, rows, 'int32'))]
+    if name in NUMERIC:
+        return [None if v != v else v for v in _tolist(_pick(rs.floats(name), rows, 'float64'))]
+    if name == TIMESTAMP:
+        out = []
+        for epoch in _tolist(_pick(rs.floats(TIMESTAMP), rows, 'float64')):
+            text = memo.get(epoch)
+            if text is None:
+                text = format_timestamp(epoch)
+                if epoch == epoch:
+                    memo[epoch] = text
+            out.append(text)
+        return out
+    col = rs.objects(name)
+    return [col[i] for i in _tolist(rows)]
+
+
+# -- encoders ----------------------------------------------------------
+
+class JsonLinesEncoder:
+
+    def __init__(self, names, out):
+        self.names = names
+        self.out = out
+        self.dumps = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str).encode
+
+    def write(self, rs, rows, memo):
+        columns = [column_chunk(rs, name, rows, memo) for name in self.names]
+        dumps, names = self.dumps, self.names
+        lines = []
+        for values in zip(*columns):
+            lines.append(dumps({k: v for k, v in zip(names, values) if v is not None}))
+        self.out.write(('\n'.join(lines) + '\n').encode('utf-8'))
+
+    def close(self):
+        pass
+
+
+class CsvEncoder:
+
+    def __init__(self, names, out):
+        self.names = names
+        self.text = io.TextIOWrapper(out, encoding='utf-8', newline='', write_through=False)
+        self.writer = csv.writer(self.text)
+        self.writer.writerow(names)
+
+    def write(self, rs, rows, memo):
+        columns = [column_chunk(rs, name, rows, memo) for name in self.names]
+        for values in columns:
+            # Nested values (lists, dicts) as JSON rather than Python repr
+            if any(isinstance(v, (list, dict)) for v in values):
+                values[:] = [json.dumps(v, default=str) if isinstance(v, (list, dict)) else v for v in values]
+        self.writer.writerows(zip(*columns))
+
+    def close(self):
+        self.text.flush()
+        self.text.detach()
+
+
+class ColumnarEncoder:
+
+    def __init__(self, names, out):
+        self.names = names
+        self.out = out
+        self.rows = 0
+        out.write(COLUMNAR_HEADER.pack(COLUMNAR_MAGIC, COLUMNAR_VERSION, 0))
+
+    def _dict(self, rs, name, rows):
+        codes, values = rs.codes(name)
+        picked = _pick(codes, rows, 'int32')
+        np = numpy()
+        if np is not None and not isinstance(picked, list):
+            distinct, index = np.unique(picked, return_inverse=True)
+            index = index.astype('<i4').tobytes()
+            distinct = distinct.tolist()
+        else:
+            local = {}
+            index = array('i', (local.setdefault(c, len(local)) for c in picked))
+            if sys.byteorder != 'little':
+                index.byteswap()
+            distinct = list(local)
+        return [index] + list(pack_values([values[c] for c in distinct]))
+
+    def _floats(self, buffer, rows):
+        picked = _pick(buffer, rows, 'float64')
+        if hasattr(picked, 'astype'):
+            return [picked.astype('<f8').tobytes()]
+        data = array('d', picked)
+        if sys.byteorder != 'little':
+            data.byteswap()
+        return [data]
+
+    def write(self, rs, rows, memo):
+        header, blocks = [], []
+        for name in self.names:
+            if name in CATEGORICAL:
+                kind, parts = 'dict', self._dict(rs, name, rows)
+            elif name in NUMERIC or name == TIMESTAMP:
+                kind, parts = 'floats', self._floats(rs.floats(name), rows)
+                raw = rs.raw(name)
+                if raw is not None:
+                    parts += pack_values(raw[i] for i in _tolist(rows))
+            else:
+                col = rs.objects(name)
+                kind, parts = 'values', list(pack_values(col[i] for i in _tolist(rows)))
+            header.append({'name': name, 'kind': kind,
+                           'blocks': [len(memoryview(p).cast('B')) for p in parts]})
+            blocks += parts
+        encoded = json.dumps({'rows': len(rows), 'columns': header}).encode('utf-8')
+        self.out.write(U32.pack(len(encoded)) + encoded)
+        for part in blocks:
+            self.out.write(part)
+        self.rows += len(rows)
+
+    def close(self):
+        summary = json.dumps({'rows': self.rows, 'columns': self.names}).encode('utf-8')
+        self.out.write(U32.pack(0) + U32.pack(len(summary)) + summary)
+
+
+ENCODERS = {'jsonl': JsonLinesEncoder, 'csv': CsvEncoder, 'columnar': ColumnarEncoder}
+
+
+# -- pipeline ----------------------------------------------------------
+
+def export(results, path, fmt, query=None, within=None, compression=None,
+           chunk=CHUNK, progress=None, cancel=None):
+    """
+    Stream the rows of results matching query (and within, a Selection)
+    to path in fmt. The file is written under a temporary name and renamed
+    when complete. progress(done, total, label) is called per chunk and
+    cancel.check() between chunks. Returns ExportStats.
+    """
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unknown export format: {fmt} ({', '.join(ENCODERS)})")
+    rs = as_result_set(results)
+    path = Path(path)
+    compression = compression_for(path, compression)
+    names = rs.columns()
+    total = len(rs) if not query and within is None else None
+    stats = ExportStats(path)
+    started = time.perf_counter()
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'wb') as f:
+            sink = COMPRESSORS[compression][1](f) if compression else f
+            counter = _Counting(sink)
+            out = io.BufferedWriter(counter, WRITE_BUFFER)
+            encoder = ENCODERS[fmt](names, out)
+            memo = {}
+            for rows in (query or Query()).chunks(rs, within=within, size=chunk):
+                if cancel is not None:
+                    cancel.check()
+                if len(rows):
+                    encoder.write(rs, rows, memo)
+                    stats.rows += len(rows)
+                if len(memo) > chunk:
+                    memo.clear()
+                if progress is not None:
+                    progress(stats.rows, total, f"{stats.rows:,} rows exported")
+            encoder.close()
+            out.flush()
+            if sink is not f:
+                sink.close()
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    stats.raw_bytes = counter.count
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def read_columnar(path):
+    """Row groups of a columnar export ({column: list}), also when compressed"""
+    from devlog.cli.compression import detect, OPENERS
+
+    kind = detect(path)
+    with (OPENERS[kind](path, 'rb') if kind else open(path, 'rb')) as f:
+        magic, version, _ = COLUMNAR_HEADER.unpack(f.read(COLUMNAR_HEADER.size))
+        if magic != COLUMNAR_MAGIC:
+            raise ValueError(f"{path}: not a columnar export")
+        if version != COLUMNAR_VERSION:
+            raise ValueError(f"{path}: unsupported columnar format {version}")
+        while True:
+            (length,) = U32.unpack(f.read(U32.size))
+            if not length:
+                return
+            header = json.loads(f.read(length))
+            group = {}
+            for column in header['columns']:
+                parts = [f.read(n) for n in column['blocks']]
+                group[column['name']] = _decode_column(column['kind'], parts)
+            yield group
+
+
+def _decode_column(kind, parts):
+    if kind == 'floats':
+        data = array('d')
+        data.frombytes(parts[0])
+        if sys.byteorder != 'little':
+            data.byteswap()
+        values = [None if v != v else v for v in data]
+        if len(parts) > 1:
+            for k, raw in enumerate(_values(parts)):
+                if raw is not None:
+                    values[k] = raw
+        return values
+    values = _values(parts)
+    if kind == 'values':
+        return list(values)
+    index = array('i')
+    index.frombytes(parts[0])
+    if sys.byteorder != 'little':
+        index.byteswap()
+    distinct = list(values)
+    return [distinct[i] for i in index]
+
+
+def _values(parts):
+    """Value list in the last three blocks of a column"""
+    offset, spec, view = 0, {}, memoryview(b''.join(parts[-3:]))
+    for key, part in zip(('types', 'ends', 'data'), parts[-3:]):
+        spec[key] = [offset, len(part)]
+        offset += len(part)
+    return MappedValues(view, spec)
@@ -0,0 +1,107 @@
+"""
+Facet index - value -> rows for the categorical columns of a ResultSet
+
+Built once when results are loaded and extended as rows are appended, it
+turns `filter --event X` completions, status/event filters, `top --by type`
+and per-facet timelines into lookups instead of full scans.
+"""
+
+from array import array
+
+from .backend import numpy
+from .resultset import as_result_set
+
+
+FACETS = ('event', 'status', 'level', 'file')
+
+
+class FacetIndex:
+    """Postings (row numbers) per distinct value of each facet column"""
+
+    def __init__(self, fields=FACETS):
+        self.fields = fields
+        self.size = 0
+        self._postings = {field: {} for field in fields}   # field -> code -> array('I')
+        self._values = {field: [] for field in fields}     # field -> code -> value
+        self._lookup = {field: {} for field in fields}     # field -> value -> code
+
+    def extend(self, rs):
+        """Index rows [self.size, len(rs)) - rows are only ever appended"""
+        start, end = self.size, len(rs)
+        if start >= end:
+            return self
+        for field in self.fields:
+            codes, values = rs.codes(field)
+            self._values[field] = values
+            self._lookup[field] = rs.code_lookup(field)
+            postings = self._postings[field]
+            if numpy() is not None and end - start > 1024:
+                self._extend_numpy(postings, codes, start, end)
+            else:
+                for i in range(start, end):
+                    rows = postings.get(codes[i])
+                    if rows is None:
+                        rows = postings[codes[i]] = array('I')
+                    rows.append(i)
+        self.size = end
+        return self
+
+    @staticmethod
+    def _extend_numpy(postings, codes, start, end):
+        np = numpy()
+        chunk = np.frombuffer(codes, dtype=np.int32)[start:end]
+        order = np.argsort(chunk, kind='stable')
+        sorted_codes = chunk[order]
+        bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+        for group in np.split(order, bounds):
+            code = int(chunk[group[0]])
+            rows = postings.get(code)
+            if rows is None:
+                rows = postings[code] = array('I')
+            rows.extend((group + start).astype(np.uint32).tolist())
+
+    # -- lookups -------------------------------------------------------
+
+    def counts(self, field):
+        """value -> count for one facet"""
+        values = self._values[field]
+        return {values[code]: len(rows) for code, rows in self._postings[field].items()}
+
+    def values(self, field):
+        return sorted((v for v in self.counts(field) if v is not None), key=str)
+
+    def count(self, field, value):
+        return len(self.rows(field, value))
+
+    def rows(self, field, value):
+        """Row numbers (ascending) where field == value"""
+        code = self._lookup[field].get(value)
+        if code is None:
+            return array('I')
+        return self._postings[field].get(code, array('I'))
+
+    def select(self, **criteria):
+        """Ascending row numbers matching every field=value given"""
+        lists = [self.rows(f, v) for f, v in criteria.items() if v is not None]
+        if not lists:
+            return array('I', range(self.size))
+        # Intersect starting from the most selective facet
+        lists.sort(key=len)
+        selected = lists[0]
+        for rows in lists[1:]:
+            keep = set(rows)
+            selected = array('I', (i for i in selected if i in keep))
+        return selected
+
+
+def _build(rs):
+    return FacetIndex().extend(rs)
+
+
+def _update(index, rs):
+    return index.extend(rs)
+
+
+def facets(results):
+    """FacetIndex for a ResultSet, kept up to date as rows are appended"""
+    return as_result_set(results).derived('facets', _build, _update)
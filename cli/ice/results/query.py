@@ -0,0 +1,308 @@
+"""
+Predicate plans over a ResultSet - the engine behind filter / top
+
+Command options (`filter failed --event db --severity 5 --conf 0.7`) are
+compiled into one Query: a list of clauses on the typed columns
+
+  * categorical equality  -> compare the dictionary codes (event, status, ...)
+  * numeric ranges         -> compare the float columns (NaN never matches)
+
+evaluated in bulk, a chunk of rows at a time. With NumPy each clause is a
+vectorized mask over the column buffer; without it the clauses are
+compiled into a single Python expression over the raw arrays. Chunks let
+`--limit` stop as soon as enough rows matched.
+
+Full-length masks are memoized per clause for the current version of the
+result set, so a chained `filter failed` -> `filter failed --severity 5`
+only evaluates the new clause, and a Selection can be passed back in as
+`within` to refine an earlier result without rescanning it.
+"""
+
+import heapq
+import operator
+from array import array
+
+from .backend import numpy
+from .resultset import as_result_set, CATEGORICAL, NUMERIC
+
+
+CHUNK = 65536
+OPS = {
+    '==': operator.eq, '>=': operator.ge, '>': operator.gt,
+    '<=': operator.le, '<': operator.lt,
+}
+
+
+class Clause:
+    """field <op> value on one column"""
+
+    __slots__ = ('field', 'op', 'value')
+
+    def __init__(self, field, op, value):
+        if op not in OPS:
+            raise ValueError(f"Unknown operator: {op}")
+        if field in NUMERIC:
+            value = float(value)
+        elif field not in CATEGORICAL or op != '==':
+            raise ValueError(f"Cannot filter {field} with {op}")
+        self.field = field
+        self.op = op
+        self.value = value
+
+    @property
+    def key(self):
+        return (self.field, self.op, self.value)
+
+    @property
+    def categorical(self):
+        return self.field in CATEGORICAL
+
+    def mask(self, rs, start, end):
+        """NumPy bool mask of rows [start, end)"""
+        np = numpy()
+        if self.categorical:
+            code = rs.code_lookup(self.field).get(self.value)
+            if code is None:
+                return np.zeros(end - start, dtype=bool)
+            codes = np.frombuffer(rs.codes(self.field)[0], dtype=np.int32)
+            return codes[start:end] == code
+        column = np.frombuffer(rs.floats(self.field), dtype=np.float64)
+        return OPS[self.op](column[start:end], self.value)
+
+    def expression(self, rs, names):
+        """Python source testing row `i`, binding its column in names"""
+        name = f"c{len(names)}"
+        if self.categorical:
+            codes, _values = rs.codes(self.field)
+            names[name] = codes
+            code = rs.code_lookup(self.field).get(self.value)
+            return f"{name}[i] == {code}" if code is not None else "False"
+        names[name] = rs.floats(self.field)
+        names[f"{name}_value"] = self.value
+        return f"{name}[i] {self.op} {name}_value"
+
+    def __repr__(self):
+        return f"{self.field} {self.op} {self.value!r}"
+
+
+class Selection:
+    """Rows of one result-set version chosen by a query"""
+
+    def __init__(self, rs, mask, complete=True):
+        self.rs = rs
+        self.version = rs.version
+        self.mask = mask            # numpy bool array or bytearray of 0/1
+        self.complete = complete    # False when evaluation stopped at a limit
+        self._rows = None
+
+    @property
+    def rows(self):
+        """Ascending row numbers (array('I'))"""
+        if self._rows is None:
+            np = numpy()
+            if np is not None and not isinstance(self.mask, bytearray):
+                self._rows = array('I', np.flatnonzero(self.mask).astype(np.uint32).tobytes())
+            else:
+                self._rows = array('I', (i for i, hit in enumerate(self.mask) if hit))
+        return self._rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def valid_for(self, rs):
+        return rs is self.rs and rs.version == self.version
+
+
+class Query:
+    """AND of clauses; equality clauses are evaluated first (cheap and selective)"""
+
+    def __init__(self, clauses=()):
+        self.clauses = sorted(clauses, key=lambda c: not c.categorical)
+
+    def __bool__(self):
+        return bool(self.clauses)
+
+    def __repr__(self):
+        return " AND ".join(map(repr, self.clauses)) or "all rows"
+
+    def evaluate(self, results, within=None, limit=None, cancel=None, progress=None):
+        """
+        Selection of the matching rows. `within` restricts (and is reused
+        as the starting mask); with `limit` evaluation stops at the chunk
+        where that many rows have matched and only those are returned.
+        cancel.check() is called and progress(done, total, label) reported
+        between chunks (between clauses for full-column masks).
+        """
+        rs = as_result_set(results)
+        if within is not None and not within.valid_for(rs):
+            within = None
+        if any(c.categorical and c.value not in rs.code_lookup(c.field) for c in self.clauses):
+            # A value the column never had: nothing to scan
+            np = numpy()
+            return Selection(rs, np.zeros(len(rs), dtype=bool) if np is not None else bytearray(len(rs)))
+        if numpy() is not None:
+            return self._evaluate_numpy(rs, within, limit, cancel, progress)
+        return self._evaluate_python(rs, within, limit, cancel, progress)
+
+    def chunks(self, results, within=None, size=CHUNK):
+        """
+        Matching row numbers a chunk at a time, ascending, for streaming
+        consumers (export): no full-length mask or row list is built.
+        """
+        rs = as_result_set(results)
+        if within is not None and not within.valid_for(rs):
+            within = None
+        if any(c.categorical and c.value not in rs.code_lookup(c.field) for c in self.clauses):
+            return
+        np = numpy()
+        test = self.compile(rs) if np is None and self.clauses else None
+        for start in range(0, len(rs), size):
+            end = min(start + size, len(rs))
+            if np is None:
+                rows = range(start, end) if within is None else [i for i in range(start, end) if within.mask[i]]
+                yield [i for i in rows if test(i)] if test is not None else list(rows)
+                continue
+            chunk = np.ones(end - start, dtype=bool) if within is None else within.mask[start:end].copy()
+            for clause in self.clauses:
+                if not chunk.any():
+                    break
+                chunk &= clause.mask(rs, start, end)
+            yield np.flatnonzero(chunk) + start
+
+    def _evaluate_numpy(self, rs, within, limit, cancel, progress):
+        np = numpy()
+        size = len(rs)
+        if limit is None:
+            mask = np.ones(size, dtype=bool) if within is None else within.mask.copy()
+            cache = _mask_cache(rs)
+            for done, clause in enumerate(self.clauses):
+                _checkpoint(cancel, progress, done, len(self.clauses), "clauses")
+                if not mask.any():
+                    break
+                cached = cache.get(clause.key)
+                if cached is None:
+                    cached = cache[clause.key] = clause.mask(rs, 0, size)
+                mask &= cached
+            return Selection(rs, mask)
+
+        mask = np.zeros(size, dtype=bool)
+        found = 0
+        for start in range(0, size, CHUNK):
+            _checkpoint(cancel, progress, start, size, "rows scanned")
+            end = min(start + CHUNK, size)
+            chunk = np.ones(end - start, dtype=bool) if within is None else within.mask[start:end].copy()
+            for clause in self.clauses:
+                if not chunk.any():
+                    break
+                chunk &= clause.mask(rs, start, end)
+            hits = np.flatnonzero(chunk)
+            if found + len(hits) >= limit:
+                mask[start + hits[:limit - found]] = True
+                return Selection(rs, mask, complete=end == size and found + len(hits) == limit)
+            mask[start:end] = chunk
+            found += len(hits)
+        return Selection(rs, mask)
+
+    def _evaluate_python(self, rs, within, limit, cancel, progress):
+        size = len(rs)
+        test = self.compile(rs)
+        if within is not None:
+            candidates = (i for i, hit in enumerate(within.mask) if hit)
+        else:
+            candidates = range(size)
+        candidates = iter(candidates)
+        mask = bytearray(size)
+        found = 0
+        for n, i in enumerate(candidates):
+            if not n % CHUNK:
+                _checkpoint(cancel, progress, i, size, "rows scanned")
+            if test(i):
+                mask[i] = 1
+                found += 1
+                if limit is not None and found >= limit:
+                    # Like the NumPy path, which sees the whole chunk: complete
+                    # when this is the last chunk and nothing after i matches
+                    last = i // CHUNK == (size - 1) // CHUNK
+                    return Selection(rs, mask, complete=last and not any(map(test, candidates)))
+        return Selection(rs, mask)
+
+    def compile(self, results):
+        """Row predicate i -> bool, generated as one expression over the raw columns"""
+        rs = as_result_set(results)
+        names = {}
+        body = " and ".join(clause.expression(rs, names) for clause in self.clauses) or "True"
+        return eval(f"lambda i: {body}", names)
+
+
+def _checkpoint(cancel, progress, done, total, label):
+    if cancel is not None:
+        cancel.check()
+    if progress is not None:
+        progress(done, total, label)
+
+
+def _mask_cache(rs):
+    # A new dict per result-set version: stale masks go with the old version
+    return rs.derived('query_masks', lambda _rs: {})
+
+
+def compile_query(status=None, event=None, level=None, file=None,
+                  min_severity=None, min_confidence=None):
+    """Query from the usual command options (None = not filtered)"""
+    clauses = [Clause(field, '==', value) for field, value in
+               (('status', status), ('event', event), ('level', level), ('file', file))
+               if value is not None]
+    if min_severity is not None:
+        clauses.append(Clause('severity', '>=', min_severity))
+    if min_confidence is not None:
+        clauses.append(Clause('confidence', '>=', min_confidence))
+    return Query(clauses)
+
+
+def top_n(results, field, n, selection=None):
+    """
+    Row numbers of the n largest values of a numeric column, largest
+    first (ties in row order); rows without a value (NaN) are never
+    returned. Partial selection with NumPy, a bounded heap otherwise -
+    never a full sort.
+    """
+    rs = as_result_set(results)
+    if n <= 0:
+        return []
+    np = numpy()
+    if np is not None:
+        values = np.frombuffer(rs.floats(field), dtype=np.float64)
+        rows = np.arange(len(rs)) if selection is None else np.flatnonzero(selection.mask)
+        values = values[rows]
+        valued = ~np.isnan(values)
+        rows, values = rows[valued], values[valued]
+        if len(rows) > n:
+            # Everything above the n-th value, then ties at it in row order
+            kth = -np.partition(-values, n - 1)[n - 1]
+            above = np.flatnonzero(values > kth)
+            ties = np.flatnonzero(values == kth)[:n - len(above)]
+            keep = np.concatenate((above, ties))
+            rows, values = rows[keep], values[keep]
+        order = np.lexsort((rows, -values))
+        return rows[order].tolist()
+    column = rs.floats(field)
+    rows = range(len(rs)) if selection is None else selection.rows
+    valued = (i for i in rows if column[i] == column[i])
+    return heapq.nlargest(n, valued, key=column.__getitem__)
+
+
+def value_counts(results, field, selection=None):
+    """value -> count of a categorical column, restricted to a selection"""
+    rs = as_result_set(results)
+    if selection is None:
+        return rs.value_counts(field)
+    codes, values = rs.codes(field)
+    np = numpy()
+    if np is not None and not isinstance(selection.mask, bytearray):
+        counts = np.bincount(np.frombuffer(codes, dtype=np.int32)[selection.mask], minlength=len(values))
+        return {values[c]: int(n) for c, n in enumerate(counts) if n}
+    counts = {}
+    for i in selection.rows:
+        value = values[codes[i]]
+        counts[value] = counts.get(value, 0) + 1
+    return counts
@@ -0,0 +1,478 @@
+"""
+Columnar result set - compact storage for shell results
+
+Rows come in as the usual dicts ({'event', 'status', 'confidence', ...})
+and are split into typed columns:
+
+  * categorical strings (event, status, ...) -> dictionary codes in array('i')
+  * numeric fields (confidence, severity)     -> array('d'), NaN when missing
+  * timestamp                                 -> epoch seconds in array('d')
+  * anything else                             -> plain list, None when missing
+
+A numeric or timestamp value the parsed column cannot give back exactly
+(severity 5 or 'high', a stamp other than 'YYYY-MM-DD HH:MM:SS[.ffffff]',
+a datetime) is also kept as is in a raw column, and that original is what
+rows, snapshots and exports return.
+
+Existing callers keep working through Row, a read-only mapping view that
+supports r.get('event'), r['status'], dict(r). Every row has every column:
+a value the record did not have reads as a present key holding None. New code should read columns
+directly via codes()/floats()/column().
+
+Commands run on job threads, so a ResultSet carries an RLock: mutation
+(append/extend/clear) and derived() take it, and shell commands hold it
+while they read the columns (ResultsCommand.execute), so a column buffer
+is never resized under a reader.
+"""
+
+import calendar
+import threading
+from array import array
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+
+CATEGORICAL = ('event', 'status', 'level', 'file', 'source', 'log_type')
+NUMERIC = ('confidence', 'severity')
+TIMESTAMP = 'timestamp'
+
+NAN = float('nan')
+_EPOCH = datetime(1970, 1, 1)
+_TS_FORMATS = (
+    '%d/%b/%Y:%H:%M:%S %z',   # nginx / apache
+    '%d/%b/%Y:%H:%M:%S',
+    '%b %d %H:%M:%S',         # syslog (no year)
+    '%Y/%m/%d %H:%M:%S',
+)
+
+
+def parse_timestamp(value):
+    """Epoch seconds (naive timestamps are taken as UTC), NaN if unparseable"""
+    return _parse_timestamp(value)[0]
+
+
+def _parse_timestamp(value):
+    """
+    (epoch, exact): exact is False when format_timestamp(epoch) does not
+    give the value back and the original has to be kept next to it.
+    """
+    if value is None:
+        return NAN, True
+    if isinstance(value, (int, float)):
+        return float(value), False
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        text = str(value).strip()
+        if text.replace('.', '', 1).isdigit():
+            return float(text), False     # epoch seconds
+        try:
+            dt = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            for fmt in _TS_FORMATS:
+                try:
+                    dt = datetime.strptime(text, fmt)
+                    break
+                except ValueError:
+                    continue
+            else:
+                return NAN, False
+            if '%Y' not in fmt:
+                dt = _with_year(dt)
+    epoch = calendar.timegm(dt.utctimetuple()) + dt.microsecond / 1e6
+    return epoch, isinstance(value, str) and format_timestamp(epoch) == value
+
+
+def _with_year(dt):
+    """Syslog stamps have no year: this year, or last year if that is in the future"""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    try:
+        dated = dt.replace(year=now.year)
+    except ValueError:          # Feb 29
+        return dt
+    if dated > now + timedelta(days=1):
+        dated = dated.replace(year=now.year - 1)
+    return dated
+
+
+def _parse_number(value):
+    """(float, exact): exact only for floats, so ints, '5' and 'high' are kept"""
+    if value is None:
+        return NAN, True
+    try:
+        return float(value), type(value) is float
+    except (TypeError, ValueError):
+        return NAN, False
+
+
+def format_timestamp(epoch):
+    """Inverse of parse_timestamp: 'YYYY-MM-DD HH:MM:SS[.ffffff]' or None"""
+    if epoch != epoch:  # NaN
+        return None
+    dt = _EPOCH + timedelta(seconds=epoch)
+    return dt.isoformat(sep=' ')
+
+
+class StringColumn:
+    """Dictionary-encoded strings: one copy of each distinct value"""
+
+    __slots__ = ('values', 'lookup', 'codes')
+
+    def __init__(self):
+        self.values = []      # code -> value
+        self.lookup = {}      # value -> code
+        self.codes = array('i')
+
+    def encode(self, value):
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.lookup[value] = code
+            self.values.append(value)
+        return code
+
+    def append(self, value):
+        self.codes.append(self.encode(value))
+
+    def __getitem__(self, i):
+        return self.values[self.codes[i]]
+
+    def __len__(self):
+        return len(self.codes)
+
+    def counts(self):
+        """value -> count, computed over the integer codes"""
+        per_code = Counter(self.codes)
+        return Counter({self.values[c]: n for c, n in per_code.items()})
+
+    def nbytes(self):
+        return self.codes.itemsize * len(self.codes)
+
+
+class Row:
+    """Read-only mapping view over one row of a ResultSet"""
+
+    __slots__ = ('_rs', '_i')
+
+    def __init__(self, rs, i):
+        self._rs = rs
+        self._i = i
+
+    def get(self, key, default=None):
+        if key not in self._rs.columns():
+            return default
+        return self._rs.value(key, self._i)
+
+    def __getitem__(self, key):
+        if key not in self._rs.columns():
+            raise KeyError(key)
+        return self._rs.value(key, self._i)
+
+    def __contains__(self, key):
+        return key in self._rs.columns()
+
+    def keys(self):
+        return self._rs.columns()
+
+    def items(self):
+        return [(k, self._rs.value(k, self._i)) for k in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def to_dict(self):
+        return dict(self.items())
+
+    @property
+    def index(self):
+        return self._i
+
+    def __repr__(self):
+        return f"Row({self.to_dict()!r})"
+
+
+class ResultSet:
+    """
+    Append-only columnar container for analysis results.
+
+    `version` is bumped on every mutation so derived data (aggregates,
+    indexes) can tell when it is stale.
+    """
+
+    def __init__(self, records=None):
+        self._size = 0
+        self._strings = {name: StringColumn() for name in CATEGORICAL}
+        self._floats = {name: array('d') for name in NUMERIC}
+        self._timestamps = array('d')
+        self._objects = {}    # other keys -> list
+        self._raw = {}        # numeric/timestamp name -> originals where parsing loses them, see raw()
+        self._derived = {}    # name -> (version, value), see derived()
+        self._mapped = None   # snapshot whose mapping backs the columns, see from_columns()
+        self.lock = threading.RLock()
+        self.version = 0
+        if records is not None:
+            self.extend(records)
+
+    @classmethod
+    def from_records(cls, records):
+        if isinstance(records, ResultSet):
+            return records
+        return cls(records)
+
+    @classmethod
+    def from_columns(cls, size, strings, floats, timestamps, objects, mapped=None, raw=None):
+        """
+        Wrap existing columns without copying (used by session snapshots).
+        strings: name -> (codes, values); codes/floats/timestamps may be
+        read-only buffers (memoryview over a mapping): the first append
+        copies them into arrays. raw: name -> originals, as raw() returns.
+        """
+        rs = cls()
+        rs._size = size
+        for name, (codes, values) in strings.items():
+            col = rs._strings.setdefault(name, StringColumn())
+            col.values = list(values)
+            col.lookup = {value: code for code, value in enumerate(col.values)}
+            col.codes = codes
+        rs._floats.update(floats)
+        rs._timestamps = timestamps
+        rs._objects = dict(objects)
+        rs._raw = dict(raw or {})
+        rs._mapped = mapped
+        rs.version = 1
+        return rs
+
+    @property
+    def mapped(self):
+        return self._mapped is not None
+
+    def _thaw(self):
+        # Copy-on-write for snapshot-backed columns
+        for col in self._strings.values():
+            col.codes = _owned(col.codes, 'i')
+        for name, col in self._floats.items():
+            self._floats[name] = _owned(col, 'd')
+        self._timestamps = _owned(self._timestamps, 'd')
+        for columns in (self._objects, self._raw):
+            for name, col in columns.items():
+                if not isinstance(col, list):
+                    columns[name] = list(col)
+        self._mapped = None
+
+    # -- mutation ------------------------------------------------------
+
+    def append(self, record):
+        with self.lock:
+            if self._mapped is not None:
+                self._thaw()
+            self._append(record)
+            self.version += 1
+
+    def extend(self, records):
+        with self.lock:
+            if self._mapped is not None:
+                self._thaw()
+            for record in records:
+                self._append(record)
+            self.version += 1
+
+    def _append(self, record):
+        if isinstance(record, Row):
+            record = record.to_dict()
+        get = record.get
+        for name, col in self._strings.items():
+            col.append(get(name))
+        for name, col in self._floats.items():
+            value = get(name)
+            number, exact = _parse_number(value)
+            col.append(number)
+            self._keep_raw(name, None if exact else value)
+        value = get(TIMESTAMP)
+        epoch, exact = _parse_timestamp(value)
+        self._timestamps.append(epoch)
+        self._keep_raw(TIMESTAMP, None if exact else value)
+
+        for key, value in record.items():
+            if key in self._strings or key in self._floats or key == TIMESTAMP:
+                continue
+            col = self._objects.get(key)
+            if col is None:
+                col = self._objects[key] = [None] * self._size
+            col.append(value)
+        self._size += 1
+        for col in self._objects.values():
+            if len(col) < self._size:
+                col.append(None)
+
+    def _keep_raw(self, name, value):
+        # Raw columns only exist once some value needed one
+        col = self._raw.get(name)
+        if col is None:
+            if value is None:
+                return
+            col = self._raw[name] = [None] * self._size
+        col.append(value)
+
+    def clear(self):
+        with self.lock:
+            version, lock = self.version, self.lock
+            self.__init__()
+            self.lock = lock
+            self.version = version + 1
+
+    # -- row access ----------------------------------------------------
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield Row(self, i)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [Row(self, j) for j in range(*i.indices(self._size))]
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        return Row(self, i)
+
+    def value(self, key, i):
+        """Single cell, None when missing"""
+        raw = self._raw.get(key)
+        if raw is not None and raw[i] is not None:
+            return raw[i]
+        col = self._strings.get(key)
+        if col is not None:
+            return col[i]
+        col = self._floats.get(key)
+        if col is not None:
+            value = col[i]
+            return None if value != value else value
+        if key == TIMESTAMP:
+            return format_timestamp(self._timestamps[i])
+        col = self._objects.get(key)
+        return col[i] if col is not None else None
+
+    def records(self):
+        """Rows as plain dicts (materializes - for export/compat only)"""
+        return [row.to_dict() for row in self]
+
+    # -- column access -------------------------------------------------
+
+    def columns(self):
+        return list(self._strings) + list(self._floats) + [TIMESTAMP] + list(self._objects)
+
+    def codes(self, name):
+        """(codes array, code -> value list) for a categorical column"""
+        col = self._strings[name]
+        return col.codes, col.values
+
+    def code_lookup(self, name):
+        """value -> code mapping of a categorical column (do not mutate)"""
+        return self._strings[name].lookup
+
+    def floats(self, name):
+        """array('d') for a numeric column, or the epoch timestamp column"""
+        if name == TIMESTAMP:
+            return self._timestamps
+        return self._floats[name]
+
+    def raw(self, name):
+        """
+        Originals of a numeric or timestamp column where the parsed value
+        would lose them (None elsewhere), or None when every value parsed
+        exactly (do not mutate)
+        """
+        return self._raw.get(name)
+
+    def objects(self, name):
+        """Raw list behind a free-form column such as message (do not mutate)"""
+        col = self._objects.get(name)
+        return col if col is not None else [None] * self._size
+
+    def column(self, name):
+        """Decoded column as a list (convenience; prefer codes()/floats())"""
+        if name in self._strings:
+            col = self._strings[name]
+            return [col.values[c] for c in col.codes]
+        if name in self._floats or name == TIMESTAMP:
+            return [None if v != v else v for v in self.floats(name)]
+        return list(self._objects.get(name, [None] * self._size))
+
+    def value_counts(self, name):
+        """Counter of a categorical column without touching the rows"""
+        if name in self._strings:
+            return self._strings[name].counts()
+        return Counter(self.column(name))
+
+    def take(self, indices):
+        """New ResultSet with the given rows, in order"""
+        subset = ResultSet()
+        subset._size = len(indices)
+        for name, col in self._strings.items():
+            out = subset._strings[name]
+            out.values = list(col.values)
+            out.lookup = dict(col.lookup)
+            out.codes = array('i', (col.codes[i] for i in indices))
+        for name, col in self._floats.items():
+            subset._floats[name] = array('d', (col[i] for i in indices))
+        subset._timestamps = array('d', (self._timestamps[i] for i in indices))
+        subset._objects = {k: [col[i] for i in indices] for k, col in self._objects.items()}
+        subset._raw = {k: [col[i] for i in indices] for k, col in self._raw.items()}
+        subset.version = 1
+        return subset
+
+    def derived(self, name, build, update=None):
+        """
+        Memoize build(self) until the next mutation - used for summaries
+        and indexes so several commands share one scan of the data.
+
+        Rows are only ever appended (clear() drops every derived value), so
+        an `update(old_value, self)` callback can fold in just the new rows
+        instead of rebuilding.
+        """
+        with self.lock:
+            cached = self._derived.get(name)
+            if cached is not None and cached[0] == self.version:
+                return cached[1]
+            if cached is not None and update is not None:
+                value = update(cached[1], self)
+            else:
+                value = build(self)
+            self._derived[name] = (self.version, value)
+            return value
+
+    def nbytes(self):
+        """Approximate memory held by the typed columns"""
+        total = sum(col.nbytes() for col in self._strings.values())
+        total += sum(col.itemsize * len(col) for col in self._floats.values())
+        total += self._timestamps.itemsize * len(self._timestamps)
+        total += sum(8 * len(col) for col in self._objects.values())
+        total += sum(8 * len(col) for col in self._raw.values())
+        return total
+
+    def __repr__(self):
+        return f"<ResultSet rows={self._size} columns={len(self.columns())}>"
+
+
+def _owned(buffer, typecode):
+    if isinstance(buffer, array):
+        return buffer
+    owned = array(typecode)
+    owned.frombytes(memoryview(buffer).cast('B'))
+    return owned
+
+
+def as_result_set(results):
+    """Accept either a ResultSet or a plain list of dicts"""
+    if isinstance(results, ResultSet):
+        return results
+    return ResultSet(results or [])
@@ -0,0 +1,366 @@
+"""
+Text index - token -> rows over the text of a ResultSet's rows
+
+The text of a row is what listings show for it: its message, or its
+line when it has no message (row_text).
+
+`search` used to test every message for the query. The index keeps one
+postings list (ascending row numbers) per lowercased word token, extended
+as rows are appended, so a query only looks at rows that can match:
+
+  * a single word is answered from the postings alone: a message contains
+    the word iff one of its tokens does, and the tokens containing it are
+    found with one substring scan of the joined vocabulary
+  * phrases and literals with punctuation (`Failed password`,
+    `status=bounced`) intersect the postings of their words and check the
+    surviving candidates
+  * `--regex` pulls the literal runs the pattern requires out of the parsed
+    regex, uses them as the same kind of prefilter and runs the regex on
+    the candidates only
+
+Pure numbers are not indexed (ports, ids and pids would dominate the
+vocabulary); digit runs in a query just do not narrow the candidates.
+
+The index can be written to ~/.devlog_cache/search and is picked up again
+when results with exactly the same messages are loaded (the file is named
+after a hash of the whole text column).
+"""
+
+import hashlib
+import pickle
+import re
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+from .backend import numpy
+from .resultset import as_result_set
+
+
+TEXT_FIELDS = ('message', 'line')     # first non-empty one is the row's text
+TOKEN = re.compile(r'\w+')
+INDEX_DIR = Path.home() / ".devlog_cache" / "search"
+BLOCK = 65536           # rows per step of the scans (cancel checks, progress, hashing)
+
+
+class TextIndex:
+    """Postings per word token of the rows' text, plus a substring-searchable vocabulary"""
+
+    def __init__(self, fields=TEXT_FIELDS):
+        self.fields = fields
+        self.size = 0
+        self._postings = {}        # token -> array('I')
+        self._vocab_text = ''      # '\n' + '\n'.join(tokens) + '\n', rebuilt lazily
+        self._vocab_tokens = []
+        self._vocab_starts = array('I')
+
+    def extend(self, rs, cancel=None, progress=None):
+        """
+        Index rows [self.size, len(rs)) - rows are only ever appended.
+        Cancelling leaves a consistent index of the rows done so far.
+        """
+        start, end = self.size, len(rs)
+        if start >= end:
+            return self
+        postings = self._postings
+        text_at = row_text(rs, self.fields)
+        findall = TOKEN.findall
+        for i in range(start, end):
+            if not i % BLOCK:
+                self.size = i
+                _checkpoint(cancel, progress, i, end, "rows indexed")
+            text = text_at(i)
+            if not text:
+                continue
+            for token in set(findall(str(text).lower())):
+                rows = postings.get(token)
+                if rows is None:
+                    if token.isdigit():
+                        continue
+                    rows = postings[token] = array('I')
+                rows.append(i)
+        self.size = end
+        return self
+
+    def __len__(self):
+        return len(self._postings)
+
+    # -- candidate rows ------------------------------------------------
+
+    def _vocabulary(self):
+        if len(self._vocab_tokens) != len(self._postings):
+            tokens = list(self._postings)
+            starts = array('I')
+            pos = 1
+            for token in tokens:
+                starts.append(pos)
+                pos += len(token) + 1
+            self._vocab_text = '\n' + '\n'.join(tokens) + '\n'
+            self._vocab_tokens = tokens
+            self._vocab_starts = starts
+        return self._vocab_text, self._vocab_tokens, self._vocab_starts
+
+    def tokens_containing(self, word):
+        """Indexed tokens that contain word (lowercase)"""
+        text, tokens, starts = self._vocabulary()
+        found = []
+        last = -1
+        pos = text.find(word)
+        while pos >= 0:
+            k = bisect_right(starts, pos) - 1
+            if k != last:
+                found.append(tokens[k])
+                last = k
+            # Skip to the next token: one hit per token is enough
+            pos = text.find(word, starts[k] + len(tokens[k]) + 1)
+        return found
+
+    def word_rows(self, word, exact=False):
+        """Rows whose text has a token equal to (exact) or containing word"""
+        if exact:
+            return self._postings.get(word, array('I'))
+        return _union([self._postings[t] for t in self.tokens_containing(word)])
+
+    def candidates(self, literal):
+        """
+        Rows that may contain literal (case-insensitive), or None when the
+        literal has no indexed word to narrow on. Words bounded by
+        punctuation inside the literal must be whole tokens, the ones at
+        its edges may be part of a longer token.
+        """
+        literal = literal.lower()
+        lists = []
+        for match in TOKEN.finditer(literal):
+            word = match.group()
+            if word.isdigit():
+                continue
+            whole = match.start() > 0 and match.end() < len(literal)
+            rows = self.word_rows(word, exact=whole)
+            if not rows:
+                return array('I')
+            lists.append(rows)
+        if not lists:
+            return None
+        return _intersect(lists)
+
+    # -- queries -------------------------------------------------------
+
+    def search(self, rs, query, regex=False, case=False, cancel=None, progress=None):
+        """Ascending row numbers whose text matches query"""
+        text_at = row_text(rs, self.fields)
+        if regex:
+            pattern = re.compile(query, 0 if case else re.IGNORECASE)
+            lists = [c for c in (self.candidates(lit) for lit in required_literals(query)) if c is not None]
+            rows = _intersect(lists) if lists else range(self.size)
+            search = pattern.search
+
+            def match(i):
+                text = text_at(i)
+                return text and search(str(text))
+            return _scan(rows, match, cancel, progress)
+
+        if not query:
+            return []
+        rows = self.candidates(query)
+        if rows is not None and not case and _single_word(query):
+            return rows  # exact: the token postings are the answer
+        rows = range(self.size) if rows is None else rows
+        if case:
+            def match(i):
+                text = text_at(i)
+                return text and query in str(text)
+        else:
+            needle = query.lower()
+
+            def match(i):
+                text = text_at(i)
+                return text and needle in str(text).lower()
+        return _scan(rows, match, cancel, progress)
+
+    # -- persistence ---------------------------------------------------
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            'fields': self.fields,
+            'size': self.size,
+            'postings': {token: rows.tobytes() for token, rows in self._postings.items()},
+        }
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        index = cls(tuple(state['fields']))
+        index.size = state['size']
+        for token, data in state['postings'].items():
+            rows = array('I')
+            rows.frombytes(data)
+            index._postings[token] = rows
+        return index
+
+
+def _checkpoint(cancel, progress, done, total, label):
+    if cancel is not None:
+        cancel.check()
+    if progress is not None:
+        progress(done, total, label)
+
+
+def _scan(rows, match, cancel=None, progress=None):
+    """Candidate rows that match, a block at a time"""
+    found = []
+    for start in range(0, len(rows), BLOCK):
+        _checkpoint(cancel, progress, start, len(rows), "rows searched")
+        found.extend(i for i in rows[start:start + BLOCK] if match(i))
+    return found
+
+
+def _single_word(query):
+    match = TOKEN.fullmatch(query)
+    return match is not None and not query.isdigit()
+
+
+def _union(lists):
+    if not lists:
+        return array('I')
+    if len(lists) == 1:
+        return lists[0]
+    np = numpy()
+    if np is not None:
+        merged = np.unique(np.concatenate([np.frombuffer(rows, dtype=np.uint32) for rows in lists]))
+        return array('I', merged.tobytes())
+    return array('I', sorted(set().union(*lists)))
+
+
+def _intersect(lists):
+    lists = sorted(lists, key=len)
+    selected = lists[0]
+    for rows in lists[1:]:
+        if not selected:
+            break
+        np = numpy()
+        if np is not None and len(selected) > 1024:
+            selected = array('I', np.intersect1d(
+                np.frombuffer(selected, dtype=np.uint32),
+                np.frombuffer(rows, dtype=np.uint32), assume_unique=True).tobytes())
+        else:
+            keep = set(rows)
+            selected = array('I', (i for i in selected if i in keep))
+    return selected
+
+
+def required_literals(pattern):
+    """
+    Literal strings every match of a regex must contain (may be empty).
+    Only the top-level sequence is walked: alternations and optional parts
+    end the current literal instead of contributing to it.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return []
+    literals = []
+    _walk(parsed, literals, [])
+    return [lit for lit in literals if lit]
+
+
+def _walk(items, literals, current):
+    for op, arg in items:
+        if op is sre_constants.LITERAL:
+            current.append(chr(arg))
+            continue
+        literals.append(''.join(current))
+        current.clear()
+        if op is sre_constants.SUBPATTERN:
+            _walk(arg[-1], literals, current)
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and arg[0] >= 1:
+            # x+ / x{2,}: one copy of x is required, but no literal spans it
+            _walk(arg[2], literals, current)
+            literals.append(''.join(current))
+            current.clear()
+    literals.append(''.join(current))
+    current.clear()
+
+
+# -- shared per ResultSet ---------------------------------------------------
+
+def row_text(rs, fields=TEXT_FIELDS):
+    """i -> the text of row i: the first of fields it has a value for (None if none)"""
+    present = set(rs.columns())
+    columns = [rs.objects(f) for f in fields if f in present]
+    if not columns:
+        return lambda i: None
+    if len(columns) == 1:
+        return columns[0].__getitem__
+    first, second = columns[0], columns[1:]
+
+    def text(i):
+        value = first[i]
+        if value:
+            return value
+        for column in second:
+            if column[i]:
+                return column[i]
+        return value
+    return text
+
+
+def fingerprint(rs, fields=TEXT_FIELDS):
+    """Identity of a result set's text: a hash of every row's text, in order"""
+    return rs.derived(f"fingerprint:{'|'.join(fields)}", lambda rs: _content_hash(rs, fields))
+
+
+def _content_hash(rs, fields):
+    text_at = row_text(rs, fields)
+    size = len(rs)
+    digest = hashlib.blake2b(f"{'|'.join(fields)}\0{size}".encode(), digest_size=16)
+    for start in range(0, size, BLOCK):
+        # \0 separates values, \1 stands for a missing one
+        block = map(text_at, range(start, min(start + BLOCK, size)))
+        text = '\0'.join('\1' if v is None else str(v) for v in block)
+        digest.update(b'\0' + text.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+def index_path(rs, root=INDEX_DIR):
+    return Path(root) / f"{fingerprint(rs)}.idx"
+
+
+def _build(rs, cancel=None, progress=None):
+    path = index_path(rs)
+    if path.exists():
+        try:
+            index = TextIndex.load(path)
+            if index.size == len(rs) and index.fields == TEXT_FIELDS:
+                return index
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError):
+            pass
+    return TextIndex().extend(rs, cancel, progress)
+
+
+def text_index(results, cancel=None, progress=None):
+    """TextIndex over the text of a ResultSet's rows, kept up to date as rows are appended"""
+    return as_result_set(results).derived(
+        'search',
+        lambda rs: _build(rs, cancel, progress),
+        lambda index, rs: index.extend(rs, cancel, progress),
+    )
+
+
+def search(results, query, regex=False, case=False):
+    rs = as_result_set(results)
+    return text_index(rs).search(rs, query, regex=regex, case=case)
@@ -0,0 +1,302 @@
+"""
+Session snapshots - result sets saved to a memory-mappable file
+
+    header   MAGIC + format version (16 bytes)
+    blocks   8-byte aligned column data, little-endian:
+               codes      int32 per row      (categorical: event, status, ...)
+               floats     float64 per row    (confidence, severity, timestamp)
+               values     typed value list   (dictionaries, free-form columns,
+                                              kept originals of floats columns)
+    footer   JSON index: rows, meta, and per column its kind and block
+             (offset, length) pairs
+    trailer  footer offset (uint64) + MAGIC
+
+A value list is three blocks: one type byte per value, uint64 end offsets
+and the encoded bytes, so single values decode without touching the rest.
+
+load() maps the file and wraps the blocks in memoryviews: nothing but
+the footer and the (small) string dictionaries is read up front, pages of
+a column are faulted in when a command first reads them, and a result
+set of any size opens in about the same time. Free-form columns decode
+per value on access (MappedValues).
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from datetime import datetime
+from pathlib import Path
+
+from devlog.cli.results.resultset import CATEGORICAL, NUMERIC, TIMESTAMP, ResultSet
+
+
+SESSIONS_DIR = Path.home() / ".devlog_cache" / "sessions"
+SUFFIX = ".dls"
+MAGIC = b"DLOGSNAP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sII")      # magic, version, reserved
+TRAILER = struct.Struct("<Q8s")      # footer offset, magic
+ALIGN = 8
+
+# Value list type tags (TUPLE: a JSON array read back as a tuple,
+# DATETIME: isoformat text read back as a datetime)
+NONE, STR, INT, FLOAT, BOOL, JSON, TUPLE, DATETIME = range(8)
+
+
+class SnapshotError(ValueError):
+    """Not a session snapshot, or written by an unsupported format version"""
+
+
+def snapshot_path(name, root=SESSIONS_DIR):
+    """Path of a named snapshot; names with a '/' or the suffix are taken as paths"""
+    if '/' in name or name.endswith(SUFFIX):
+        return Path(name).expanduser()
+    if not re.fullmatch(r"[\w.-]+", name):
+        raise ValueError(f"Invalid session name: {name!r} (letters, digits, '.', '-', '_')")
+    return Path(root) / f"{name}{SUFFIX}"
+
+
+def list_snapshots(root=SESSIONS_DIR):
+    """[(name, path, footer)] of the saved sessions, newest first"""
+    found = []
+    for path in Path(root).glob(f"*{SUFFIX}"):
+        try:
+            found.append((path.stem, path, read_footer(path)))
+        except (OSError, SnapshotError):
+            continue
+    found.sort(key=lambda item: item[2].get('created', 0), reverse=True)
+    return found
+
+
+# -- writing -----------------------------------------------------------
+
+def _encode(value):
+    if value is None:
+        return NONE, b""
+    if isinstance(value, str):
+        return STR, value.encode("utf-8", "surrogatepass")
+    if isinstance(value, bool):
+        return BOOL, b"1" if value else b""
+    if isinstance(value, int):
+        return INT, str(value).encode()
+    if isinstance(value, float):
+        return FLOAT, repr(value).encode()
+    if isinstance(value, datetime):
+        return DATETIME, value.isoformat().encode()
+    if isinstance(value, tuple):
+        return TUPLE, json.dumps(value, default=str).encode("utf-8")
+    if type(value).__module__ == "numpy" and hasattr(value, "item"):
+        return _encode(value.item())    # numpy scalar -> the Python number it holds
+    return JSON, json.dumps(value, default=str).encode("utf-8")
+
+
+def pack_values(values):
+    """(type bytes, little-endian uint64 end offsets, data) of a value list"""
+    types = bytearray()
+    ends = array("Q")
+    data = bytearray()
+    for value in values:
+        tag, encoded = _encode(value)
+        types.append(tag)
+        data += encoded
+        ends.append(len(data))
+    if sys.byteorder != "little":
+        ends.byteswap()
+    return types, ends, data
+
+
+class _Writer:
+
+    def __init__(self, f):
+        self.f = f
+        self.offset = HEADER.size
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0))
+
+    def block(self, data):
+        """Write one aligned block; returns [offset, length]"""
+        pad = -self.offset % ALIGN
+        if pad:
+            self.f.write(b"\0" * pad)
+            self.offset += pad
+        start = self.offset
+        self.f.write(data)
+        length = len(memoryview(data).cast("B"))
+        self.offset += length
+        return [start, length]
+
+    def numbers(self, values, typecode):
+        if sys.byteorder == "little" and isinstance(values, (array, memoryview)):
+            return self.block(values)
+        data = array(typecode, values)
+        if sys.byteorder != "little":
+            data.byteswap()
+        return self.block(data)
+
+    def values(self, values):
+        types, ends, data = pack_values(values)
+        return {"types": self.block(types), "ends": self.block(ends), "data": self.block(data)}
+
+
+def save(results, path, meta=None):
+    """Write results to path atomically; returns the number of bytes written"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    columns = []
+    try:
+        with open(tmp, "wb") as f:
+            out = _Writer(f)
+            for name in CATEGORICAL:
+                codes, values = results.codes(name)
+                columns.append({"name": name, "kind": "codes",
+                                "codes": out.numbers(codes, "i"), "values": out.values(values)})
+            for name in NUMERIC + (TIMESTAMP,):
+                columns.append({"name": name, "kind": "floats",
+                                "floats": out.numbers(results.floats(name), "d")})
+                raw = results.raw(name)
+                if raw is not None:
+                    columns.append({"name": name, "kind": "raw", "values": out.values(raw)})
+            fixed = set(CATEGORICAL) | set(NUMERIC) | {TIMESTAMP}
+            for name in results.columns():
+                if name not in fixed:
+                    columns.append({"name": name, "kind": "values",
+                                    "values": out.values(results.objects(name))})
+            footer = json.dumps({
+                "format": FORMAT_VERSION,
+                "rows": len(results),
+                "created": time.time(),
+                "meta": meta or {},
+                "columns": columns,
+            }).encode("utf-8")
+            start = out.block(footer)[0]
+            f.write(TRAILER.pack(start, MAGIC))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return path.stat().st_size
+
+
+# -- reading -----------------------------------------------------------
+
+def _footer(head, tail, read):
+    """Parsed footer, given the header, the trailer and read(start) for its body"""
+    magic, version, _ = HEADER.unpack(head)
+    start, end_magic = TRAILER.unpack(tail)
+    if magic != MAGIC or end_magic != MAGIC:
+        raise SnapshotError("Not a session snapshot")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot format {version} (expected {FORMAT_VERSION})")
+    return json.loads(read(start))
+
+
+def _check_size(size):
+    if size < HEADER.size + TRAILER.size:
+        raise SnapshotError("File too short for a session snapshot")
+
+
+def read_footer(path):
+    """Footer of a snapshot (rows, created, meta, columns) without mapping it"""
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        _check_size(size)
+        f.seek(0)
+        head = f.read(HEADER.size)
+        f.seek(size - TRAILER.size)
+        tail = f.read(TRAILER.size)
+
+        def read(start):
+            f.seek(start)
+            return f.read(size - TRAILER.size - start)
+        return _footer(head, tail, read)
+
+
+def _decode(tag, raw):
+    if tag == STR:
+        return str(raw, "utf-8", "surrogatepass")
+    if tag == NONE:
+        return None
+    if tag == INT:
+        return int(bytes(raw))
+    if tag == FLOAT:
+        return float(bytes(raw))
+    if tag == BOOL:
+        return raw == b"1"
+    if tag == TUPLE:
+        return tuple(json.loads(bytes(raw)))
+    if tag == DATETIME:
+        return datetime.fromisoformat(str(raw, "ascii"))
+    return json.loads(bytes(raw))
+
+
+class MappedValues:
+    """Read-only sequence over a value list block; values decode on access"""
+
+    def __init__(self, view, spec):
+        self._types = _numbers(view, spec["types"], "B")
+        self._ends = _numbers(view, spec["ends"], "Q")
+        start, length = spec["data"]
+        self._data = view[start:start + length]
+
+    def __len__(self):
+        return len(self._types)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        begin = self._ends[i - 1] if i else 0
+        return _decode(self._types[i], self._data[begin:self._ends[i]])
+
+    def __iter__(self):
+        types, ends, data = self._types, self._ends, self._data
+        begin = 0
+        for i in range(len(types)):
+            end = ends[i]
+            yield _decode(types[i], data[begin:end])
+            begin = end
+
+
+def _numbers(view, block, typecode):
+    start, length = block
+    data = view[start:start + length].cast(typecode)
+    if sys.byteorder != "little" and typecode != "B":
+        data = array(typecode, data)
+        data.byteswap()
+    return data
+
+
+def load(path):
+    """ResultSet backed by a read-only mapping of the snapshot at path"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        _check_size(size)
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    footer = _footer(view[:HEADER.size], view[size - TRAILER.size:],
+                     lambda start: bytes(view[start:size - TRAILER.size]))
+
+    strings, floats, objects, raw = {}, {}, {}, {}
+    timestamps = array("d")
+    for column in footer["columns"]:
+        name, kind = column["name"], column["kind"]
+        if kind == "codes":
+            strings[name] = (_numbers(view, column["codes"], "i"), list(MappedValues(view, column["values"])))
+        elif kind == "floats" and name == TIMESTAMP:
+            timestamps = _numbers(view, column["floats"], "d")
+        elif kind == "floats":
+            floats[name] = _numbers(view, column["floats"], "d")
+        elif kind == "values":
+            objects[name] = MappedValues(view, column["values"])
+        elif kind == "raw":
+            raw[name] = MappedValues(view, column["values"])
+    return ResultSet.from_columns(footer["rows"], strings, floats, timestamps, objects,
+                                  mapped=mapping, raw=raw)
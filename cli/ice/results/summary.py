@@ -0,0 +1,140 @@
+"""
+Shared one-pass summary of a ResultSet
+
+summarize(results) computes, in a single aggregation over the columns,
+everything the stats / insights / analytics views need: per-status and
+per-event counts, confidence and severity sums, the confidence histogram
+and hourly buckets. The summary is memoized on the ResultSet and rebuilt
+only after the set changes, so `stats` followed by `insights` scans once.
+"""
+
+from collections import Counter
+
+from .backend import numpy
+from .resultset import as_result_set
+
+
+HOUR = 3600
+
+
+class ResultSummary:
+    """Counts, sums and histograms for one version of a result set"""
+
+    __slots__ = ('total', 'events', 'statuses', 'confidence_sum', 'severity_sum',
+                 'confidence_bins', 'hour_buckets')
+
+    def __init__(self):
+        self.total = 0
+        self.events = Counter()
+        self.statuses = Counter()
+        self.confidence_sum = 0.0     # missing confidence counts as 0
+        self.severity_sum = 0.0       # missing severity counts as 0
+        self.confidence_bins = {}     # 0..100 step 10, missing confidence -> 100
+        self.hour_buckets = {}        # epoch hour -> count
+
+    @property
+    def distinct_events(self):
+        return len(self.events)
+
+    @property
+    def confidence_avg(self):
+        return self.confidence_sum / self.total if self.total else 0.0
+
+    @property
+    def severity_avg(self):
+        return self.severity_sum / self.total if self.total else 0.0
+
+    def rate(self, status):
+        return self.statuses.get(status, 0) / self.total if self.total else 0.0
+
+    def buckets(self, granularity="hour"):
+        """Counts per epoch hour, or per epoch day"""
+        if granularity == "hour":
+            return dict(self.hour_buckets)
+        days = Counter()
+        for hour, count in self.hour_buckets.items():
+            days[hour // 24] += count
+        return dict(sorted(days.items()))
+
+
+def _counts(codes, values):
+    np = numpy()
+    if np is not None and len(codes):
+        per_code = np.bincount(np.frombuffer(codes, dtype=np.int32), minlength=len(values))
+        return Counter({values[c]: int(n) for c, n in enumerate(per_code.tolist()) if n})
+    per_code = Counter(codes)
+    return Counter({values[c]: n for c, n in per_code.items()})
+
+
+def _build_numpy(rs):
+    np = numpy()
+    summary = ResultSummary()
+    summary.total = len(rs)
+    summary.events = _counts(*rs.codes('event'))
+    summary.statuses = _counts(*rs.codes('status'))
+    if not summary.total:
+        return summary
+
+    conf = np.frombuffer(rs.floats('confidence'), dtype=np.float64)
+    missing = np.isnan(conf)
+    summary.confidence_sum = float(np.where(missing, 0.0, conf).sum())
+    keys = np.trunc(np.where(missing, 1.0, conf) * 10).astype(np.int64) * 10
+    uniq, counts = np.unique(keys, return_counts=True)
+    summary.confidence_bins = dict(zip(uniq.tolist(), counts.tolist()))
+
+    summary.severity_sum = float(np.nansum(np.frombuffer(rs.floats('severity'), dtype=np.float64)))
+
+    ts = np.frombuffer(rs.floats('timestamp'), dtype=np.float64)
+    ts = ts[~np.isnan(ts)]
+    hours, counts = np.unique((ts // HOUR).astype(np.int64), return_counts=True)
+    summary.hour_buckets = dict(zip(hours.tolist(), counts.tolist()))
+    return summary
+
+
+def _build_python(rs):
+    summary = ResultSummary()
+    summary.total = len(rs)
+    event_codes, event_values = rs.codes('event')
+    status_codes, status_values = rs.codes('status')
+    conf = rs.floats('confidence')
+    sev = rs.floats('severity')
+    stamps = rs.floats('timestamp')
+
+    events = Counter()
+    statuses = Counter()
+    bins = Counter()
+    hours = Counter()
+    conf_sum = sev_sum = 0.0
+    # Single pass over the columns
+    for i in range(summary.total):
+        events[event_codes[i]] += 1
+        statuses[status_codes[i]] += 1
+        c = conf[i]
+        if c == c:
+            conf_sum += c
+            bins[int(c * 10) * 10] += 1
+        else:
+            bins[100] += 1
+        s = sev[i]
+        if s == s:
+            sev_sum += s
+        t = stamps[i]
+        if t == t:
+            hours[int(t // HOUR)] += 1
+
+    summary.events = Counter({event_values[c]: n for c, n in events.items()})
+    summary.statuses = Counter({status_values[c]: n for c, n in statuses.items()})
+    summary.confidence_sum = conf_sum
+    summary.severity_sum = sev_sum
+    summary.confidence_bins = dict(bins)
+    summary.hour_buckets = dict(sorted(hours.items()))
+    return summary
+
+
+def build_summary(rs):
+    return _build_numpy(rs) if numpy() is not None else _build_python(rs)
+
+
+def summarize(results):
+    """Memoized ResultSummary for a ResultSet (or a plain list of dicts)"""
+    return as_result_set(results).derived('summary', build_summary)
@@ -0,0 +1,239 @@
+"""
+Mergeable approximate sketches for very large sessions
+
+    HyperLogLog     distinct count in 2**p one-byte registers
+    CountMinSketch  frequencies in depth x width counters, plus a bounded
+                    set of heavy-hitter candidates for top-N
+    KLLSketch       quantiles of a numeric stream in O(k log n) values
+
+Each sketch has a fixed size whatever the number of rows and `merge()`s
+with another sketch built with the same parameters, so per-file or
+per-worker sketches combine into the session's. Hashing uses blake2b, not
+hash(), so sketches built in different processes agree. error_bound()
+reports the guarantee the estimates come with.
+"""
+
+import hashlib
+import math
+import random
+from array import array
+
+
+def hash64(value):
+    """Stable 64-bit hash of a value's str() (same in every process)"""
+    digest = hashlib.blake2b(str(value).encode('utf-8', 'replace'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+class HyperLogLog:
+    """Distinct-count estimate; relative standard error 1.04 / sqrt(2**p)"""
+
+    def __init__(self, p=14):
+        if not 4 <= p <= 18:
+            raise ValueError("p must be between 4 and 18")
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(self.m)
+
+    def add(self, value):
+        self.add_hash(hash64(value))
+
+    def add_hash(self, h):
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        if other.p != self.p:
+            raise ValueError("Cannot merge HyperLogLog sketches with different p")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def estimate(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)  # linear counting for small sets
+        return raw
+
+    def __len__(self):
+        return int(round(self.estimate()))
+
+    def error_bound(self):
+        """Relative standard error of estimate()"""
+        return 1.04 / math.sqrt(self.m)
+
+
+class CountMinSketch:
+    """
+    Frequency estimates that never undercount and overcount by at most
+    error_bound() * total with probability 1 - e**-depth. The `top`
+    heavy-hitter candidates are tracked on the side for most_common().
+    """
+
+    def __init__(self, width=2048, depth=5, top=64):
+        self.width = width
+        self.depth = depth
+        self.top = top
+        self.total = 0
+        self.tables = [array('q', bytes(8 * width)) for _ in range(depth)]
+        self.candidates = {}    # value -> estimate when last seen
+        self._floor = 0         # smallest candidate estimate, valid while full
+
+    def _positions(self, h):
+        low, high = h & 0xFFFFFFFF, h >> 32
+        return [(low + i * high) % self.width for i in range(self.depth)]
+
+    def add(self, value, count=1):
+        positions = self._positions(hash64(value))
+        estimate = None
+        for table, pos in zip(self.tables, positions):
+            table[pos] += count
+            if estimate is None or table[pos] < estimate:
+                estimate = table[pos]
+        self.total += count
+        self._offer(value, estimate)
+
+    def _offer(self, value, estimate):
+        candidates = self.candidates
+        if value in candidates or len(candidates) < self.top:
+            candidates[value] = estimate
+            if len(candidates) == self.top:
+                self._floor = min(candidates.values())
+            return
+        if estimate > self._floor:
+            smallest = min(candidates, key=candidates.get)
+            del candidates[smallest]
+            candidates[value] = estimate
+            self._floor = min(candidates.values())
+
+    def estimate(self, value):
+        positions = self._positions(hash64(value))
+        return min(table[pos] for table, pos in zip(self.tables, positions))
+
+    def most_common(self, n=None):
+        """[(value, estimated count)] of the heavy hitters, largest first"""
+        ranked = sorted(((v, self.estimate(v)) for v in self.candidates), key=lambda x: -x[1])
+        return ranked if n is None else ranked[:n]
+
+    def merge(self, other):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge count-min sketches of different shape")
+        for mine, theirs in zip(self.tables, other.tables):
+            for i, count in enumerate(theirs):
+                if count:
+                    mine[i] += count
+        self.total += other.total
+        pool = set(self.candidates) | set(other.candidates)
+        self.candidates = {}
+        self._floor = 0
+        for value, estimate in sorted(((v, self.estimate(v)) for v in pool), key=lambda x: -x[1]):
+            self._offer(value, estimate)
+        return self
+
+    def error_bound(self):
+        """Overcount per estimate, as a fraction of total (e / width)"""
+        return math.e / self.width
+
+    def confidence(self):
+        return 1 - math.exp(-self.depth)
+
+
+class KLLSketch:
+    """
+    Quantiles of a numeric stream (Karnin-Lang-Liberty compactors).
+    Normalized rank error about error_bound() at 99% confidence.
+    """
+
+    def __init__(self, k=200, seed=0):
+        self.k = k
+        self.n = 0
+        self.compactors = [[]]
+        self._rng = random.Random(seed)
+        self._retained = 0
+        self._limit = self._capacity(0)
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, value):
+        self.compactors[0].append(value)
+        self.n += 1
+        self._retained += 1
+        if self._retained >= self._limit:
+            self._compress()
+
+    def update_many(self, values):
+        """
+        Add a batch. A large batch is sorted and halved up front (the same
+        as compacting it level by level) before joining the compactors.
+        """
+        values = sorted(v for v in values if v == v)
+        self.n += len(values)
+        level = 0
+        while len(values) > self.k:
+            values = values[self._rng.randrange(2)::2]
+            level += 1
+        while len(self.compactors) <= level:
+            self.compactors.append([])
+        self.compactors[level].extend(values)
+        self._compress()
+
+    def _compress(self):
+        """Compact the lowest full level until everything fits the capacities"""
+        while sum(map(len, self.compactors)) >= sum(self._capacity(h) for h in range(len(self.compactors))):
+            for h, items in enumerate(self.compactors):
+                if len(items) >= self._capacity(h):
+                    if h + 1 == len(self.compactors):
+                        self.compactors.append([])
+                    items.sort()
+                    keep = [items.pop()] if len(items) % 2 else []
+                    self.compactors[h + 1].extend(items[self._rng.randrange(2)::2])
+                    self.compactors[h] = keep
+                    break
+            else:
+                break
+        self._retained = sum(map(len, self.compactors))
+        self._limit = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def merge(self, other):
+        if other.k != self.k:
+            raise ValueError("Cannot merge KLL sketches with different k")
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for mine, theirs in zip(self.compactors, other.compactors):
+            mine.extend(theirs)
+        self.n += other.n
+        self._compress()
+        return self
+
+    def _weighted(self):
+        items = [(v, 1 << h) for h, c in enumerate(self.compactors) for v in c]
+        items.sort()
+        return items
+
+    def quantile(self, q):
+        """Approximate value at rank q (0..1); None when empty"""
+        items = self._weighted()
+        if not items:
+            return None
+        total = sum(w for _v, w in items)
+        target = q * total
+        seen = 0
+        for value, weight in items:
+            seen += weight
+            if seen >= target:
+                return value
+        return items[-1][0]
+
+    def quantiles(self, qs):
+        return {q: self.quantile(q) for q in qs}
+
+    def error_bound(self):
+        """Normalized rank error at 99% confidence (empirical KLL constant)"""
+        return 2.446 / self.k ** 0.9433
@@ -0,0 +1,98 @@
+"""
+Startup profiling for --startup-profile
+
+ImportProfiler wraps builtins.__import__ while main() boots and records, for
+every module imported for the first time, its cumulative and self time.
+Phases (banner, API, shell) are timed alongside so the report shows where
+cold start actually goes.
+"""
+
+import builtins
+import sys
+import time
+
+
+class ImportProfiler:
+    """Per-module import timings for modules first loaded inside the block"""
+
+    def __init__(self):
+        self.records = []       # (module, cumulative ms, self ms)
+        self.phases = []        # (label, ms)
+        self._stack = []
+        self._real_import = None
+        self._phase_start = None
+
+    def __enter__(self):
+        # Re-entrant across main()'s startup steps; time spent outside the
+        # blocks (e.g. a quick analysis run) is not charged to any phase
+        self._real_import = builtins.__import__
+        builtins.__import__ = self._import
+        self._phase_start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._real_import
+        return False
+
+    def phase(self, label):
+        """Close the current phase under `label`"""
+        now = time.perf_counter()
+        self.phases.append((label, (now - self._phase_start) * 1000))
+        self._phase_start = now
+
+    @staticmethod
+    def _resolve(name, globals, level):
+        if level == 0 or not globals:
+            return name
+        package = globals.get('__package__') or ''
+        base = package.rsplit('.', level - 1)[0] if level > 1 else package
+        return f"{base}.{name}" if name else base
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module = self._resolve(name, globals, level)
+        if module in sys.modules:
+            return self._real_import(name, globals, locals, fromlist, level)
+
+        start = time.perf_counter()
+        self._stack.append(0.0)
+        try:
+            return self._real_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            self.records.append((module, elapsed, elapsed - children))
+
+    def report(self, console, top=20):
+        from rich.table import Table
+
+        total = sum(ms for _, ms in self.phases)
+        console.print(f"\n[bold cyan]Startup profile[/bold cyan] [dim]{total:.1f} ms total[/dim]")
+        for label, ms in self.phases:
+            console.print(f"  {label:24s} [yellow]{ms:8.1f} ms[/yellow]")
+
+        table = Table(title=f"Slowest imports (top {top} by self time)")
+        table.add_column("Module", style="cyan")
+        table.add_column("Self ms", justify="right")
+        table.add_column("Cumulative ms", justify="right")
+        for module, cumulative, own in sorted(self.records, key=lambda r: r[2], reverse=True)[:top]:
+            table.add_row(module, f"{own:.1f}", f"{cumulative:.1f}")
+        console.print(table)
+        console.print(f"[dim]{len(self.records)} modules imported during startup[/dim]\n")
+
+
+class NullProfiler:
+    """Stand-in when profiling is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def phase(self, label):
+        pass
+
+    def report(self, console, top=20):
+        pass
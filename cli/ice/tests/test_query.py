@@ -0,0 +1,110 @@
+"""Compiled queries and top_n against a plain Python filter, with and without NumPy"""
+
+import random
+
+import pytest
+
+from devlog.cli.results import backend
+from devlog.cli.results import query as query_module
+from devlog.cli.results.query import compile_query, top_n
+from devlog.cli.results.resultset import ResultSet
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def engine(request, monkeypatch):
+    if request.param == 'python':
+        monkeypatch.setattr(backend, '_numpy', None)
+        monkeypatch.setattr(backend, '_checked', True)
+    elif backend.numpy() is None:
+        pytest.skip("numpy not installed")
+    return request.param
+
+
+def _records(n=3000, seed=11):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(n):
+        records.append({
+            'event': rng.choice(['login', 'logout', 'db', 'disk']),
+            'status': rng.choice(['success', 'warning', 'failed']),
+            'severity': rng.choice([None, 1.0, 2.5, 5.0, 7.0, 9.0]),
+            'confidence': rng.choice([None, 0.1, 0.5, 0.7, 0.95]),
+        })
+    return records
+
+
+OPTIONS = [
+    {},
+    {'status': 'failed'},
+    {'status': 'failed', 'event': 'db'},
+    {'min_severity': 5},
+    {'status': 'warning', 'min_severity': 2.5, 'min_confidence': 0.7},
+    {'event': 'never-seen'},
+]
+
+
+def _expected(records, options):
+    def keep(r):
+        for field in ('status', 'event'):
+            if field in options and r[field] != options[field]:
+                return False
+        if 'min_severity' in options and not (r['severity'] is not None and r['severity'] >= options['min_severity']):
+            return False
+        if 'min_confidence' in options and not (r['confidence'] is not None and r['confidence'] >= options['min_confidence']):
+            return False
+        return True
+    return [i for i, r in enumerate(records) if keep(r)]
+
+
+@pytest.mark.parametrize('options', OPTIONS)
+def test_evaluate_matches_python_filter(engine, options):
+    records = _records()
+    rs = ResultSet(records)
+    expected = _expected(records, options)
+    assert list(compile_query(**options).evaluate(rs).rows) == expected
+    for rows in (list(chunk) for chunk in compile_query(**options).chunks(rs, size=1000)):
+        assert all(i in expected for i in rows)
+
+
+@pytest.mark.parametrize('options', OPTIONS)
+def test_refine_within_an_earlier_selection(engine, options):
+    records = _records()
+    rs = ResultSet(records)
+    first = compile_query(status='failed').evaluate(rs)
+    refined = compile_query(**options).evaluate(rs, within=first)
+    failed = set(_expected(records, {'status': 'failed'}))
+    assert list(refined.rows) == [i for i in _expected(records, options) if i in failed]
+
+
+def test_limit_and_complete_flag(engine, monkeypatch):
+    monkeypatch.setattr(query_module, 'CHUNK', 256)
+    records = _records(1000)
+    rs = ResultSet(records)
+    expected = _expected(records, {'status': 'failed'})
+    query = compile_query(status='failed')
+
+    partial = query.evaluate(rs, limit=10)
+    assert list(partial.rows) == expected[:10] and not partial.complete
+
+    exact = query.evaluate(rs, limit=len(expected))
+    assert list(exact.rows) == expected and exact.complete
+
+    over = query.evaluate(rs, limit=len(expected) + 5)
+    assert list(over.rows) == expected and over.complete
+
+
+@pytest.mark.parametrize('field', ['severity', 'confidence'])
+@pytest.mark.parametrize('n', [1, 5, 50, 5000])
+def test_top_n_matches_sort(engine, field, n):
+    records = _records()
+    rs = ResultSet(records)
+    valued = [i for i, r in enumerate(records) if r[field] is not None]
+    expected = sorted(valued, key=lambda i: -records[i][field])[:n]
+    assert top_n(rs, field, n) == expected
+
+
+def test_top_n_never_returns_missing_values(engine):
+    rs = ResultSet([{'severity': None}, {'severity': 3.0}, {'severity': None}])
+    assert top_n(rs, 'severity', 3) == [1]
+    selection = compile_query(min_severity=0).evaluate(rs)
+    assert top_n(rs, 'severity', 3, selection) == [1]
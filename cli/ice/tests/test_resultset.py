@@ -0,0 +1,98 @@
+"""ResultSet round-trips: what goes into the columns comes back out unchanged"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from devlog.cli.results import snapshot
+from devlog.cli.results.export import export
+from devlog.cli.results.resultset import ResultSet, Row, parse_timestamp
+
+
+TIMESTAMPS = [
+    '2024-01-01 10:00:00',
+    '2024-01-01 10:00:00.250000',
+    '2024-01-01T10:00:00',
+    '2024-01-01T10:00:00Z',
+    '2024-01-01T10:00:00+02:00',
+    '2024-01-01T10:00:00,123',
+    '2024-01-01',
+    '10/Oct/2023:13:55:36 +0000',
+    'Oct 10 13:55:36',
+    '1704103200',
+    1704103200,
+    1704103200.5,
+    datetime(2024, 1, 1, 10, 0),
+    datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc),
+    'not a time',
+    '',
+    None,
+]
+
+NUMBERS = [5, 5.0, 0.25, '5', 'high', True, '', None]
+
+
+def _records():
+    records = []
+    for i, stamp in enumerate(TIMESTAMPS):
+        records.append({'event': 'login', 'status': 'success', 'timestamp': stamp,
+                        'severity': NUMBERS[i % len(NUMBERS)], 'message': f"m{i}"})
+    return records
+
+
+def _check(rows, records):
+    assert len(rows) == len(records)
+    for row, record in zip(rows, records):
+        for key, value in record.items():
+            got = row[key]
+            assert got == value and type(got) is type(value), (key, value, got)
+
+
+def test_values_round_trip():
+    records = _records()
+    rs = ResultSet(records)
+    _check(list(rs), records)
+    _check(rs.records(), records)
+
+
+def test_take_round_trip():
+    records = _records()
+    rs = ResultSet(records).take(list(range(len(records))))
+    _check(list(rs), records)
+
+
+def test_snapshot_round_trip(tmp_path):
+    records = _records()
+    path = tmp_path / "s.dls"
+    snapshot.save(ResultSet(records), path)
+    _check(list(snapshot.load(path)), records)
+
+
+def test_jsonl_export_round_trip(tmp_path):
+    records = [dict(r) for r in _records() if not isinstance(r['timestamp'], datetime)]
+    path = tmp_path / "out.jsonl"
+    export(ResultSet(records), path, 'jsonl')
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    expected = [{k: v for k, v in r.items() if v is not None} for r in records]
+    assert lines == expected
+
+
+def test_exact_stamps_keep_no_raw():
+    rs = ResultSet([{'timestamp': '2024-01-01 10:00:00', 'severity': 0.5}])
+    assert rs.raw('timestamp') is None
+    assert rs.raw('severity') is None
+    assert parse_timestamp('2024-01-01T10:00:00Z') == 1704103200.0
+
+
+def test_row_is_a_mapping_over_every_column():
+    rs = ResultSet([{'event': 'a', 'message': 'x'}, {'event': None}])
+    row = rs[1]
+    assert isinstance(row, Row)
+    assert 'message' in row and row['message'] is None
+    assert row.get('message', 'default') is None
+    assert row.get('nope', 'default') == 'default'
+    assert 'nope' not in row
+    with pytest.raises(KeyError):
+        row['nope']
+    assert set(dict(row)) == set(rs.columns())
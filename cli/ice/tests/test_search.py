@@ -0,0 +1,84 @@
+"""Text index answers against a linear scan of every row's text"""
+
+import random
+import re
+
+import pytest
+
+from devlog.cli.results.resultset import ResultSet
+from devlog.cli.results.search import TextIndex, fingerprint, required_literals, search
+
+
+WORDS = ['Failed', 'password', 'for', 'root', 'from', 'status=bounced', 'sshd[42]',
+         'port', '22', 'user', 'admin', 'accepted', 'disconnect', 'Connection', 'reset']
+
+
+def _records(n=2000, seed=7):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        text = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(0, 8)))
+        if i % 5 == 0:
+            records.append({'event': 'raw', 'line': text})      # line only, no message
+        elif i % 7 == 0:
+            records.append({'event': 'empty', 'message': '', 'line': text})
+        else:
+            records.append({'event': 'parsed', 'message': text})
+    return records
+
+
+def _text(record):
+    return record.get('message') or record.get('line')
+
+
+def _linear(records, match):
+    return [i for i, r in enumerate(records) if _text(r) and match(_text(r))]
+
+
+QUERIES = ['password', 'PASSWORD', 'pass', 'Failed password', 'status=bounced', 'sshd[42]',
+           'port 22', '22', 'ord fo', 'nothing-here', 'ccept']
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_substring_matches_linear_scan(query):
+    records = _records()
+    rs = ResultSet(records)
+    assert list(search(rs, query)) == _linear(records, lambda t: query.lower() in t.lower())
+    assert list(search(rs, query, case=True)) == _linear(records, lambda t: query in t)
+
+
+@pytest.mark.parametrize('pattern', [r'Failed\s+password', r'root|admin', r'port \d+', r'sshd\[\d+\]', r'(?:user )+admin'])
+def test_regex_matches_linear_scan(pattern):
+    records = _records()
+    rs = ResultSet(records)
+    compiled = re.compile(pattern, re.IGNORECASE)
+    assert list(search(rs, pattern, regex=True)) == _linear(records, compiled.search)
+
+
+def test_index_follows_appends():
+    records = _records()
+    rs = ResultSet(records[:500])
+    search(rs, 'root')
+    rs.extend(records[500:])
+    assert list(search(rs, 'root')) == _linear(records, lambda t: 'root' in t.lower())
+
+
+def test_saved_index_round_trip(tmp_path):
+    records = _records()
+    rs = ResultSet(records)
+    path = TextIndex().extend(rs).save(tmp_path / "i.idx")
+    loaded = TextIndex.load(path)
+    assert list(loaded.search(rs, 'admin')) == _linear(records, lambda t: 'admin' in t.lower())
+
+
+def test_fingerprint_follows_the_text():
+    records = _records(50)
+    same = ResultSet([dict(r) for r in records])
+    assert fingerprint(ResultSet(records)) == fingerprint(same)
+    records[3] = dict(records[3], line='changed', message=None)
+    assert fingerprint(ResultSet(records)) != fingerprint(same)
+
+
+def test_required_literals():
+    assert required_literals(r'Failed\s+password') == ['Failed', 'password']
+    assert required_literals(r'root|admin') == []
@@ -0,0 +1,109 @@
+"""Sketch estimates stay within the error bounds they report"""
+
+import bisect
+import random
+from collections import Counter
+
+from devlog.cli.results.approx import ApproxSummary, approx_summary
+from devlog.cli.results.resultset import ResultSet
+from devlog.cli.results.summary import summarize
+from devlog.cli.sketches import CountMinSketch, HyperLogLog, KLLSketch
+
+
+def test_hyperloglog_within_four_standard_errors():
+    for distinct in (100, 5000, 100000):
+        hll = HyperLogLog()
+        for i in range(distinct):
+            hll.add(f"event-{i}")
+        assert abs(hll.estimate() - distinct) <= 4 * hll.error_bound() * distinct
+
+
+def test_hyperloglog_merge_is_the_union():
+    a, b, union = HyperLogLog(), HyperLogLog(), HyperLogLog()
+    for i in range(20000):
+        (a if i % 2 else b).add(i)
+        union.add(i)
+    assert a.merge(b).registers == union.registers
+
+
+def _zipf_counts(n=200000, values=2000, seed=5):
+    rng = random.Random(seed)
+    weights = [1 / (k + 1) for k in range(values)]
+    return Counter(rng.choices(range(values), weights=weights, k=n))
+
+
+def test_count_min_never_undercounts_and_stays_within_bound():
+    exact = _zipf_counts()
+    cms = CountMinSketch()
+    for value, count in exact.items():
+        cms.add(value, count)
+    slack = cms.error_bound() * cms.total
+    over = [cms.estimate(v) - c for v, c in exact.items()]
+    assert min(over) >= 0
+    assert sum(o <= slack for o in over) / len(over) >= cms.confidence()
+
+
+def test_count_min_heavy_hitters_and_merge():
+    exact = _zipf_counts()
+    left, right = CountMinSketch(), CountMinSketch()
+    for value, count in exact.items():
+        (left if value % 2 else right).add(value, count)
+    merged = left.merge(right)
+    top = [v for v, _ in merged.most_common(10)]
+    assert set(top[:5]) == {v for v, _ in exact.most_common(5)}
+
+
+def _rank_error(sketch, data):
+    ordered = sorted(data)
+    worst = 0.0
+    for q in (0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99):
+        value = sketch.quantile(q)
+        rank = bisect.bisect_right(ordered, value) / len(ordered)
+        worst = max(worst, abs(rank - q))
+    return worst
+
+
+def test_kll_rank_error_within_bound():
+    rng = random.Random(9)
+    data = [rng.lognormvariate(0, 1) for _ in range(200000)]
+    one, batched, merged, other = KLLSketch(), KLLSketch(), KLLSketch(), KLLSketch(seed=1)
+    for value in data:
+        one.update(value)
+    batched.update_many(sorted(data[:100000]))
+    batched.update_many(sorted(data[100000:]))
+    merged.update_many(data[:100000])
+    other.update_many(data[100000:])
+    merged.merge(other)
+    for sketch in (one, batched, merged):
+        assert sketch.n == len(data)
+        assert _rank_error(sketch, data) <= sketch.error_bound()
+
+
+def test_approx_summary_agrees_with_exact_summary():
+    rng = random.Random(2)
+    records = [{'event': f"e{min(int(rng.expovariate(0.2)), 40)}",
+                'status': rng.choice(['success', 'success', 'warning', 'failed']),
+                'confidence': rng.random(), 'severity': rng.choice([None, 1.0, 5.0, 9.0])}
+               for _ in range(50000)]
+    rs = ResultSet(records)
+    exact, approx = summarize(rs), approx_summary(rs)
+    assert approx.total == len(records)
+    assert abs(approx.distinct_events - exact.distinct_events) <= 1
+    for status in ('success', 'warning', 'failed'):
+        assert approx.rate(status) == exact.rate(status)
+    assert abs(approx.confidence_avg - exact.confidence_avg) < 1e-9
+    slack = approx.event_counts.error_bound() * approx.total
+    for event, count in exact.events.most_common(10):
+        assert count <= approx.events[event] <= count + slack
+
+
+def test_approx_summary_extends_and_merges():
+    records = [{'event': f"e{i % 7}", 'status': 'success', 'severity': float(i % 10)} for i in range(30000)]
+    rs = ResultSet(records[:10000])
+    summary = approx_summary(rs)
+    rs.extend(records[10000:])
+    assert approx_summary(rs).total == 30000
+    halves = ApproxSummary().extend(ResultSet(records[:15000])).merge(
+        ApproxSummary().extend(ResultSet(records[15000:])))
+    assert halves.total == 30000 and halves.distinct_events == 7
+    assert summary is approx_summary(rs)
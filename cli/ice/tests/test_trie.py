@@ -0,0 +1,33 @@
+"""Completion trie: prefix lookups and fuzzy spans against brute force"""
+
+import itertools
+import random
+
+from devlog.cli.completer.trie import PrefixTrie, _subsequence_span
+
+
+def _brute_span(query, key):
+    best = None
+    for start, end in itertools.combinations_with_replacement(range(len(key)), 2):
+        window = iter(key[start:end + 1])
+        if all(ch in window for ch in query):
+            span = end - start
+            best = span if best is None else min(best, span)
+    return best
+
+
+def test_subsequence_span_is_the_shortest_window():
+    rng = random.Random(3)
+    for _ in range(2000):
+        key = ''.join(rng.choice('abc') for _ in range(rng.randint(1, 9)))
+        query = ''.join(rng.choice('abc') for _ in range(rng.randint(1, 3)))
+        assert _subsequence_span(query, key) == _brute_span(query, key), (query, key)
+
+
+def test_fuzzy_ranks_tight_matches_first():
+    trie = PrefixTrie()
+    for key in ('stats', 'status', 'session', 'search'):
+        trie.insert(key, key)
+    trie.freeze()
+    assert [k for k, _ in trie.find('st')] == ['stats', 'status']
+    assert [k for k, _ in trie.fuzzy('ss')][0] == 'session'